@@ -0,0 +1,254 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# alerts.py — Non-Blocking, Batched Alert Dispatcher
+# Callers enqueue alerts and return immediately; a background worker collects
+# everything raised within a window, folds duplicates together and delivers
+# one digest per batch to each sink (SMTP, webhook, local file), retrying
+# failed deliveries with exponential backoff.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import datetime
+import json
+import os
+import queue
+import smtplib
+import threading
+import time
+import urllib.request
+from collections import namedtuple
+from email.message import EmailMessage
+
+# ───────────────────────────── Config ─────────────────────────────
+ALERT_WINDOW = 10.0          # Seconds to keep collecting after the first alert of a batch
+ALERT_RETRIES = 3            # Extra delivery attempts per sink and batch
+ALERT_BACKOFF = 2.0          # First retry delay in seconds; doubles on each attempt
+ALERT_TIMEOUT = 10.0         # Socket timeout for SMTP and webhook deliveries
+MAX_QUEUED = 1_000           # Alerts beyond this are dropped (and counted) rather than blocking
+ALERT_LOG_PATH = 'logs/alerts.jsonl'
+SUBJECT = "🚨 HRIS Pipeline Alert"
+
+Alert = namedtuple('Alert', ['key', 'message', 'severity', 'raised_at'])
+# One entry of a digest: an alert key with how often it fired and the latest message
+Digest = namedtuple('Digest', ['key', 'message', 'severity', 'count', 'first_at', 'last_at'])
+
+_STOP = object()
+
+# ───────────────────────────── Sinks ─────────────────────────────
+# A sink is anything with a `name` and `send(subject, body, entries)`; it raises on failure.
+def _timestamp(epoch):
+    return datetime.datetime.fromtimestamp(epoch).isoformat(timespec='seconds')
+
+
+def _entry_dicts(entries):
+    return [{'key': e.key, 'message': e.message, 'severity': e.severity, 'count': e.count,
+             'first_at': _timestamp(e.first_at), 'last_at': _timestamp(e.last_at)} for e in entries]
+
+
+class SmtpSink:
+    """Emails each digest over one SMTP (implicit TLS by default) connection per batch."""
+
+    name = 'smtp'
+
+    def __init__(self, host, port, sender, recipients, username=None, password=None, ssl=True,
+                 timeout=ALERT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = [recipients] if isinstance(recipients, str) else list(recipients)
+        self.username = username
+        self.password = password
+        self.ssl = ssl
+        self.timeout = timeout
+
+    def send(self, subject, body, entries=()):
+        msg = EmailMessage()
+        msg['Subject'] = subject
+        msg['From'] = self.sender
+        msg['To'] = ', '.join(self.recipients)
+        msg.set_content(body)
+        client = smtplib.SMTP_SSL if self.ssl else smtplib.SMTP
+        with client(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(msg)
+
+
+class WebhookSink:
+    """POSTs each digest as JSON (`text` for chat webhooks, plus structured `alerts`)."""
+
+    name = 'webhook'
+
+    def __init__(self, url, timeout=ALERT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, subject, body, entries=()):
+        payload = json.dumps({'subject': subject, 'text': f"{subject}\n{body}",
+                              'alerts': _entry_dicts(entries)}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=payload, method='POST',
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class FileSink:
+    """Appends each digest as one JSON line to a local file."""
+
+    name = 'file'
+
+    def __init__(self, path=ALERT_LOG_PATH):
+        self.path = path
+
+    def send(self, subject, body, entries=()):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        record = {'sent_at': _timestamp(time.time()), 'subject': subject, 'alerts': _entry_dicts(entries)}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def sinks_from_env():
+    """
+    Sinks configured by environment (.env is loaded if python-dotenv is
+    installed): SMTP when EMAIL_ADDRESS and RECIPIENT are set, a webhook when
+    ALERT_WEBHOOK_URL is set, and always the local alert log.
+    """
+    try:
+        from dotenv import load_dotenv  # Optional
+        load_dotenv()
+    except ImportError:
+        pass
+    sinks = []
+    sender, recipients = os.getenv("EMAIL_ADDRESS"), os.getenv("RECIPIENT")
+    if sender and recipients:
+        port = int(os.getenv("SMTP_PORT", "465"))
+        sinks.append(SmtpSink(os.getenv("SMTP_HOST", "smtp.gmail.com"), port, sender,
+                              [r.strip() for r in recipients.split(',')],
+                              username=sender, password=os.getenv("EMAIL_PASSWORD"), ssl=port == 465))
+    if os.getenv("ALERT_WEBHOOK_URL"):
+        sinks.append(WebhookSink(os.getenv("ALERT_WEBHOOK_URL")))
+    sinks.append(FileSink(os.getenv("ALERT_LOG_PATH", ALERT_LOG_PATH)))
+    return sinks
+
+# ───────────────────────────── Coalescing ─────────────────────────────
+def coalesce(alerts):
+    """Folds alerts sharing a key into one Digest entry, in order of first appearance."""
+    entries = {}
+    for alert in alerts:
+        seen = entries.get(alert.key)
+        if seen is None:
+            entries[alert.key] = Digest(alert.key, alert.message, alert.severity, 1,
+                                        alert.raised_at, alert.raised_at)
+        else:
+            entries[alert.key] = seen._replace(message=alert.message, count=seen.count + 1,
+                                               last_at=alert.raised_at)
+    return list(entries.values())
+
+
+def render(entries, dropped=0):
+    """Subject and plain-text body for one digest."""
+    total = sum(e.count for e in entries)
+    subject = SUBJECT if len(entries) == 1 else f"{SUBJECT}: {len(entries)} issues ({total} alerts)"
+    lines = [f"[{e.severity}] {e.message}" + (f" (×{e.count}, {_timestamp(e.first_at)} – {_timestamp(e.last_at)})"
+                                               if e.count > 1 else f" ({_timestamp(e.first_at)})")
+             for e in entries]
+    if dropped:
+        lines.append(f"[warning] {dropped} further alerts were dropped (queue full)")
+    return subject, "\n".join(lines) + "\n\nSee logs/pipeline_log.txt for details."
+
+# ───────────────────────────── Dispatcher ─────────────────────────────
+class AlertDispatcher:
+    """
+    Background alert queue. `alert()` never blocks on delivery: a daemon
+    worker waits `window` seconds after the first alert of a batch, coalesces
+    duplicates and hands one digest to every sink, retrying each sink up to
+    `retries` times. `close()` delivers whatever is still queued, right away.
+    """
+
+    def __init__(self, sinks=None, window=ALERT_WINDOW, retries=ALERT_RETRIES, backoff=ALERT_BACKOFF,
+                 max_queued=MAX_QUEUED):
+        self.sinks = sinks_from_env() if sinks is None else list(sinks)
+        self.window = window
+        self.retries = retries
+        self.backoff = backoff
+        self.delivered = 0        # Batches that reached at least one sink
+        self.failures = {}        # Sink name → batches it gave up on
+        self._dropped = 0
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._stopping = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='alert-dispatcher', daemon=True)
+        self._worker.start()
+
+    def alert(self, message, key=None, severity='error'):
+        """Queues one alert; repeats of `key` (default: the message) within a window are merged."""
+        try:
+            self._queue.put_nowait(Alert(key or message, message, severity, time.time()))
+        except queue.Full:
+            self._dropped += 1
+
+    def close(self, timeout=30.0):
+        """Flushes pending alerts and stops the worker; waits at most `timeout` seconds."""
+        if not self._worker.is_alive():
+            return
+        self._stopping.set()
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while not self._stopping.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            while not stop:  # Closing (or window over): take what is already queued without waiting
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            self._deliver(coalesce(batch))
+
+    def _deliver(self, entries):
+        dropped, self._dropped = self._dropped, 0
+        subject, body = render(entries, dropped)
+        sent = []
+        for sink in self.sinks:
+            for attempt in range(self.retries + 1):
+                try:
+                    sink.send(subject, body, entries)
+                    sent.append(sink.name)
+                    break
+                except Exception as e:
+                    if attempt == self.retries:
+                        self.failures[sink.name] = self.failures.get(sink.name, 0) + 1
+                        print(f"⚠️ {sink.name} alert delivery failed after {attempt + 1} attempts: {e}")
+                    else:
+                        # Closing shortens the wait, so shutdown isn't held hostage by a dead server
+                        self._stopping.wait(self.backoff * 2 ** attempt)
+        if sent:
+            self.delivered += 1
+            print(f"📨 Alert digest sent ({len(entries)} issues) via {', '.join(sent)}")
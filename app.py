@@ -4,55 +4,342 @@
 # Serves endpoints from prebuilt SQLite views with resilience and clarity
 # ──────────────────────────────────────────────────────────────────────────────
 
-from flask import Flask, jsonify, request
-import sqlite3
+import base64
+import datetime
+import json
+import time
+from functools import wraps
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+from werkzeug.datastructures import MultiDict
+from cache import ResponseCache, normalize_params
+from distribution import TimeToHireDistribution, DEFAULT_BINS, DEFAULT_IQR, DEFAULT_PERCENTILES, MAX_BINS
+from tenure import TenureIndex
+import db
+import metrics
 
 app = Flask(__name__)
 DB_PATH = 'hris_project.db'
+response_cache = ResponseCache()
+time_to_hire_distribution = TimeToHireDistribution()
+tenure_index = TenureIndex()
+
+PAGE_SIZE = 100          # Default rows per listing page
+MAX_PAGE_SIZE = 10_000   # Upper bound for ?limit=
+FETCH_BATCH = 500        # Rows pulled from SQLite per fetchmany while streaming
+INTERNAL_COLUMNS = {'row_key', 'name_key', 'hire_id'}
 
 
 # STEP 2: Shared Safe Query Function
+# Runs on this thread's pooled read-only connection (see db.py)
 # ──────────────────────────────────────────────────────────────────────────────
-def safe_query(query, transform_fn):
+def safe_query(query, transform_fn, params=(), label=None):
     """Wraps DB access with structured error handling and metadata."""
+    label = label or request.endpoint
     try:
-        conn = sqlite3.connect(DB_PATH)
-        results = conn.execute(query).fetchall()
-        return jsonify({
-            "count": len(results),
-            "data": [transform_fn(row) for row in results]
-        })
+        conn = db.get_connection(DB_PATH)
+        results = metrics.timed_fetchall(conn, label, query, params)
     except Exception as e:
+        db.discard_connection(DB_PATH)
         return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
+
+    start = time.perf_counter()
+    response = jsonify({
+        "count": len(results),
+        "data": [transform_fn(row) for row in results]
+    })
+    metrics.JSON_LATENCY.observe(time.perf_counter() - start, request.endpoint)
+    return response
+
+
+# STEP 2a: Request Instrumentation
+# Latency per route template (bounded label set); streamed bodies are timed to first byte
+# ──────────────────────────────────────────────────────────────────────────────
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.REQUEST_LATENCY.observe(time.perf_counter() - start,
+                                        endpoint, request.method, response.status_code)
+    return response
+
+
+# STEP 2b: Generation-Aware Response Cache
+# Analytics only change when transform.py stamps a new data generation
+# ──────────────────────────────────────────────────────────────────────────────
+def current_generation():
+    """Returns the data-generation stamp written by transform.create_views, or None."""
+    try:
+        row = db.get_connection(DB_PATH).execute("SELECT generation FROM data_generation").fetchone()
+    except Exception:
+        return None
+    return row[0] if row else None
+
+
+def cached_endpoint(casefold=()):
+    """
+    Caches successful JSON responses per (path, normalized query params) for the
+    current data generation, and answers matching If-None-Match with 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            generation = current_generation()
+            if generation is None:
+                return view(*args, **kwargs)
+
+            key = (request.path, normalize_params(request.args, casefold))
+            entry = response_cache.get(key, generation)
+            if entry is None:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = response_cache.put(key, generation, response.get_data(), response.mimetype)
+
+            if entry.etag in request.if_none_match:
+                response = app.response_class(status=304)
+            else:
+                response = app.response_class(entry.body, mimetype=entry.mimetype)
+            response.set_etag(entry.etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
 
 
 # STEP 3: Endpoint — /hiring-metrics
-# Returns average time-to-hire by department
+# Time-to-hire and hire counts from the hiring_rollup cells built by transform.py.
+# Filters: department, role, employment_type, from/to (months); ?group_by= picks
+# the breakdown (default: department). Cost follows the number of matching cells,
+# not the number of hires.
 # ──────────────────────────────────────────────────────────────────────────────
+ROLLUP_DIMENSIONS = {'department': 'department', 'role': 'role',
+                     'month': 'hire_month', 'employment_type': 'employment_type'}
+ROLLUP_FILTERS = ('department', 'role', 'employment_type')
+
+
+def parse_month(name, args=None):
+    """?from= / ?to= as YYYY-MM (a full YYYY-MM-DD date selects its month)."""
+    value = (request.args if args is None else args).get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value if len(value) > 7 else f"{value}-01").strftime('%Y-%m')
+    except ValueError:
+        raise BadRequest(f"{name} must be a month (YYYY-MM) or an ISO date")
+
+
+def build_rollup_query(args=None):
+    """Builds the hiring_rollup aggregate query, its bind parameters and output keys."""
+    args = request.args if args is None else args
+    group_by = [name.strip() for name in args.get('group_by', 'department').split(',') if name.strip()]
+    unknown = [name for name in group_by if name not in ROLLUP_DIMENSIONS]
+    if unknown or len(set(group_by)) != len(group_by):
+        raise BadRequest(f"group_by must be distinct names from: {', '.join(ROLLUP_DIMENSIONS)}")
+
+    where, params = [], []
+    for name in ROLLUP_FILTERS:
+        value = args.get(name, '').strip()
+        if value:
+            where.append(f"{name} = ? COLLATE NOCASE")
+            params.append(value)
+    month_from, month_to = parse_month('from', args), parse_month('to', args)
+    if month_from:
+        where.append("hire_month >= ?")
+        params.append(month_from)
+    if month_to:
+        where.append("hire_month <= ?")
+        params.append(month_to)
+
+    columns = [ROLLUP_DIMENSIONS[name] for name in group_by]
+    query = f"""
+        SELECT {''.join(column + ', ' for column in columns)}
+               SUM(hires) AS hires,
+               ROUND(SUM(time_to_hire_sum) / SUM(time_to_hire_count), 1) AS avg_time_to_hire,
+               MIN(time_to_hire_min) AS min_time_to_hire,
+               MAX(time_to_hire_max) AS max_time_to_hire
+        FROM hiring_rollup
+    """
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    if columns:
+        query += f" GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}"
+    keys = group_by + ['hires', 'avg_time_to_hire', 'min_time_to_hire', 'max_time_to_hire']
+    return query, params, keys
+
+
 @app.route('/hiring-metrics')
+@cached_endpoint(casefold=ROLLUP_FILTERS)
 def hiring_metrics():
-    conn = sqlite3.connect(DB_PATH)
-    query = """
-        SELECT department, 
-               ROUND(AVG(time_to_hire_days), 1) AS avg_time_to_hire
-        FROM time_to_hire
-        GROUP BY department
-    """
-    results = conn.execute(query).fetchall()
-    conn.close()
-    data = [{"department": row[0], "avg_time_to_hire": row[1]} for row in results]
+    try:
+        query, params, keys = build_rollup_query()
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    return safe_query(query, lambda row: dict(zip(keys, row)), params)
+
+# STEP 3a: Endpoint — /hiring-metrics/distribution
+# Percentiles, histogram and outliers of time-to-hire per department, from
+# NumPy arrays loaded once per data generation (see distribution.py).
+# Same filters as /hiring-metrics, plus ?percentiles=50,90,99 &bins=20 &iqr=1.5
+# ──────────────────────────────────────────────────────────────────────────────
+def parse_number(name, default, cast, low, high):
+    value = request.args.get(name, '').strip()
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        raise BadRequest(f"{name} must be a number")
+    if not low <= number <= high:
+        raise BadRequest(f"{name} must be between {low} and {high}")
+    return number
+
+
+def parse_percentiles():
+    value = request.args.get('percentiles', '').strip()
+    if not value:
+        return DEFAULT_PERCENTILES
+    try:
+        percentiles = tuple(float(p) for p in value.split(','))
+    except ValueError:
+        raise BadRequest("percentiles must be comma-separated numbers")
+    if not all(0 <= p <= 100 for p in percentiles):
+        raise BadRequest("percentiles must be between 0 and 100")
+    return percentiles
+
+
+@app.route('/hiring-metrics/distribution')
+@cached_endpoint(casefold=ROLLUP_FILTERS)
+def hiring_distribution():
+    try:
+        filters = {name: request.args.get(name, '').strip() or None for name in ROLLUP_FILTERS}
+        options = {
+            'month_from': parse_month('from'),
+            'month_to': parse_month('to'),
+            'percentiles': parse_percentiles(),
+            'bins': parse_number('bins', DEFAULT_BINS, int, 1, MAX_BINS),
+            'iqr': parse_number('iqr', DEFAULT_IQR, float, 0, 100),
+        }
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        time_to_hire_distribution.ensure(db.get_connection(DB_PATH), current_generation())
+    except Exception as e:
+        db.discard_connection(DB_PATH)
+        return jsonify({"error": str(e)}), 500
+
+    data = time_to_hire_distribution.query(**filters, **options)
     return jsonify({"count": len(data), "data": data})
 
+# STEP 3b: Endpoint — /employees/tenure
+# Employees employed on ?on= (default: today), with tenure on that date between
+# ?min_months= and ?max_months=, optionally for one ?department=. Answered from
+# per-department interval trees loaded once per data generation (see tenure.py).
+# Not response-cached: the default date moves with the calendar, not the data.
+# ──────────────────────────────────────────────────────────────────────────────
+MAX_TENURE_MONTHS = 1_200
+
+
+@app.route('/employees/tenure')
+def employee_tenure():
+    try:
+        options = {
+            'on': parse_date('on') or datetime.date.today().isoformat(),
+            'department': request.args.get('department', '').strip() or None,
+            'min_months': parse_number('min_months', None, float, 0, MAX_TENURE_MONTHS),
+            'max_months': parse_number('max_months', None, float, 0, MAX_TENURE_MONTHS),
+            'limit': parse_number('limit', PAGE_SIZE, int, 0, MAX_PAGE_SIZE),
+        }
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        tenure_index.ensure(db.get_connection(DB_PATH), current_generation())
+    except Exception as e:
+        db.discard_connection(DB_PATH)
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({"on": options['on'], **tenure_index.query(**options)})
+
+# STEP 3c: Endpoint — /headcount
+# Hires, terminations, period-end headcount and attrition (terminations over
+# average headcount) per ?freq=day|month|year, company-wide or ?group_by=department,
+# summed from the headcount_daily sweep table built by transform.py.
+# Filters: department, from/to (ISO dates)
+# ──────────────────────────────────────────────────────────────────────────────
+HEADCOUNT_PERIODS = {'day': 'date', 'month': "strftime('%Y-%m', date)", 'year': "strftime('%Y', date)"}
+
+
+def build_headcount_query(args=None):
+    """Builds the headcount series query (department periods first, then summed), its params and keys."""
+    args = request.args if args is None else args
+    freq = args.get('freq', 'month').strip().lower()
+    if freq not in HEADCOUNT_PERIODS:
+        raise BadRequest(f"freq must be one of: {', '.join(HEADCOUNT_PERIODS)}")
+    group_by = args.get('group_by', '').strip().lower()
+    if group_by not in ('', 'department'):
+        raise BadRequest("group_by must be 'department' or omitted")
+
+    where, params = [], []
+    department = args.get('department', '').strip()
+    if department:
+        where.append("department = ? COLLATE NOCASE")
+        params.append(department)
+    date_from, date_to = parse_date('from', args), parse_date('to', args)
+    if date_from:
+        where.append("date >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("date <= ?")
+        params.append(date_to)
+
+    # headcount is a bare column next to MAX(date): SQLite takes it from the period's last day
+    outer = ['department'] if group_by else []
+    query = f"""
+        SELECT {''.join(column + ', ' for column in outer)}period,
+               SUM(hires) AS hires,
+               SUM(terminations) AS terminations,
+               SUM(headcount) AS headcount,
+               ROUND(SUM(terminations) / NULLIF(SUM(avg_headcount), 0), 4) AS attrition_rate
+        FROM (
+            SELECT department, {HEADCOUNT_PERIODS[freq]} AS period,
+                   SUM(hires) AS hires, SUM(terminations) AS terminations,
+                   AVG(headcount) AS avg_headcount, headcount, MAX(date) AS period_end
+            FROM headcount_daily
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            GROUP BY department, period
+        )
+        GROUP BY {''.join(column + ', ' for column in outer)}period
+        ORDER BY {''.join(column + ', ' for column in outer)}period
+    """
+    keys = outer + [freq, 'hires', 'terminations', 'headcount', 'attrition_rate']
+    return query, params, keys
+
+
+HEADCOUNT_CASEFOLD = ('department', 'freq', 'group_by')
+
+
+@app.route('/headcount')
+@cached_endpoint(casefold=HEADCOUNT_CASEFOLD)
+def headcount_series():
+    try:
+        query, params, keys = build_headcount_query()
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    return safe_query(query, lambda row: dict(zip(keys, row)), params)
+
 # STEP 4: Endpoint — /applicants/status-summary
 # Returns count of applicants by status, with optional ?status=filter
 # ──────────────────────────────────────────────────────────────────────────────
-@app.route('/applicants/status-summary')
-def status_summary():
-    status_filter = request.args.get('status')
-    conn = sqlite3.connect(DB_PATH)
-
+def build_status_query(args=None):
+    """Status counts query, its params, output keys and statement label (filtered counts hit applicants)."""
+    status_filter = (request.args if args is None else args).get('status', '').strip()
     if status_filter:
         query = """
             SELECT status, COUNT(*) AS count
@@ -60,16 +347,258 @@ def status_summary():
             WHERE LOWER(status) = ?
             GROUP BY status
         """
-        results = conn.execute(query, (status_filter.lower(),)).fetchall()
-    else:
-        query = "SELECT status, count FROM status_summary"
-        results = conn.execute(query).fetchall()
+        return query, [status_filter.lower()], ['status', 'count'], 'status_summary_filtered'
+    return "SELECT status, count FROM status_summary", [], ['status', 'count'], 'status_summary'
 
-    conn.close()
-    data = [{"status": row[0], "count": row[1]} for row in results]
-    return jsonify({"count": len(data), "data": data})
 
-# STEP 5: Start API Server
+@app.route('/applicants/status-summary')
+@cached_endpoint(casefold=('status',))
+def status_summary():
+    query, params, keys, label = build_status_query()
+    return safe_query(query, lambda row: dict(zip(keys, row)), params, label=label)
+
+# STEP 4a: Endpoint — POST /metrics/batch
+# Several metric queries in one round trip:
+#   {"requests": [{"id": "sales", "metric": "hiring-metrics", "params": {"department": "Sales"}}, ...]}
+# Every query runs on this thread's pooled connection inside one read
+# transaction, so all results come from the same data generation. Identical
+# sub-requests (same metric, normalized params) run once. Bad params fail only
+# their own entry (status 400); a database error fails the batch (500).
+# ──────────────────────────────────────────────────────────────────────────────
+MAX_BATCH = 50
+
+# metric → (builder returning query, params, keys, statement label; casefolded params)
+BATCH_METRICS = {
+    'hiring-metrics': (lambda args: (*build_rollup_query(args), 'hiring_metrics'), ROLLUP_FILTERS),
+    'status-summary': (build_status_query, ('status',)),
+    'headcount': (lambda args: (*build_headcount_query(args), 'headcount_series'), HEADCOUNT_CASEFOLD),
+}
+
+
+def parse_batch(body):
+    """Validates the batch body into (id, metric, args) triples; ids default to the list position."""
+    items = body.get('requests') if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        raise BadRequest('Body must be {"requests": [{"metric": ..., "params": {...}}, ...]}')
+    if len(items) > MAX_BATCH:
+        raise BadRequest(f"At most {MAX_BATCH} requests per batch")
+    batch = []
+    for position, item in enumerate(items):
+        if not isinstance(item, dict) or item.get('metric') not in BATCH_METRICS:
+            raise BadRequest(f"requests[{position}].metric must be one of: {', '.join(BATCH_METRICS)}")
+        params = item.get('params') or {}
+        if not isinstance(params, dict) or not all(
+                isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in params.values()):
+            raise BadRequest(f"requests[{position}].params must map names to strings or numbers")
+        batch.append((item.get('id', position), item['metric'],
+                      MultiDict({name: str(value) for name, value in params.items()})))
+    return batch
+
+
+@app.route('/metrics/batch', methods=['POST'])
+def metrics_batch():
+    try:
+        batch = parse_batch(request.get_json(silent=True))
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+
+    plans, batch_keys = {}, []
+    for _, metric, args in batch:
+        build, casefold = BATCH_METRICS[metric]
+        key = (metric, normalize_params(args, casefold))
+        batch_keys.append(key)
+        if key not in plans:
+            try:
+                plans[key] = build(args)
+            except BadRequest as e:
+                plans[key] = e
+
+    results = {}
+    try:
+        conn = db.get_connection(DB_PATH)
+        conn.execute("BEGIN")  # Deferred: the snapshot is taken by the first read below
+        try:
+            generation = db.read_generation(conn)  # Same connection: a reload can't split the snapshot
+            for key, plan in plans.items():
+                if not isinstance(plan, BadRequest):
+                    query, params, keys, label = plan
+                    results[key] = (keys, metrics.timed_fetchall(conn, label, query, params))
+        finally:
+            conn.rollback()  # Read-only: nothing to commit, just release the snapshot
+    except Exception as e:
+        db.discard_connection(DB_PATH)
+        return jsonify({"error": str(e)}), 500
+
+    start = time.perf_counter()
+    entries = []
+    for (request_id, metric, _), key in zip(batch, batch_keys):
+        if key in results:
+            keys, rows = results[key]
+            entries.append({"id": request_id, "metric": metric, "status": 200,
+                            "count": len(rows), "data": [dict(zip(keys, row)) for row in rows]})
+        else:
+            entries.append({"id": request_id, "metric": metric, "status": 400, "error": str(plans[key])})
+    response = jsonify({"generation": generation, "count": len(entries), "executed": len(results),
+                        "results": entries})
+    metrics.JSON_LATENCY.observe(time.perf_counter() - start, request.endpoint)
+    return response
+
+# STEP 5: Keyset-Paginated Listings — shared helpers
+# Pages are ordered by (date column, key column); the cursor is the last key
+# seen, so page N costs one index seek no matter how deep it is. The key is
+# rowid for tables; time_to_hire carries its own hire_id (its match row's rowid),
+# since a view has no rowid.
+# ──────────────────────────────────────────────────────────────────────────────
+class BadRequest(ValueError):
+    """Invalid listing parameters — reported to the caller as a 400."""
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        date_value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return date_value, int(key)
+    except Exception:
+        raise BadRequest("Invalid cursor")
+
+
+def parse_date(name, args=None):
+    value = (request.args if args is None else args).get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise BadRequest(f"{name} must be an ISO date (YYYY-MM-DD)")
+
+
+def build_listing_query(table, date_column, filters, columns, key_column='rowid'):
+    """Builds the filtered keyset page query and its bind parameters from request args."""
+    where, params = [], []
+    for name in filters:
+        value = request.args.get(name)
+        if value:
+            if name not in columns:
+                raise BadRequest(f"Filter '{name}' is not available on {table}")
+            where.append(f"{name} = ? COLLATE NOCASE")
+            params.append(value.strip())
+
+    date_from, date_to = parse_date('from'), parse_date('to')
+    if date_from:
+        where.append(f"{date_column} >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append(f"{date_column} < date(?, '+1 day')")
+        params.append(date_to)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        last_date, last_key = decode_cursor(cursor)
+        if last_date is None:  # NULL dates sort first
+            where.append(f"(({date_column} IS NULL AND {key_column} > ?) OR {date_column} IS NOT NULL)")
+            params.append(last_key)
+        else:
+            where.append(f"({date_column}, {key_column}) > (?, ?)")
+            params.extend([last_date, last_key])
+
+    try:
+        limit = int(request.args.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise BadRequest("limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise BadRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    select = ', '.join(columns)
+    query = f"SELECT {key_column}, {select} FROM {table}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    query += f" ORDER BY {date_column}, {key_column} LIMIT ?"
+    return query, params + [limit]
+
+
+def stream_listing(table, date_column, filters, key_column='rowid'):
+    """
+    Runs a keyset page query and streams rows as chunked JSON (default) or
+    NDJSON (?format=ndjson) without materializing the page in memory.
+    """
+    try:
+        conn = db.get_connection(DB_PATH)
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")
+                   if row[1] not in INTERNAL_COLUMNS]
+        query, params = build_listing_query(table, date_column, filters, columns, key_column)
+        start = time.perf_counter()
+        rows = conn.execute(query, params)
+        execute_seconds = time.perf_counter() - start
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        db.discard_connection(DB_PATH)
+        return jsonify({"error": str(e)}), 500
+
+    date_index = columns.index(date_column)
+    limit = params[-1]
+    ndjson = request.args.get('format') == 'ndjson'
+    endpoint = request.endpoint
+
+    def generate():
+        count, last = 0, None
+        sql_seconds, json_seconds = execute_seconds, 0.0
+        yield '' if ndjson else '{"data": ['
+        while True:
+            start = time.perf_counter()
+            batch = rows.fetchmany(FETCH_BATCH)
+            sql_seconds += time.perf_counter() - start
+            if not batch:
+                break
+            start = time.perf_counter()
+            records = [json.dumps(dict(zip(columns, row[1:])), default=str) for row in batch]
+            json_seconds += time.perf_counter() - start
+            for row, record in zip(batch, records):
+                if ndjson:
+                    yield record + '\n'
+                else:
+                    yield (',' if count else '') + record
+                count += 1
+                last = row
+        metrics.record_query(conn, endpoint, query, params, sql_seconds, count)
+        metrics.JSON_LATENCY.observe(json_seconds, endpoint)
+        next_cursor = encode_cursor([last[date_index + 1], last[0]]) if count == limit else None
+        if ndjson:
+            yield json.dumps({"next_cursor": next_cursor}) + '\n'
+        else:
+            yield '], ' + json.dumps({"count": count, "next_cursor": next_cursor})[1:]
+
+    mimetype = 'application/x-ndjson' if ndjson else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+
+# STEP 6: Endpoints — /applicants and /hires
+# Filters: role, from/to dates, cursor, limit; plus status (/applicants) or department (/hires)
+# ──────────────────────────────────────────────────────────────────────────────
+@app.route('/applicants')
+def list_applicants():
+    return stream_listing('applicants', 'application_date', ('role', 'status'))
+
+
+@app.route('/hires')
+def list_hires():
+    return stream_listing('time_to_hire', 'hire_date', ('department', 'role'), 'hire_id')
+
+# STEP 7: Endpoint — /metrics
+# Prometheus text exposition: request/SQL/JSON histograms, cache and pipeline stage stats.
+# Counters are per process — under serve.py each worker reports its own.
+# ──────────────────────────────────────────────────────────────────────────────
+@app.route('/metrics')
+def prometheus_metrics():
+    generation = metrics.Gauge('hris_data_generation', 'Data generation stamp being served (ns since epoch)')
+    generation.set(value=current_generation() or 0)
+    body = metrics.render([generation] + metrics.cache_metrics(response_cache) + metrics.stage_gauges())
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+# STEP 8: Start API Server
 # ──────────────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     app.run(debug=True)
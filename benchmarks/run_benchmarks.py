@@ -0,0 +1,217 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# run_benchmarks.py — HRIS Pipeline & API Scaling Benchmarks
+# Generates synthetic data at each requested scale, times every pipeline stage
+# and API endpoint, and emits machine-readable JSON for regression tracking.
+#
+#   python -m benchmarks.run_benchmarks --scales 10000 100000 --output bench.json
+# ──────────────────────────────────────────────────────────────────────────────
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import data_loader
+import generate_charts
+import quality
+import transform
+from benchmarks.synthetic_data import generate, write_exports, write_workbook
+
+DEFAULT_SCALES = [10_000, 100_000]
+EXCEL_LIMIT = 200_000     # Above this, the xlsx step is skipped (slow to write, capped at ~1M rows)
+API_ITERATIONS = 50
+API_ENDPOINTS = [
+    '/hiring-metrics',
+    '/applicants/status-summary',
+    '/applicants/status-summary?status=hired',
+    '/applicants?limit=100',
+    '/hires?limit=100',
+    '/headcount',
+]
+
+# ───────────────────────────── Timing Helpers ─────────────────────────────
+def timed(timings, name, fn, *args, **kwargs):
+    """Runs fn with stdout silenced and stores its wall-clock seconds under `name`."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    timings[name] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    return {
+        'p50_ms': round(statistics.median(samples) * 1000, 3),
+        'p95_ms': round(samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000, 3),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+def bench_api(iterations):
+    """Per-endpoint latency through the Flask test client, with and without the response cache."""
+    import app as app_module
+    client = app_module.app.test_client()
+    results = {}
+    for endpoint in API_ENDPOINTS:
+        uncached, cached = [], []
+        for _ in range(iterations):
+            app_module.response_cache.clear()
+            start = time.perf_counter()
+            response = client.get(endpoint)
+            response.get_data()
+            uncached.append(time.perf_counter() - start)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            client.get(endpoint).get_data()
+            cached.append(time.perf_counter() - start)
+        results[endpoint] = {'status': response.status_code,
+                             'uncached': latency_summary(uncached),
+                             'cached': latency_summary(cached)}
+    return results
+
+# ───────────────────────────── Data Quality ─────────────────────────────
+# The pre-engine approach: one SQL query (and one applicant ↔ employee join) per rule.
+# Kept here as the baseline that quality.run_checks is measured against.
+PER_RULE_QUERIES = {
+    'hire_before_application': """
+        SELECT a.name, a.role, a.application_date, e.hire_date, e.department
+        FROM applicant_employee_match m
+        JOIN applicants a ON a.rowid = m.applicant_rowid
+        JOIN employees e ON e.rowid = m.employee_rowid
+        WHERE julianday(e.hire_date) < julianday(a.application_date)""",
+    'implausible_time_to_hire': f"""
+        SELECT a.name, a.role, a.application_date, e.hire_date, e.department
+        FROM applicant_employee_match m
+        JOIN applicants a ON a.rowid = m.applicant_rowid
+        JOIN employees e ON e.rowid = m.employee_rowid
+        WHERE julianday(e.hire_date) - julianday(a.application_date) > {quality.MAX_PLAUSIBLE_TIME_TO_HIRE}""",
+    'end_before_start': """
+        SELECT name, department, hire_date, end_date FROM employees
+        WHERE julianday(end_date) < julianday(hire_date)""",
+    'missing_hire_date': "SELECT name, department, hire_date, end_date FROM employees WHERE hire_date IS NULL",
+    'orphan_hire': """
+        SELECT e.name, e.department, e.hire_date, e.end_date FROM employees e
+        LEFT JOIN applicant_employee_match m ON m.employee_rowid = e.rowid
+        WHERE m.employee_rowid IS NULL""",
+    'unknown_status': f"""
+        SELECT name, role, status, application_date FROM applicants
+        WHERE status IS NULL OR LOWER(TRIM(status)) NOT IN ({', '.join(repr(s) for s in sorted(quality.KNOWN_STATUSES))})""",
+}
+
+
+def bench_quality(conn, timings):
+    """Times the rule engine (one counting pass per row source) against one query per rule."""
+    def per_rule():
+        return {name: generate_charts.read_frame(query, conn) for name, query in PER_RULE_QUERIES.items()}
+
+    per_rule_frames = timed(timings, 'dq_per_rule_sql', per_rule)
+    violations, _ = timed(timings, 'dq_engine_total', quality.evaluate, conn)
+    return {name: {'engine': len(violations[name]), 'per_rule_sql': len(df)}
+            for name, df in per_rule_frames.items()}
+
+# ───────────────────────────── One Scale ─────────────────────────────
+def bench_scale(n_applicants, workdir, excel_limit=EXCEL_LIMIT, api_iterations=API_ITERATIONS, seed=0):
+    """Runs the full pipeline + API at one scale inside `workdir`; returns a result dict."""
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)  # Every module resolves hris_project.db and logs/ relative to cwd
+    timings = {}
+
+    frames = timed(timings, 'generate', generate, n_applicants, seed=seed)
+    rows = {'employees': len(frames[0]), 'applicants': len(frames[1]), 'employment_types': len(frames[2])}
+
+    exports = timed(timings, 'write_csv_exports', write_exports, frames, os.path.join(workdir, 'exports'))
+    timed(timings, 'stream_load', data_loader.stream_load, exports)
+
+    if n_applicants <= excel_limit:
+        workbook = timed(timings, 'write_workbook', write_workbook, frames, os.path.join(workdir, 'hris.xlsx'))
+        data_loader.EXCEL_PATH = workbook
+        frames = timed(timings, 'load_excel_data', data_loader.load_excel_data)
+    else:
+        frames = [df.copy() for df in frames]
+        for df in frames:
+            df.columns = data_loader.normalize_columns(df.columns)
+
+    frames = timed(timings, 'clean_dataframes', data_loader.clean_dataframes, *frames)
+    # write_to_sqlite publishes a complete database, views included; create_views
+    # times transform.py's in-place rebuild of the same analytical tables
+    timed(timings, 'write_to_sqlite', data_loader.write_to_sqlite, *frames)
+    timed(timings, 'create_views', transform.create_views, log_errors=False)
+
+    conn = sqlite3.connect(data_loader.DB_PATH)
+    try:
+        timed(timings, 'log_invalid_hires', transform.log_invalid_hires, conn)
+        dq_counts = bench_quality(conn, timings)
+        for spec in generate_charts.CHARTS:
+            timed(timings, f'chart_fetch:{spec.filename}', generate_charts.read_frame, spec.query, conn, spec.params)
+    finally:
+        conn.close()
+
+    return {
+        'scale': n_applicants,
+        'rows': rows,
+        'timings_s': timings,
+        'db_size_mb': round(os.path.getsize(data_loader.DB_PATH) / 2 ** 20, 2),
+        'dq_violations': dq_counts,
+        'api': bench_api(api_iterations),
+    }
+
+# ───────────────────────────── Report ─────────────────────────────
+def environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                         cwd=os.path.dirname(os.path.abspath(data_loader.__file__)),
+                                         stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sqlite': sqlite3.sqlite_version,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the HRIS pipeline at synthetic scales")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Applicant row counts to benchmark (e.g. 10000 1000000 10000000)")
+    parser.add_argument('--excel-limit', type=int, default=EXCEL_LIMIT,
+                        help="Largest scale that also times the xlsx load")
+    parser.add_argument('--api-iterations', type=int, default=API_ITERATIONS)
+    parser.add_argument('--workdir', default=None, help="Scratch directory (default: a temp dir)")
+    parser.add_argument('--output', default=None, help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    cwd = os.getcwd()
+    report = {'environment': environment(), 'results': []}
+    with tempfile.TemporaryDirectory(prefix='hris-bench-') as tmp:
+        for scale in args.scales:
+            print(f"⏱️ Benchmarking {scale:,} applicants...", file=sys.stderr)
+            workdir = os.path.join(args.workdir or tmp, f'scale_{scale}')
+            report['results'].append(bench_scale(scale, workdir, args.excel_limit, args.api_iterations))
+            os.chdir(cwd)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload + '\n')
+        print(f"✅ Benchmark results written to {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+    return report
+
+
+if __name__ == '__main__':
+    main()
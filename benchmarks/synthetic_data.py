@@ -0,0 +1,111 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# synthetic_data.py — Synthetic HRIS Workbook Generator
+# Produces Employees / Applicants / EmploymentType sheets shaped like the ATS
+# and payroll exports, at any scale, with the same real-world noise: duplicate
+# rows, name whitespace/case drift, missing statuses and invalid hire dates.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import os
+import numpy as np
+import pandas as pd
+
+# ───────────────────────────── Vocabulary ─────────────────────────────
+FIRST_NAMES = ['James', 'Maria', 'Jon', 'Jonathan', 'Ana', 'Steven', 'Scott', 'Zoe', 'Omar', 'Kim',
+               'Lee', 'Ian', 'Priya', 'José', 'Chloé', 'Wei', 'Fatima', 'Noah', 'Emma', 'Liam']
+LAST_NAMES = ['Smith', 'Avila', 'Lewis', 'Brown', 'Nguyen', 'Garcia', 'Patel', 'Khan', 'Lopez',
+              'Müller', 'Johnson', 'Williams', 'Jones', 'Davis', 'Martinez', 'Wilson', 'Anderson']
+DEPARTMENTS = ['Engineering', 'Marketing', 'Sales', 'Production', 'HR', 'Finance', 'Creative']
+ROLES = ['Video Editor', 'Software Engineer', 'Producer', 'Recruiter', 'Data Analyst',
+         'Designer', 'Thumbnail Artist', 'Writer', 'Project Manager', 'Camera Operator']
+STATUSES = ['Hired', 'Rejected', 'Interviewing', 'Applied', 'Offer']
+EMPLOYMENT_TYPES = ['Full-Time', 'Part-Time', 'Contractor', 'Intern']
+EXCEL_MAX_ROWS = 1_048_575  # Data rows per sheet (plus header)
+
+
+def _person_names(rng, n):
+    """Mostly-unique names: a first/last pair plus a short per-person surname suffix."""
+    first = np.asarray(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)]
+    last = np.asarray(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), n)]
+    suffix = np.char.mod('%X', np.arange(n) + 16).astype(object)
+    return pd.Series(first) + ' ' + pd.Series(last) + '-' + pd.Series(suffix)
+
+# ───────────────────────────── Generator ─────────────────────────────
+def generate(n_applicants, seed=0, hire_rate=0.35, duplicate_rate=0.02,
+             noise_rate=0.1, invalid_hire_rate=0.03, missing_status_rate=0.02):
+    """
+    Returns raw (employees_df, applicants_df, employment_type_df) with
+    workbook-style headers, e.g. 'Application Date', ready for data_loader.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_applicants)
+    names = _person_names(rng, n)
+
+    # ───── Applicants ─────
+    app_dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 5 * 365, n), unit='D')
+    statuses = np.asarray(STATUSES, dtype=object)[rng.integers(0, len(STATUSES), n)]
+    statuses[rng.random(n) < missing_status_rate] = None
+    applicants = pd.DataFrame({
+        'Applicant ID': np.arange(1, n + 1),
+        'Name': names,
+        'Role': np.asarray(ROLES, dtype=object)[rng.integers(0, len(ROLES), n)],
+        'Application Date': app_dates,
+        'Status': statuses,
+    })
+
+    # ───── Employees (a subset of applicants got hired) ─────
+    hired = np.sort(rng.choice(n, size=max(int(n * hire_rate), 1), replace=False))
+    m = len(hired)
+    offsets = rng.gamma(shape=2.0, scale=20.0, size=m).astype(int) + 1
+    invalid = rng.random(m) < invalid_hire_rate
+    offsets[invalid] = -rng.integers(1, 400, invalid.sum())  # Hire before application
+    start = app_dates[hired] + pd.to_timedelta(offsets, unit='D')
+    tenure = pd.to_timedelta(rng.integers(30, 4 * 365, m), unit='D')
+    end = pd.Series(start + tenure).where(rng.random(m) < 0.25)  # ~25% have left
+
+    emp_names = names.iloc[hired].reset_index(drop=True)
+    noisy = rng.random(m) < noise_rate
+    emp_names[noisy] = '  ' + emp_names[noisy].str.upper() + ' '  # Whitespace/case drift
+    types = np.asarray(EMPLOYMENT_TYPES, dtype=object)[rng.integers(0, len(EMPLOYMENT_TYPES), m)]
+    employees = pd.DataFrame({
+        'Employee ID': np.arange(1, m + 1),
+        'Name': emp_names,
+        'Department': np.asarray(DEPARTMENTS, dtype=object)[rng.integers(0, len(DEPARTMENTS), m)],
+        'Start Date': start,
+        'End Date': end.values,
+        'Employment Type': types,
+    })
+    employment_types = pd.DataFrame({'Employee ID': employees['Employee ID'], 'Employment Type': types})
+
+    # ───── Exact duplicate rows, as repeated exports produce ─────
+    def with_duplicates(df):
+        k = int(len(df) * duplicate_rate)
+        if k == 0:
+            return df
+        extra = df.iloc[rng.integers(0, len(df), k)]
+        return pd.concat([df, extra], ignore_index=True)
+
+    return with_duplicates(employees), with_duplicates(applicants), employment_types
+
+# ───────────────────────────── Writers ─────────────────────────────
+def write_workbook(frames, path):
+    """Writes the three sheets to an .xlsx workbook (Excel caps sheets at ~1M rows)."""
+    employees, applicants, employment_types = frames
+    if max(len(employees), len(applicants)) > EXCEL_MAX_ROWS:
+        raise ValueError("Too many rows for an Excel sheet — use write_exports instead")
+    with pd.ExcelWriter(path) as writer:
+        employees.to_excel(writer, sheet_name='Employees', index=False)
+        applicants.to_excel(writer, sheet_name='Applicants', index=False)
+        employment_types.to_excel(writer, sheet_name='EmploymentType', index=False)
+    return path
+
+
+def write_exports(frames, directory, fmt='csv'):
+    """Writes <Sheet>.csv or <Sheet>.parquet files, the layout data_loader.stream_load reads."""
+    os.makedirs(directory, exist_ok=True)
+    for sheet, df in zip(('Employees', 'Applicants', 'EmploymentType'), frames):
+        path = os.path.join(directory, f'{sheet}.{fmt}')
+        if fmt == 'csv':
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, index=False)
+    return directory
@@ -0,0 +1,73 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# cache.py — Generation-Aware Response Cache for the API
+# Bounded LRU of rendered responses, invalidated by the data-generation stamp
+# ──────────────────────────────────────────────────────────────────────────────
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+CACHE_MAX_ENTRIES = 512
+
+CachedResponse = namedtuple('CachedResponse', ['body', 'mimetype', 'etag'])
+
+# ───────────────────────────── Key Normalization ─────────────────────────────
+def normalize_params(args, casefold=()):
+    """
+    Turns query parameters into a hashable, order-independent key.
+    Values are stripped; parameters listed in `casefold` are also lowercased
+    (e.g. ?status=Hired and ?status=hired hit the same entry).
+    """
+    items = []
+    for name in sorted(args):
+        for value in sorted(args.getlist(name)):
+            value = value.strip()
+            items.append((name, value.lower() if name in casefold else value))
+    return tuple(items)
+
+# ───────────────────────────── Cache ─────────────────────────────
+class ResponseCache:
+    """
+    Thread-safe LRU of rendered response bodies for one data generation.
+    Seeing a new generation drops every entry built from the previous one.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        with self._lock:
+            if generation != self.generation:
+                self._entries.clear()
+                self.generation = generation
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, generation, body, mimetype):
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        entry = CachedResponse(body, mimetype, etag)
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation = None
+
+    def __len__(self):
+        return len(self._entries)
@@ -3,15 +3,66 @@
 # Loads Excel worksheets into SQLite, normalizes structure
 # ──────────────────────────────────────────────────────────────────────────────
 
+import argparse
+import hashlib
 import pandas as pd
 import sqlite3
 import os
+import tempfile
+from contextlib import contextmanager
+
+import metrics
+import transform
 
 # ───────────────────────────── Constants ─────────────────────────────
 EXCEL_PATH = r'C:\Users\Stephen\Projects\MrBeastSeniorHRISEngineerTakeHomeProject\HRIS_TAKE_HOME_PROJECT_DATA.xlsx'
 DB_PATH = 'hris_project.db'
 
+# Dedup key per table — also the row identity used by incremental loads
+TABLE_KEYS = {
+    'employees': ['name', 'hire_date', 'department'],
+    'applicants': ['name', 'role', 'application_date'],
+    'employment_types': ['employment_type'],
+}
+MANIFEST_TABLE = 'ingest_manifest'     # One fingerprint per loaded sheet
+ROW_HASH_TABLE = 'ingest_row_hashes'   # One (row_key, row_hash) per loaded row
+
+# Source sheet → SQLite table, in load order
+SHEET_TABLES = {
+    'Employees': 'employees',
+    'Applicants': 'applicants',
+    'EmploymentType': 'employment_types',  # Sheet name renamed and trimmed
+}
+CHUNK_SIZE = 50_000  # Rows per chunk for the streaming ingest path
+
+# ───────────────────────────── Normalization ─────────────────────────────
+def normalize_columns(columns):
+    """Normalize column headers to snake_case."""
+    return pd.Index(columns).astype(str).str.strip().str.lower().str.replace(' ', '_')
+
+
+def normalize_employees(df):
+    """Derive hire_date from start_date and parse end_date."""
+    df['hire_date'] = pd.to_datetime(df['start_date'], errors='coerce')
+    df['end_date'] = pd.to_datetime(df['end_date'], errors='coerce')
+    return df
+
+
+def normalize_applicants(df):
+    """Parse application_date and default missing statuses."""
+    df['application_date'] = pd.to_datetime(df['application_date'], errors='coerce')
+    df['status'] = df['status'].fillna('unknown')
+    return df
+
+
+NORMALIZERS = {
+    'employees': normalize_employees,
+    'applicants': normalize_applicants,
+    'employment_types': lambda df: df,
+}
+
 # ───────────────────────────── Load Excel ─────────────────────────────
+@metrics.stage('parse')
 def load_excel_data():
     """Load all sheets from the Excel file into DataFrames."""
     if not os.path.exists(EXCEL_PATH):
@@ -23,45 +74,74 @@ def load_excel_data():
     employment_type_df = xl.parse('EmploymentType')  # Sheet name renamed and trimmed
 
     # Normalize all column headers to snake_case
-    employees_df.columns = employees_df.columns.str.strip().str.lower().str.replace(' ', '_')
-    applicants_df.columns = applicants_df.columns.str.strip().str.lower().str.replace(' ', '_')
-    employment_type_df.columns = employment_type_df.columns.str.strip().str.lower().str.replace(' ', '_')
+    employees_df.columns = normalize_columns(employees_df.columns)
+    applicants_df.columns = normalize_columns(applicants_df.columns)
+    employment_type_df.columns = normalize_columns(employment_type_df.columns)
 
     return employees_df, applicants_df, employment_type_df
 
 # ───────────────────────────── Clean Data ─────────────────────────────
+CATEGORY_COLUMNS = ('department', 'role', 'status', 'employment_type')  # Low-cardinality text
+
+
+def compact_dtypes(df):
+    """Stores low-cardinality text as categoricals and *_date columns as datetime64."""
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS and df[column].dtype != 'category':
+            df[column] = df[column].astype('category')
+        elif column.endswith('_date') and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+    return df
+
+
+def split_duplicates(df, key_cols, dropped_path=None):
+    """
+    One duplicated() pass over the dedup key. Returns (kept rows, dropped count)
+    and writes the dropped rows to `dropped_path`. Kept rows are a filtered
+    copy when there are duplicates; a duplicate-free frame is returned as is.
+    """
+    mask = df.duplicated(subset=key_cols)
+    dropped = int(mask.sum())
+    if dropped_path:
+        (df[mask] if dropped else df.iloc[:0]).to_csv(dropped_path, index=False)  # Header only: nothing dropped
+    return (df[~mask] if dropped else df), dropped
+
+
 def clean_dataframes(employees_df, applicants_df, employment_type_df):
     """Clean and normalize datasets — date formatting, deduplication, missing values."""
 
     os.makedirs('logs', exist_ok=True)
+    timer = metrics.StageTimer()
 
     # ───────────────────────────── Employees ─────────────────────────────
     print("\n🔍 Cleaning Employees data...")
-    employees_df['hire_date'] = pd.to_datetime(employees_df['start_date'], errors='coerce')
-    employees_df['end_date'] = pd.to_datetime(employees_df['end_date'], errors='coerce')
+    with timer('clean'):
+        employees_df = compact_dtypes(normalize_employees(employees_df))
 
-    pre_emp = employees_df.copy()
-    employees_df.drop_duplicates(subset=['name', 'hire_date', 'department'], inplace=True)
-    dropped_emp = pre_emp[~pre_emp.index.isin(employees_df.index)]
-    dropped_emp.to_csv('logs/dropped_employees.csv', index=False)
-    print(f"🧹 Employees deduped: {len(pre_emp)} → {len(employees_df)} (Saved {len(dropped_emp)} to logs/dropped_employees.csv)")
+    before = len(employees_df)
+    with timer('dedup'):
+        employees_df, dropped = split_duplicates(employees_df, TABLE_KEYS['employees'], 'logs/dropped_employees.csv')
+    print(f"🧹 Employees deduped: {before} → {len(employees_df)} (Saved {dropped} to logs/dropped_employees.csv)")
 
     # ───────────────────────────── Applicants ─────────────────────────────
     print("\n🔍 Cleaning Applicants data...")
-    applicants_df['application_date'] = pd.to_datetime(applicants_df['application_date'], errors='coerce')
-    applicants_df['status'] = applicants_df['status'].fillna('unknown')
+    with timer('clean'):
+        applicants_df = compact_dtypes(normalize_applicants(applicants_df))
 
-    pre_app = applicants_df.copy()
-    applicants_df.drop_duplicates(subset=['name', 'role', 'application_date'], inplace=True)
-    dropped_app = pre_app[~pre_app.index.isin(applicants_df.index)]
-    dropped_app.to_csv('logs/dropped_applicants.csv', index=False)
-    print(f"🧹 Applicants deduped: {len(pre_app)} → {len(applicants_df)} (Saved {len(dropped_app)} to logs/dropped_applicants.csv)")
+    before = len(applicants_df)
+    with timer('dedup'):
+        applicants_df, dropped = split_duplicates(applicants_df, TABLE_KEYS['applicants'], 'logs/dropped_applicants.csv')
+    print(f"🧹 Applicants deduped: {before} → {len(applicants_df)} (Saved {dropped} to logs/dropped_applicants.csv)")
 
     # ───────────────────────────── Employment Types ─────────────────────────────
     print("\n🔍 Cleaning Employment Types data...")
     before = len(employment_type_df)
-    employment_type_df.drop_duplicates(subset=['employment_type'], inplace=True)
+    with timer('clean'):
+        employment_type_df = compact_dtypes(employment_type_df)
+    with timer('dedup'):
+        employment_type_df, _ = split_duplicates(employment_type_df, TABLE_KEYS['employment_types'])
     print(f"🧹 Employment Types deduped: {before} → {len(employment_type_df)}")
+    timer.flush()
 
     # ───────────────────────────── Null Summary ─────────────────────────────
     print("\n🗓️ Null Date Summary:")
@@ -71,21 +151,411 @@ def clean_dataframes(employees_df, applicants_df, employment_type_df):
     return employees_df, applicants_df, employment_type_df
 
 # ───────────────────────────── Write to SQLite ─────────────────────────────
+BULK_BATCH_ROWS = 50_000                    # Rows per executemany batch
+BULK_PRAGMAS = (                            # Safe only because the file is unpublished until renamed
+    "PRAGMA journal_mode = OFF",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA locking_mode = EXCLUSIVE",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -262144",          # 256 MiB page cache
+)
+STREAM_CACHE_KIB = 16_384                   # Page cache per schema (main, temp) for stream_load
+
+
+def sqlite_type(dtype):
+    """Declared SQLite column type for a pandas dtype (dates as TIMESTAMP, like to_sql)."""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+
+def _column_values(series):
+    """One column as SQLite-ready Python values: NaN/NaT → None, dates → 'YYYY-MM-DD HH:MM:SS'."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        text = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+        return text.astype(object).where(series.notna(), None).tolist()
+    if pd.api.types.is_bool_dtype(series.dtype):
+        series = series.astype('Int64')
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def bulk_insert(conn, table, df, batch_rows=BULK_BATCH_ROWS):
+    """Creates `table` with explicit column types and fills it with batched executemany."""
+    columns = ', '.join(f'"{name}" {sqlite_type(dtype)}' for name, dtype in df.dtypes.items())
+    conn.execute(f'CREATE TABLE "{table}" ({columns})')
+    insert = f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(df.columns))})'
+    for start in range(0, len(df), batch_rows):
+        chunk = df.iloc[start:start + batch_rows]
+        conn.executemany(insert, zip(*(_column_values(chunk[name]) for name in chunk.columns)))
+
+
+def is_wal_database(path):
+    """True if `path` is in WAL mode (header bytes 18-19 are 2) or has a -wal file beside it."""
+    if os.path.exists(path + '-wal'):
+        return True
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(20)
+    except FileNotFoundError:
+        return False
+    return header[18:20] == b'\x02\x02'
+
+
+def publish_database(build_path, path=DB_PATH):
+    """
+    Makes the finished build at `build_path` the live database at `path`.
+    A missing or rollback-journal live file is replaced with one atomic rename.
+    A live file in WAL mode is never renamed over: readers still on the old
+    inode and writers on the new one would share its -wal/-shm files. Instead
+    the build is copied in with the backup API as one write transaction, which
+    WAL readers see all at once as well.
+    """
+    with open(build_path, 'rb+') as f:
+        os.fsync(f.fileno())  # synchronous=OFF skipped this; flush before the build becomes visible
+    if not is_wal_database(path):
+        # mkstemp creates 0600; keep the live file's mode so other readers (the API) can still open it
+        os.chmod(build_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(build_path, path)
+        return
+
+    source = sqlite3.connect(build_path)
+    live = sqlite3.connect(path)
+    try:
+        source.backup(live)  # Waits out other writers; stays in WAL mode
+    finally:
+        live.close()
+        source.close()
+    os.remove(build_path)
+
+
+@contextmanager
+def build_database(path=DB_PATH, pragmas=BULK_PRAGMAS, copy_live=False):
+    """
+    Yields a connection to a fresh temporary database beside `path`, set up
+    with `pragmas`. On a clean exit the views, materialized tables and
+    generation stamp are built into it, so the file is complete before
+    publish_database() makes it live: readers see the old or the new
+    database, never a partial or missing one. On error it is deleted.
+    With copy_live=True the build starts as a copy of the live database.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, build_path = tempfile.mkstemp(prefix='.hris-build-', suffix='.db', dir=directory)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(build_path)
+        try:
+            if copy_live and os.path.exists(path):
+                live = sqlite3.connect(path)
+                try:
+                    live.backup(conn)  # A consistent snapshot, even while the API reads it
+                finally:
+                    live.close()
+            for pragma in pragmas:
+                conn.execute(pragma)
+            yield conn
+            conn.commit()
+            transform.build_views(conn)
+            conn.execute("PRAGMA journal_mode = DELETE")  # Published file carries no journal state
+        finally:
+            conn.close()
+        publish_database(build_path, path)
+    except BaseException:
+        if os.path.exists(build_path):
+            os.remove(build_path)
+        raise
+
+
+@metrics.stage('write')
 def write_to_sqlite(employees_df, applicants_df, employment_type_df):
-    """Write cleaned dataframes to SQLite tables."""
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
+    """
+    Bulk-loads cleaned dataframes into a fresh database (see build_database),
+    with load-time pragmas and the key indexes built after the inserts.
+    """
+    with build_database(DB_PATH) as conn:
+        frames = {'employees': employees_df, 'applicants': applicants_df, 'employment_types': employment_type_df}
+        for table, df in frames.items():
+            bulk_insert(conn, table, df)
+        for table, key_cols in TABLE_KEYS.items():
+            conn.execute(f"CREATE INDEX idx_{table}_key ON {table} ({', '.join(key_cols)})")
+
+    print(f"✅ Database created at {DB_PATH} with 3 tables and their views.")
+
+# ───────────────────────────── Incremental Write ─────────────────────────────
+def fingerprint_rows(df, key_cols):
+    """Returns (row_key, row_hash) int64 Series: hash of the dedup key and of the full row."""
+    row_keys = pd.util.hash_pandas_object(df[key_cols], index=False).values.view('int64')
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values.view('int64')
+    return pd.Series(row_keys, index=df.index), pd.Series(row_hashes, index=df.index)
+
+
+def key_hashes(df, key_cols):
+    """
+    int64 hash of each row's dedup key that is stable across chunks: *_date
+    columns are hashed as datetime64[ns] and the rest as strings, whatever
+    dtype a chunk's values were inferred as (an all-empty column reads as float).
+    """
+    keys = pd.DataFrame({
+        column: (pd.to_datetime(df[column], errors='coerce').astype('datetime64[ns]')
+                 if column.endswith('_date') else df[column].astype('string'))
+        for column in key_cols
+    })
+    return pd.Series(pd.util.hash_pandas_object(keys, index=False).values.view('int64'), index=df.index)
 
-    conn = sqlite3.connect(DB_PATH)
-    employees_df.to_sql('employees', conn, if_exists='replace', index=False)
-    applicants_df.to_sql('applicants', conn, if_exists='replace', index=False)
-    employment_type_df.to_sql('employment_types', conn, if_exists='replace', index=False)
-    conn.close()
 
-    print(f"✅ Database created at {DB_PATH} with 3 tables.")
+def fingerprint_sheet(df, row_hashes):
+    """Hashes column names plus every row hash into one sheet-level fingerprint."""
+    digest = hashlib.sha256('|'.join(map(str, df.columns)).encode())
+    digest.update(row_hashes.values.tobytes())
+    return digest.hexdigest()
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _replace_table(conn, table, df, row_keys, row_hashes):
+    """Rewrites one table (plus its row manifest) from scratch."""
+    df.assign(row_key=row_keys).to_sql(table, conn, if_exists='replace', index=False)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_row_key ON {table} (row_key)")
+    conn.execute(f"DELETE FROM {ROW_HASH_TABLE} WHERE table_name = ?", (table,))
+    conn.executemany(
+        f"INSERT INTO {ROW_HASH_TABLE} (table_name, row_key, row_hash) VALUES (?, ?, ?)",
+        ((table, int(k), int(h)) for k, h in zip(row_keys, row_hashes)),
+    )
+    return len(df), 0
+
+
+def _apply_delta(conn, table, df, row_keys, row_hashes):
+    """Deletes removed/changed rows and inserts new/changed rows by row_key."""
+    stored = pd.read_sql_query(
+        f"SELECT row_key, row_hash FROM {ROW_HASH_TABLE} WHERE table_name = ?", conn, params=(table,)
+    ).set_index('row_key')['row_hash']
+    known = row_keys.isin(stored.index).values
+    changed = known.copy()
+    changed[known] = stored.loc[row_keys.values[known]].values != row_hashes.values[known]
+    upsert_mask = ~known | changed
+    removed_keys = stored.index.difference(pd.Index(row_keys.values))
+    stale_keys = list(removed_keys) + list(row_keys.values[changed])
+
+    if stale_keys:
+        conn.executemany(f"DELETE FROM {table} WHERE row_key = ?", [(int(k),) for k in stale_keys])
+        conn.executemany(f"DELETE FROM {ROW_HASH_TABLE} WHERE table_name = ? AND row_key = ?",
+                         [(table, int(k)) for k in stale_keys])
+
+    upserts = df[upsert_mask]
+    if not upserts.empty:
+        upserts.assign(row_key=row_keys[upsert_mask]).to_sql(table, conn, if_exists='append', index=False)
+        conn.executemany(
+            f"INSERT INTO {ROW_HASH_TABLE} (table_name, row_key, row_hash) VALUES (?, ?, ?)",
+            ((table, int(k), int(h)) for k, h in zip(row_keys[upsert_mask], row_hashes[upsert_mask])),
+        )
+    return len(upserts), len(removed_keys)
+
+
+def _stored_sheets(path):
+    """{table: (sheet hash, source columns)} recorded in the live database's manifest."""
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        if not _table_columns(conn, MANIFEST_TABLE):
+            return {}
+        # Source columns only — build_views adds name_key after load
+        return {table: (sheet_hash, [c for c in _table_columns(conn, table) if c not in ('row_key', 'name_key')])
+                for table, sheet_hash in conn.execute(f"SELECT table_name, sheet_hash FROM {MANIFEST_TABLE}")}
+    finally:
+        conn.close()
+
+
+@metrics.stage('write')
+def write_incremental(employees_df, applicants_df, employment_type_df):
+    """
+    Syncs cleaned dataframes into a copy of the live database and publishes it
+    with its views rebuilt (see build_database). Unchanged sheets are skipped
+    by fingerprint; changed sheets only upsert or delete the rows whose
+    dedup-key/row hashes differ from the stored manifest. When no sheet
+    changed, nothing is copied or published.
+    """
+    frames = {'employees': employees_df, 'applicants': applicants_df, 'employment_types': employment_type_df}
+    stored = _stored_sheets(DB_PATH)
+    changed = {}
+    for table, df in frames.items():
+        row_keys, row_hashes = fingerprint_rows(df, TABLE_KEYS[table])
+        sheet_hash = fingerprint_sheet(df, row_hashes)
+        stored_hash, existing = stored.get(table, (None, []))
+        if stored_hash == sheet_hash and existing:
+            print(f"⏭️ {table}: unchanged, skipped")
+        else:
+            changed[table] = (row_keys, row_hashes, sheet_hash)
+
+    if not changed:
+        print(f"✅ Database at {DB_PATH} is current, nothing to publish.")
+        return
+
+    with build_database(DB_PATH, copy_live=True) as conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} ("
+                     "table_name TEXT PRIMARY KEY, sheet_hash TEXT, row_count INTEGER, loaded_at TEXT)")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {ROW_HASH_TABLE} ("
+                     "table_name TEXT, row_key INTEGER, row_hash INTEGER, "
+                     "PRIMARY KEY (table_name, row_key)) WITHOUT ROWID")
+        for table, (row_keys, row_hashes, sheet_hash) in changed.items():
+            df = frames[table]
+            if table not in stored or stored[table][1] != list(df.columns):
+                upserted, deleted = _replace_table(conn, table, df, row_keys, row_hashes)
+            else:
+                upserted, deleted = _apply_delta(conn, table, df, row_keys, row_hashes)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {MANIFEST_TABLE} (table_name, sheet_hash, row_count, loaded_at) "
+                "VALUES (?, ?, ?, datetime('now'))",
+                (table, sheet_hash, len(df)),
+            )
+            print(f"🔄 {table}: {upserted} rows upserted, {deleted} rows deleted")
+
+    print(f"✅ Database at {DB_PATH} synced incrementally and published with its views.")
+
+# ───────────────────────────── Streaming Ingest ─────────────────────────────
+def iter_sheet_chunks(source, sheet, chunksize=CHUNK_SIZE):
+    """
+    Yields one sheet as DataFrames of at most `chunksize` rows with snake_case headers.
+    `source` is an .xlsx workbook, or a directory holding <sheet>.csv / <sheet>.parquet exports.
+    """
+    if os.path.isdir(source):
+        csv_path = os.path.join(source, f'{sheet}.csv')
+        parquet_path = os.path.join(source, f'{sheet}.parquet')
+        if os.path.exists(csv_path):
+            columns = None
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+                if columns is None:
+                    columns = normalize_columns(chunk.columns)
+                chunk.columns = columns
+                yield chunk
+        elif os.path.exists(parquet_path):
+            import pyarrow.parquet as pq  # Optional: only needed for Parquet sources
+            parquet = pq.ParquetFile(parquet_path)
+            columns = normalize_columns(parquet.schema_arrow.names)
+            for batch in parquet.iter_batches(batch_size=chunksize):
+                chunk = batch.to_pandas()
+                chunk.columns = columns
+                yield chunk
+        else:
+            raise FileNotFoundError(f"No {sheet}.csv or {sheet}.parquet in: {source}")
+        return
+
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Excel file not found at: {source}")
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(values_only=True)
+        columns = normalize_columns(next(rows))
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def _unseen_mask(conn, row_keys):
+    """
+    Marks rows whose dedup key appears neither earlier in this chunk nor in any
+    earlier chunk. Seen keys live in a TEMP table, which stream_load keeps
+    on disk behind a bounded cache, so memory stays flat.
+    """
+    first_in_chunk = ~row_keys.duplicated().values
+    unique_keys = row_keys[first_in_chunk]
+
+    conn.execute("DELETE FROM temp.chunk_keys")
+    conn.executemany("INSERT INTO temp.chunk_keys (row_key) VALUES (?)", ((int(k),) for k in unique_keys))
+    seen = {k for (k,) in conn.execute(
+        "SELECT row_key FROM temp.chunk_keys WHERE row_key IN (SELECT row_key FROM temp.seen_keys)")}
+    conn.execute("INSERT OR IGNORE INTO temp.seen_keys (row_key) SELECT row_key FROM temp.chunk_keys")
+
+    return first_in_chunk & ~row_keys.isin(seen).values
+
+
+def stream_load(source=None, chunksize=CHUNK_SIZE):
+    """
+    Bounded-memory ingest: reads each sheet in row chunks, cleans and dedups
+    across chunk boundaries, and appends every chunk to a fresh database that
+    is published once complete (see build_database).
+    Dropped duplicates are appended to logs/dropped_<table>.csv.
+    """
+    source = source or EXCEL_PATH
+    os.makedirs('logs', exist_ok=True)
+
+    # Temp tables spill to a file and both page caches are capped: SQLite's
+    # memory stays flat however many chunks (and seen keys) stream through
+    pragmas = BULK_PRAGMAS + ("PRAGMA temp_store = FILE",
+                              f"PRAGMA main.cache_size = -{STREAM_CACHE_KIB}",
+                              f"PRAGMA temp.cache_size = -{STREAM_CACHE_KIB}")
+    timer = metrics.StageTimer()
+    with build_database(DB_PATH, pragmas) as conn:
+        for sheet, table in SHEET_TABLES.items():
+            print(f"\n🔍 Streaming {sheet} in chunks of {chunksize}...")
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_keys (row_key INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS chunk_keys (row_key INTEGER)")
+            conn.execute("DELETE FROM temp.seen_keys")
+
+            dropped_path = f'logs/dropped_{table}.csv'
+            if os.path.exists(dropped_path):
+                os.remove(dropped_path)
+
+            total = kept = 0
+            chunks = iter_sheet_chunks(source, sheet, chunksize)
+            while True:
+                with timer('parse'):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                with timer('clean'):
+                    chunk = NORMALIZERS[table](chunk)
+                with timer('dedup'):
+                    keep = _unseen_mask(conn, key_hashes(chunk, TABLE_KEYS[table]))
+
+                with timer('write'):
+                    chunk[keep].to_sql(table, conn, if_exists='append', index=False)
+                if table != 'employment_types' and not keep.all():
+                    chunk[~keep].to_csv(dropped_path, mode='a', index=False,
+                                        header=not os.path.exists(dropped_path))
+                total += len(chunk)
+                kept += int(keep.sum())
+
+            print(f"🧹 {sheet} deduped: {total} → {kept}")
+
+    timer.flush()
+    print(f"✅ Database created at {DB_PATH} with 3 tables and their views (streamed).")
 
 # ───────────────────────────── Main Execution ─────────────────────────────
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load HRIS workbook into SQLite")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Upsert only changed rows instead of rebuilding the database")
+    parser.add_argument('--stream', action='store_true',
+                        help="Bounded-memory chunked ingest (xlsx, or a directory of CSV/Parquet exports)")
+    parser.add_argument('--source', default=None,
+                        help="Workbook or export directory for --stream (defaults to EXCEL_PATH)")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE,
+                        help="Rows per chunk for --stream")
+    args = parser.parse_args()
+
+    if args.stream:
+        print("🔁 Streaming source data into SQLite...")
+        stream_load(args.source, args.chunksize)
+        print("🏁 ✅ Data ingestion completed.")
+        raise SystemExit(0)
+
     print("🔁 Loading Excel data...")
     employees_df, applicants_df, employment_type_df = load_excel_data()
 
@@ -95,6 +565,9 @@ if __name__ == "__main__":
     )
 
     print("💾 Writing to SQLite...")
-    write_to_sqlite(employees_df, applicants_df, employment_type_df)
+    if args.incremental:
+        write_incremental(employees_df, applicants_df, employment_type_df)
+    else:
+        write_to_sqlite(employees_df, applicants_df, employment_type_df)
 
-    print("🏁 ✅ Data ingestion completed.")
\ No newline at end of file
+    print("🏁 ✅ Data ingestion completed.")
@@ -0,0 +1,254 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# db.py — Read-Only SQLite Connection Layer for the API
+# Per-thread pooled connections, tuned for many small analytical reads.
+# Optionally serves from an in-memory copy of the file that is reloaded in the
+# background whenever the pipeline publishes a new data generation.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import atexit
+import itertools
+import os
+import sqlite3
+import threading
+import time
+
+# ───────────────────────────── Config ─────────────────────────────
+DB_PATH = 'hris_project.db'
+CACHED_STATEMENTS = 256            # Prepared statements kept per connection
+CACHE_SIZE_KIB = 64 * 1024         # PRAGMA cache_size (page cache, in KiB)
+MMAP_SIZE = 256 * 1024 * 1024      # PRAGMA mmap_size (bytes)
+PROGRESS_STEPS = 10_000            # VM steps between request-deadline checks
+MEMORY_RELOAD_INTERVAL = 2         # Seconds between in-memory mode checks for a new generation
+
+# Indexes only the API's own queries need, built on every in-memory copy
+# (the pipeline's file stays as transform.py writes it)
+MEMORY_INDEXES = [
+    ('applicants', "CREATE INDEX mem_applicants_status_lower ON applicants (LOWER(status), status)"),
+    ('time_to_hire', "CREATE INDEX mem_time_to_hire_department ON time_to_hire (department COLLATE NOCASE, hire_date, hire_id)"),
+]
+
+_local = threading.local()
+_open_connections = {}     # Pooled connection → the thread that owns it
+_open_lock = threading.Lock()
+
+# ───────────────────────────── Request Deadlines ─────────────────────────────
+def set_deadline(seconds):
+    """Aborts this thread's queries once `seconds` have passed (None clears it)."""
+    _local.deadline = time.monotonic() + seconds if seconds else None
+
+
+def _past_deadline():
+    deadline = getattr(_local, 'deadline', None)
+    return 1 if deadline is not None and time.monotonic() > deadline else 0
+
+# ───────────────────────────── Connection Setup ─────────────────────────────
+def file_identity(path):
+    """(device, inode) of the DB file — changes when the loader publishes a new file."""
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+def connect_readonly(path=DB_PATH, uri=None):
+    """Opens a read-only (URI mode=ro, or `uri` as given) connection with read-tuned pragmas."""
+    conn = sqlite3.connect(
+        uri or f'file:{path}?mode=ro', uri=True,
+        cached_statements=CACHED_STATEMENTS,
+        check_same_thread=False,  # Only ever used by its owning thread; closed at exit
+    )
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA query_only = ON")
+    conn.set_progress_handler(_past_deadline, PROGRESS_STEPS)  # Raises 'interrupted' past deadline
+    return conn
+
+
+def read_generation(conn):
+    """The data-generation stamp written by transform.py, or None if there is none yet."""
+    try:
+        row = conn.execute("SELECT generation FROM data_generation").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+# ───────────────────────────── In-Memory Mode ─────────────────────────────
+class MemoryDatabase:
+    """
+    One generation of the database file, copied into RAM in one read.
+    It lives in SQLite's memdb VFS under a process-unique name, so every
+    thread opens its own connection (own page cache, no shared-cache locking)
+    onto the same pages, and mmap reads them without a copy.
+    """
+
+    _names = itertools.count()
+
+    def __init__(self, source_path):
+        self.uri = f'file:/hris-{os.getpid()}-{next(self._names)}?vfs=memdb'
+        source = sqlite3.connect(f'file:{source_path}?mode=ro', uri=True)
+        try:
+            image = bytearray(source.serialize())  # One read transaction: consistent even mid-write
+        finally:
+            source.close()
+        # Header bytes 18-19 are 2 for a WAL file; memdb has no -shm file to
+        # go with that, so mark the copy as a rollback-journal database
+        image[18:20] = b'\x01\x01'
+        staging = sqlite3.connect(':memory:')
+        try:
+            staging.deserialize(bytes(image))
+            self._holder = sqlite3.connect(self.uri, uri=True, check_same_thread=False)  # Keeps the copy alive
+            staging.backup(self._holder)  # deserialize() can't target a named, shareable memdb
+        finally:
+            staging.close()
+        tables = {row[0] for row in self._holder.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table, statement in MEMORY_INDEXES:
+            if table in tables:  # time_to_hire is a view when transform.py ran with --views
+                self._holder.execute(statement)
+        self._holder.commit()
+        self.generation = read_generation(self._holder)
+
+    def connect(self):
+        return connect_readonly(uri=self.uri)
+
+    def close(self):
+        """Releases the copy once every thread's connection to it has closed too."""
+        self._holder.close()
+
+
+class MemoryMirror:
+    """
+    Serves `path` from a MemoryDatabase and swaps in a fresh copy when the
+    file's data generation changes. The new copy is built beside the live one,
+    so requests never wait on the reload; the previous copy is released at the
+    following swap, by which time every thread has reconnected.
+    """
+
+    def __init__(self, path, interval=MEMORY_RELOAD_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.current = MemoryDatabase(path)
+        self.reloads = 0
+        self._previous = None
+        self._watcher = None
+
+    def refresh(self):
+        """Reloads if the file holds a newer generation; returns True when it swapped."""
+        try:
+            conn = connect_readonly(self.path)
+            try:
+                generation = read_generation(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False  # Missing or mid-publish: keep serving the copy we have
+        if generation is None or generation == self.current.generation:
+            return False  # A loader-only file (no views yet) is not servable
+
+        fresh = MemoryDatabase(self.path)
+        if self._previous is not None:
+            self._previous.close()
+        self._previous, self.current = self.current, fresh  # Readers pick up `current` on their next query
+        self.reloads += 1
+        print(f"🧠 In-memory database reloaded: generation {fresh.generation}")
+        return True
+
+    def start(self):
+        def watch():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.refresh()
+                except Exception as e:  # Keep serving the old copy; try again next tick
+                    print(f"⚠️ In-memory reload failed: {e}")
+
+        self._watcher = threading.Thread(target=watch, name='memory-db-watcher', daemon=True)
+        self._watcher.start()
+        return self
+
+
+_memory_paths = {}      # path → reload interval, for paths served from memory
+_mirrors = {}           # path → (pid, MemoryMirror); rebuilt after a fork
+_mirror_lock = threading.Lock()
+
+
+def enable_memory_mode(path=DB_PATH, interval=MEMORY_RELOAD_INTERVAL):
+    """
+    Serves `path` from RAM from now on. The copy is loaded lazily by the first
+    query in each process, so preforked workers each load (and watch) their own.
+    """
+    _memory_paths[path] = interval
+
+
+def memory_mirror(path=DB_PATH):
+    """This process's MemoryMirror for `path`, or None when it is served from disk."""
+    if path not in _memory_paths:
+        return None
+    entry = _mirrors.get(path)
+    if entry is None or entry[0] != os.getpid():
+        with _mirror_lock:
+            entry = _mirrors.get(path)
+            if entry is None or entry[0] != os.getpid():
+                entry = (os.getpid(), MemoryMirror(path, _memory_paths[path]).start())
+                _mirrors[path] = entry
+    return entry[1]
+
+# ───────────────────────────── Pool ─────────────────────────────
+def get_connection(path=DB_PATH):
+    """
+    Returns this thread's pooled read-only connection for `path`, reconnecting
+    if the file (or, in memory mode, the in-memory copy) has been replaced
+    since the connection was opened.
+    """
+    pool = _local.__dict__.setdefault('pool', {})
+    mirror = memory_mirror(path)
+    source = mirror.current if mirror else None
+    identity = source.uri if source else file_identity(path)
+    pooled = pool.get(path)
+    if pooled and pooled[0] == identity:
+        return pooled[1]
+
+    if pooled:
+        _close(pooled[1])
+    _close_orphans()
+    conn = source.connect() if source else connect_readonly(path)
+    pool[path] = (identity, conn)
+    with _open_lock:
+        _open_connections[conn] = threading.current_thread()
+    return conn
+
+
+def discard_connection(path=DB_PATH):
+    """Drops this thread's pooled connection (e.g. after a failed query)."""
+    pooled = _local.__dict__.get('pool', {}).pop(path, None)
+    if pooled:
+        _close(pooled[1])
+
+
+def _close(conn):
+    with _open_lock:
+        _open_connections.pop(conn, None)
+    conn.close()
+
+
+def _close_orphans():
+    """
+    Closes the pooled connections of threads that have exited. Thread-per-request
+    servers (the dev server, serve.py's fallback) would otherwise leave one open
+    connection per request: a connection sits in a reference cycle with its
+    statement cache, so it isn't closed when its thread's pool is dropped.
+    """
+    with _open_lock:
+        orphans = [conn for conn, owner in _open_connections.items() if not owner.is_alive()]
+        for conn in orphans:
+            del _open_connections[conn]
+    for conn in orphans:
+        conn.close()
+
+
+@atexit.register
+def close_all():
+    """Closes every pooled connection across all threads."""
+    with _open_lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+    for conn in connections:
+        conn.close()
@@ -0,0 +1,138 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# distribution.py — In-Memory Time-to-Hire Distributions for the API
+# Loads time_to_hire_days once per data generation into NumPy arrays sorted
+# within each department; percentiles, histograms and outliers are then
+# answered with index arithmetic and boolean masks, never a per-request sort.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import threading
+import numpy as np
+import pandas as pd
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+DEFAULT_BINS = 20
+DEFAULT_IQR = 1.5    # Tukey fences: outside [Q1 - k·IQR, Q3 + k·IQR] is an outlier
+MAX_BINS = 1_000
+
+LOAD_QUERY = """
+    SELECT department, role, employment_type, hire_date, time_to_hire_days
+    FROM time_to_hire
+    WHERE time_to_hire_days IS NOT NULL
+"""
+
+# ───────────────────────────── Array Helpers ─────────────────────────────
+def sorted_percentiles(values, percentiles):
+    """Linear-interpolated percentiles (numpy's default method) of an already sorted array."""
+    positions = np.asarray(percentiles, dtype=float) / 100 * (len(values) - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (positions - lower)
+
+
+def month_number(month):
+    """'2024-03' → months since year 0, so month ranges compare as integers."""
+    year, month = month.split('-')[:2]
+    return int(year) * 12 + int(month) - 1
+
+
+def _codes(labels):
+    """Category codes for a column, plus lowercased label → codes for case-insensitive filters."""
+    codes, uniques = pd.factorize(pd.Series(labels, dtype=object), use_na_sentinel=False)
+    lookup = {}
+    for code, label in enumerate(uniques):
+        if label is not None and not pd.isna(label):
+            lookup.setdefault(str(label).lower(), []).append(code)
+    return codes, lookup
+
+# ───────────────────────────── Store ─────────────────────────────
+class TimeToHireDistribution:
+    """
+    Thread-safe holder of time-to-hire arrays for one data generation.
+    Rows are sorted by (department, days), so every department is a sorted
+    slice, and a filtered subset of a slice (boolean mask) stays sorted.
+    """
+
+    def __init__(self):
+        self.generation = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    def ensure(self, conn, generation):
+        """Reloads from `conn` when `generation` differs from the one held."""
+        if self.generation == generation and self._data is not None:
+            return
+        with self._lock:
+            if self.generation != generation or self._data is None:
+                self._data = self._load(conn)
+                self.generation = generation
+
+    @staticmethod
+    def _load(conn):
+        df = pd.DataFrame(conn.execute(LOAD_QUERY).fetchall(),
+                          columns=['department', 'role', 'employment_type', 'hire_date', 'days'])
+        df['department'] = df['department'].astype(object).where(df['department'].notna(), None)
+        df = df.sort_values(['department', 'days'], na_position='first', kind='stable').reset_index(drop=True)
+
+        departments, starts = [], []
+        dept_values = df['department'].to_numpy(dtype=object)
+        if len(df):
+            change = np.flatnonzero(np.r_[True, dept_values[1:] != dept_values[:-1]])
+            departments, starts = list(dept_values[change]), list(change)
+        roles, role_lookup = _codes(df['role'])
+        types, type_lookup = _codes(df['employment_type'])
+        months = np.array([month_number(d) if isinstance(d, str) and len(d) >= 7 else -1
+                           for d in df['hire_date']], dtype=np.int32)
+        return {
+            'days': df['days'].to_numpy(dtype=float),
+            'slices': [(department, start, stop) for department, start, stop
+                       in zip(departments, starts, starts[1:] + [len(df)])],
+            'role': (roles, role_lookup),
+            'employment_type': (types, type_lookup),
+            'month': months,
+        }
+
+    def query(self, department=None, role=None, employment_type=None, month_from=None, month_to=None,
+              percentiles=DEFAULT_PERCENTILES, bins=DEFAULT_BINS, iqr=DEFAULT_IQR):
+        """
+        One entry per department (or only `department`) with hires, mean,
+        percentiles, a `bins`-bucket histogram and Tukey outlier counts, over
+        the rows matching the role / employment type / hire-month filters.
+        """
+        data = self._data  # One consistent generation, even if a reload swaps it mid-request
+        results = []
+        for label, start, stop in data['slices']:
+            if department is not None and (label is None or label.lower() != department.lower()):
+                continue
+            values = data['days'][start:stop]
+            mask = np.ones(len(values), dtype=bool)
+            for name, wanted in (('role', role), ('employment_type', employment_type)):
+                if wanted is not None:
+                    codes, lookup = data[name]
+                    mask &= np.isin(codes[start:stop], lookup.get(wanted.lower(), []))
+            months = data['month'][start:stop]
+            if month_from is not None:
+                mask &= months >= month_number(month_from)
+            if month_to is not None:
+                mask &= months <= month_number(month_to)
+            values = values[mask]  # Still sorted
+            if len(values):
+                results.append(self._summarize(label, values, percentiles, bins, iqr))
+        return results
+
+    @staticmethod
+    def _summarize(department, values, percentiles, bins, iqr):
+        q1, q3 = sorted_percentiles(values, (25, 75))
+        low, high = q1 - iqr * (q3 - q1), q3 + iqr * (q3 - q1)
+        below, above = np.searchsorted(values, low, 'left'), len(values) - np.searchsorted(values, high, 'right')
+        counts, edges = np.histogram(values, bins=bins)
+        return {
+            'department': department,
+            'hires': int(len(values)),
+            'mean': round(float(values.mean()), 1),
+            'percentiles': {f"p{p:g}": round(float(v), 1)
+                            for p, v in zip(percentiles, sorted_percentiles(values, percentiles))},
+            'histogram': {'edges': [round(float(e), 1) for e in edges], 'counts': counts.tolist()},
+            'outliers': {'low_fence': round(float(low), 1), 'high_fence': round(float(high), 1),
+                         'below': int(below), 'above': int(above),
+                         'max': round(float(values[-1]), 1)},
+        }
@@ -4,34 +4,57 @@
 # 1. Avg Time-to-Hire by Department
 # 2. Applicant Status Distribution
 # 3. Top Roles by Applicant Volume
+# 4. Active Headcount by Department over time
 # Output saved to visuals/ folder for README and reporting
+# Charts are registered declaratively in CHARTS; a run fetches every input on
+# one connection, skips charts whose input is unchanged, and renders the rest
+# in-process, or across a process pool when many are stale.
 # ──────────────────────────────────────────────────────────────────────────────
 
+import argparse
+import hashlib
+import json
+import multiprocessing
 import sqlite3
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend: safe in worker processes and cron
 import matplotlib.pyplot as plt
 import os
 
 # ───────────────────────────── Config ─────────────────────────────
 DB_PATH = 'hris_project.db'
 OUTPUT_FOLDER = 'visuals'
+MANIFEST_PATH = os.path.join(OUTPUT_FOLDER, '.chart_manifest.json')  # filename → input hash
+MAX_WORKERS = os.cpu_count() or 2
+RENDER_POOL_MIN = 16  # Fewer stale charts render in-process: a worker's imports (~1.5s) outweigh a chart (~0.3s)
+
+# ───────────────────────────── Shared Fetch ─────────────────────────────
+def read_frame(query, conn=None, params=()):
+    """Runs `query` on `conn`, or on a short-lived connection when none is given."""
+    if conn is not None:
+        return pd.read_sql_query(query, conn, params=params)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
 
 # ───────────────────────────── Chart 1: Time-to-Hire ─────────────────────────────
-def fetch_avg_hire_time():
-    query = """
-        SELECT department,
-               ROUND(AVG(time_to_hire_days), 1) AS avg_days
-        FROM time_to_hire
-        GROUP BY department
-        ORDER BY avg_days DESC
+AVG_HIRE_TIME_QUERY = """
+    SELECT department,
+           ROUND(AVG(time_to_hire_days), 1) AS avg_days
+    FROM time_to_hire
+    GROUP BY department
+    ORDER BY avg_days DESC
     """
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
 
-def create_bar_chart(df):
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+def fetch_avg_hire_time(conn=None):
+    return read_frame(AVG_HIRE_TIME_QUERY, conn)
+
+def create_bar_chart(df, path=os.path.join(OUTPUT_FOLDER, 'avg_time_to_hire_by_department.png')):
     plt.figure(figsize=(10, 6))
     bars = plt.bar(df['department'], df['avg_days'], color='#00CFFF', edgecolor='#D8F2FF')
     plt.title('Average Time-to-Hire by Department\nBased on 400+ hires across 5 departments',
@@ -46,27 +69,24 @@ def create_bar_chart(df):
         plt.text(bar.get_x() + bar.get_width()/2.0, height + 0.4,
                  f'{height:.1f}', ha='center', va='bottom', fontsize=9)
     plt.tight_layout()
-    path = os.path.join(OUTPUT_FOLDER, 'avg_time_to_hire_by_department.png')
     plt.savefig(path)
     print(f"✅ Chart saved to {path}")
     plt.close()
 
 # ───────────────────────────── Chart 2: Applicant Status ─────────────────────────────
-def fetch_status_counts():
-    query = """
-        SELECT LOWER(TRIM(status)) AS status,
-               COUNT(*) AS count
-        FROM applicants
-        WHERE status IS NOT NULL
-        GROUP BY status
-        ORDER BY count DESC
+STATUS_COUNTS_QUERY = """
+    SELECT LOWER(TRIM(status)) AS status,
+           COUNT(*) AS count
+    FROM applicants
+    WHERE status IS NOT NULL
+    GROUP BY status
+    ORDER BY count DESC
     """
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
 
-def create_status_distribution_chart(df):
+def fetch_status_counts(conn=None):
+    return read_frame(STATUS_COUNTS_QUERY, conn)
+
+def create_status_distribution_chart(df, path=os.path.join(OUTPUT_FOLDER, 'applicant_status_distribution.png')):
     plt.figure(figsize=(8, 6))
 
     # MrBeast-inspired palette (vibrant to pale blues)
@@ -88,26 +108,23 @@ def create_status_distribution_chart(df):
         plt.text(i, val + 0.5, str(val), ha='center', fontsize=9)
 
     plt.tight_layout()
-    path = os.path.join(OUTPUT_FOLDER, 'applicant_status_distribution.png')
     plt.savefig(path)
     print(f"✅ Chart saved to {path}")
     plt.close()
 
 # ───────────────────────────── Chart 3: Top Roles ─────────────────────────────
-def fetch_top_roles():
-    query = """
-        SELECT role, COUNT(*) AS count
-        FROM applicants
-        GROUP BY role
-        ORDER BY count DESC
-        LIMIT 10
+TOP_ROLES_QUERY = """
+    SELECT role, COUNT(*) AS count
+    FROM applicants
+    GROUP BY role
+    ORDER BY count DESC
+    LIMIT 10
     """
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-    return df
 
-def create_role_distribution_chart(df):
+def fetch_top_roles(conn=None):
+    return read_frame(TOP_ROLES_QUERY, conn)
+
+def create_role_distribution_chart(df, path=os.path.join(OUTPUT_FOLDER, 'top_roles_by_applicant_volume.png')):
     plt.figure(figsize=(10, 6))
     bars = plt.barh(df['role'].str.title(), df['count'], color='#00A8F3', edgecolor='black')
     plt.title('Top 10 Roles by Applicant Volume\nReflects submission trends from HRIS dataset',
@@ -122,29 +139,141 @@ def create_role_distribution_chart(df):
         plt.text(width + 0.5, bar.get_y() + bar.get_height()/2,
                  str(int(width)), va='center', fontsize=9)
     plt.tight_layout()
-    path = os.path.join(OUTPUT_FOLDER, 'top_roles_by_applicant_volume.png')
     plt.savefig(path)
     print(f"✅ Chart saved to {path}")
     plt.close()
 
-# ───────────────────────────── Execution Entry ─────────────────────────────
-if __name__ == '__main__':
-    print("📊 Generating charts for HRIS metrics")
+# ───────────────────────────── Chart 4: Headcount ─────────────────────────────
+# Month-end headcount per department from the headcount_daily sweep table;
+# headcount is a bare column next to MAX(date), so SQLite takes the month's last day
+HEADCOUNT_QUERY = """
+    SELECT department,
+           strftime('%Y-%m', date) AS month,
+           headcount,
+           MAX(date) AS month_end
+    FROM headcount_daily
+    GROUP BY department, month
+    ORDER BY month
+    """
 
-    df_hire = fetch_avg_hire_time()
-    if not df_hire.empty:
-        create_bar_chart(df_hire)
-    else:
-        print("⚠️ No data for time-to-hire chart.")
+def fetch_headcount(conn=None):
+    return read_frame(HEADCOUNT_QUERY, conn)
 
-    df_status = fetch_status_counts()
-    if not df_status.empty:
-        create_status_distribution_chart(df_status)
-    else:
-        print("⚠️ No data for status distribution chart.")
+def create_headcount_chart(df, path=os.path.join(OUTPUT_FOLDER, 'headcount_by_department.png')):
+    series = df.pivot(index='month', columns='department', values='headcount').fillna(0)
+    plt.figure(figsize=(11, 6))
+    mrbeast_palette = ['#00CFFF', '#00A8F3', '#0077B6', '#70D2FF', '#A3DEFF', '#D8F2FF']
+    plt.stackplot(pd.to_datetime(series.index), series.T.values, labels=series.columns.astype(str),
+                  colors=mrbeast_palette, edgecolor='black', linewidth=0.3)
+    plt.title('Active Headcount by Department\nMonth-end headcount from hire and end dates',
+              fontsize=14, ha='center')
+    plt.subplots_adjust(top=0.85)
+    plt.xlabel('Month')
+    plt.ylabel('Active Employees')
+    plt.grid(axis='y', linestyle='--', alpha=0.5)
+    plt.legend(loc='upper left', fontsize=8)
+    plt.tight_layout()
+    plt.savefig(path)
+    print(f"✅ Chart saved to {path}")
+    plt.close()
 
-    df_roles = fetch_top_roles()
-    if not df_roles.empty:
-        create_role_distribution_chart(df_roles)
+# ───────────────────────────── Chart Registry ─────────────────────────────
+# One entry per output PNG. Variants (per department, per month, …) are just
+# more entries with their own query params and filename.
+ChartSpec = namedtuple('ChartSpec', ['name', 'query', 'render', 'filename', 'params', 'version'],
+                       defaults=[(), 1])
+
+CHARTS = [
+    ChartSpec('time-to-hire', AVG_HIRE_TIME_QUERY, create_bar_chart,
+              'avg_time_to_hire_by_department.png'),
+    ChartSpec('status distribution', STATUS_COUNTS_QUERY, create_status_distribution_chart,
+              'applicant_status_distribution.png'),
+    ChartSpec('top roles', TOP_ROLES_QUERY, create_role_distribution_chart,
+              'top_roles_by_applicant_volume.png'),
+    ChartSpec('headcount', HEADCOUNT_QUERY, create_headcount_chart,
+              'headcount_by_department.png'),
+]
+
+# ───────────────────────────── Rendering Pipeline ─────────────────────────────
+def fetch_chart_inputs(specs, conn):
+    """Fetches every chart's input frame over one shared connection."""
+    return {spec.filename: read_frame(spec.query, conn, spec.params) for spec in specs}
+
+
+def frame_hash(spec, df):
+    """Fingerprint of a chart's input frame plus its spec, used to skip unchanged charts."""
+    digest = hashlib.sha256(f"{spec.filename}|{spec.version}|{'|'.join(df.columns)}".encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def render_chart(render, df, path):
+    """Process-pool entry point: draws one chart with the Agg backend."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    render(df, path)
+    return path
+
+
+def generate_charts(specs=CHARTS, force=False, max_workers=MAX_WORKERS):
+    """
+    Renders every stale chart in `specs`: fetch all inputs on one connection,
+    hash each frame, skip charts whose PNG is current, render the rest (in
+    parallel from RENDER_POOL_MIN stale charts up).
+    Returns the list of paths that were (re)rendered.
+    """
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        frames = fetch_chart_inputs(specs, conn)
+    finally:
+        conn.close()
+
+    manifest = load_manifest()
+    stale = []
+    for spec in specs:
+        df = frames[spec.filename]
+        path = os.path.join(OUTPUT_FOLDER, spec.filename)
+        if df.empty:
+            print(f"⚠️ No data for {spec.name} chart.")
+            continue
+        digest = frame_hash(spec, df)
+        if not force and manifest.get(spec.filename) == digest and os.path.exists(path):
+            print(f"⏭️ {spec.name} chart is current: {path}")
+            continue
+        stale.append((spec, df, path, digest))
+
+    if len(stale) >= RENDER_POOL_MIN and max_workers > 1:
+        # Spawned, not forked: the scheduler calls this from a worker thread
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(stale)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(render_chart, spec.render, df, path) for spec, df, path, _ in stale]
+            for future in futures:
+                future.result()
     else:
-        print("⚠️ No data for top roles chart.")
\ No newline at end of file
+        for spec, df, path, _ in stale:
+            render_chart(spec.render, df, path)
+
+    for spec, _, _, digest in stale:
+        manifest[spec.filename] = digest
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return [path for _, _, path, _ in stale]
+
+# ───────────────────────────── Execution Entry ─────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render HRIS metric charts")
+    parser.add_argument('--force', action='store_true', help="Re-render even if inputs are unchanged")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help="Render processes, used from RENDER_POOL_MIN stale charts")
+    args = parser.parse_args()
+
+    print("📊 Generating charts for HRIS metrics")
+    rendered = generate_charts(force=args.force, max_workers=args.workers)
+    print(f"🏁 {len(rendered)} of {len(CHARTS)} charts rendered.")
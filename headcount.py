@@ -0,0 +1,82 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# headcount.py — Headcount & Attrition Time Series
+# Turns every employment interval into a +1 event on its hire date and a −1
+# event the day after its end date, counts events per department × day and
+# takes a running sum along each department's row: the whole daily history in
+# one counting pass plus one cumulative sum, instead of one range query per day.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import numpy as np
+import pandas as pd
+from tenure import OPEN_END, day_numbers
+
+HEADCOUNT_TABLE = 'headcount_daily'
+INSERT_BATCH = 50_000
+
+LOAD_QUERY = """
+    SELECT department, hire_date, end_date
+    FROM employees
+    WHERE hire_date IS NOT NULL
+"""
+
+# ───────────────────────────── Sweep Line ─────────────────────────────
+def daily_headcount(departments, hire_dates, end_dates):
+    """
+    One row per department per day, from the department's first hire to the
+    last event in the data (a hire, or the day after an end date): that day's
+    hires, terminations (an end date is the last day worked) and headcount.
+    Intervals without a hire date or ending before it are skipped, as in tenure.py.
+    """
+    starts, ends = day_numbers(hire_dates), day_numbers(end_dates)
+    keep = (starts != OPEN_END) & (ends >= starts)
+    columns = ['department', 'date', 'hires', 'terminations', 'headcount']
+    if not keep.any():
+        return pd.DataFrame(columns=columns)
+    starts, ends = starts[keep], ends[keep]
+    codes, labels = pd.factorize(pd.Series(departments, dtype=object)[keep], use_na_sentinel=False)
+
+    closed = ends != OPEN_END
+    first = int(starts.min())
+    span = int(max(starts.max(), ends[closed].max() + 1 if closed.any() else first)) - first + 1
+    cells = len(labels) * span
+    hires = np.bincount(codes * span + (starts - first), minlength=cells).reshape(len(labels), span)
+    terminations = np.bincount(codes[closed] * span + (ends[closed] - first),
+                               minlength=cells).reshape(len(labels), span)
+    started = np.cumsum(hires, axis=1)
+    # Leavers still count on their last day: subtract terminations up to the day before
+    headcount = started - np.cumsum(terminations, axis=1) + terminations
+
+    active = started > 0  # Trim each department's days before its first hire
+    rows, offsets = np.nonzero(active)
+    return pd.DataFrame({
+        'department': np.asarray(labels, dtype=object)[rows],
+        'date': np.datetime_as_string((first + offsets).astype('datetime64[D]')),
+        'hires': hires[active],
+        'terminations': terminations[active],
+        'headcount': headcount[active],
+    }, columns=columns)
+
+
+def build_table(cursor):
+    """(Re)creates the headcount_daily table from employees; returns its row count."""
+    df = pd.DataFrame(cursor.execute(LOAD_QUERY).fetchall(), columns=['department', 'hire_date', 'end_date'])
+    series = daily_headcount(df['department'], df['hire_date'], df['end_date'])
+    cursor.execute(f"DROP TABLE IF EXISTS {HEADCOUNT_TABLE}")
+    cursor.execute(f"""
+        CREATE TABLE {HEADCOUNT_TABLE} (
+            department TEXT,
+            date TEXT NOT NULL,
+            hires INTEGER NOT NULL,
+            terminations INTEGER NOT NULL,
+            headcount INTEGER NOT NULL
+        )
+    """)
+    records = list(zip(series['department'].where(series['department'].notna(), None).tolist(),
+                       series['date'].tolist(), series['hires'].tolist(),
+                       series['terminations'].tolist(), series['headcount'].tolist()))
+    for start in range(0, len(records), INSERT_BATCH):
+        cursor.executemany(f"INSERT INTO {HEADCOUNT_TABLE} VALUES (?, ?, ?, ?, ?)",
+                           records[start:start + INSERT_BATCH])
+    cursor.execute(f"CREATE INDEX idx_{HEADCOUNT_TABLE}_department ON {HEADCOUNT_TABLE} (department, date)")
+    cursor.execute(f"CREATE INDEX idx_{HEADCOUNT_TABLE}_date ON {HEADCOUNT_TABLE} (date)")
+    return len(records)
@@ -0,0 +1,231 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# metrics.py — Lightweight Instrumentation for the API and Pipeline
+# In-process counters/histograms rendered in Prometheus text format, a timed
+# SQL helper with an optional slow-query log (EXPLAIN QUERY PLAN captured), and
+# per-stage loader timings persisted for the API process to expose.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import bisect
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# ───────────────────────────── Config ─────────────────────────────
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_TIMINGS_PATH = os.getenv('HRIS_STAGE_TIMINGS', 'logs/stage_timings.json')
+SLOW_QUERY_LOG_PATH = 'logs/slow_queries.log'
+# Statements slower than this are logged with their query plan; unset disables the log
+SLOW_QUERY_MS = float(os.getenv('HRIS_SLOW_QUERY_MS')) if os.getenv('HRIS_SLOW_QUERY_MS') else None
+
+# ───────────────────────────── Metric Types ─────────────────────────────
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic count per label set."""
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _label_text(self.labels, k), v) for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """Point-in-time value per label set."""
+    kind = 'gauge'
+
+    def set(self, *label_values, value):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram per label set."""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(label_values, [0] * (len(self.buckets) + 2))
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self):
+        out = []
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                out.append((f'{self.name}_bucket', _label_text(self.labels, label_values, [('le', bound)]), cumulative))
+            out.append((f'{self.name}_bucket', _label_text(self.labels, label_values, [('le', '+Inf')]), series[-1]))
+            out.append((f'{self.name}_sum', _label_text(self.labels, label_values), round(series[-2], 6)))
+            out.append((f'{self.name}_count', _label_text(self.labels, label_values), series[-1]))
+        return out
+
+# ───────────────────────────── Registry ─────────────────────────────
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render(extra=()):
+    """Prometheus text exposition (format 0.0.4) of every registered metric plus `extra`."""
+    lines = []
+    for metric in list(REGISTRY) + list(extra):
+        lines.append(f'# HELP {metric.name} {metric.help}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(f'{name}{labels} {value}' for name, labels, value in metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_LATENCY = register(Histogram(
+    'hris_http_request_duration_seconds', 'API request latency (time to first byte for streams)',
+    labels=('endpoint', 'method', 'status')))
+JSON_LATENCY = register(Histogram(
+    'hris_json_serialize_duration_seconds', 'Time spent building JSON response bodies', labels=('endpoint',)))
+QUERY_LATENCY = register(Histogram(
+    'hris_sql_query_duration_seconds', 'SQLite statement execution time', labels=('statement',)))
+QUERY_ROWS = register(Counter(
+    'hris_sql_rows_returned_total', 'Rows returned by SQLite statements', labels=('statement',)))
+SLOW_QUERIES = register(Counter(
+    'hris_sql_slow_queries_total', 'Statements slower than HRIS_SLOW_QUERY_MS', labels=('statement',)))
+
+# ───────────────────────────── SQL Timing ─────────────────────────────
+def log_slow_query(conn, label, query, params, elapsed):
+    """Appends the statement, its timing and its EXPLAIN QUERY PLAN to the slow-query log."""
+    SLOW_QUERIES.inc(label)
+    try:
+        plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+    except Exception as e:
+        plan = [f"(plan unavailable: {e})"]
+    os.makedirs(os.path.dirname(SLOW_QUERY_LOG_PATH) or '.', exist_ok=True)
+    with open(SLOW_QUERY_LOG_PATH, 'a', encoding='utf-8') as log:
+        log.write(f"🐢 {datetime.datetime.now().isoformat(timespec='seconds')} [{label}] "
+                  f"{elapsed * 1000:.1f} ms\n{' '.join(query.split())}\n  params: {list(params)}\n")
+        log.writelines(f"  plan: {step}\n" for step in plan)
+
+
+def record_query(conn, label, query, params, elapsed, rows):
+    QUERY_LATENCY.observe(elapsed, label)
+    QUERY_ROWS.inc(label, amount=rows)
+    if SLOW_QUERY_MS is not None and elapsed * 1000 >= SLOW_QUERY_MS:
+        log_slow_query(conn, label, query, params, elapsed)
+
+
+def timed_fetchall(conn, label, query, params=()):
+    """conn.execute(...).fetchall() with its time and row count recorded under `label`."""
+    start = time.perf_counter()
+    rows = conn.execute(query, params).fetchall()
+    record_query(conn, label, query, params, time.perf_counter() - start, len(rows))
+    return rows
+
+# ───────────────────────────── Pipeline Stage Timings ─────────────────────────────
+_stage_lock = threading.Lock()
+
+
+def record_stage(stage, seconds, path=None):
+    """Persists the latest duration of a loader/pipeline stage for the API's /metrics."""
+    path = path or STAGE_TIMINGS_PATH
+    with _stage_lock:
+        try:
+            with open(path, encoding='utf-8') as f:
+                stages = json.load(f)
+        except (OSError, ValueError):
+            stages = {}
+        stages[stage] = {'seconds': round(seconds, 4), 'finished_at': time.time()}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stages, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+@contextmanager
+def stage(name):
+    """Times the enclosed block and records it as pipeline stage `name`, if it succeeds."""
+    start = time.perf_counter()
+    yield
+    record_stage(name, time.perf_counter() - start)
+
+
+class StageTimer:
+    """
+    Accumulates time for stages that interleave (e.g. clean/dedup per sheet),
+    then records them; a block that raises adds nothing.
+    """
+
+    def __init__(self):
+        self.totals = {}
+
+    @contextmanager
+    def __call__(self, name):
+        start = time.perf_counter()
+        yield
+        self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+
+    def flush(self):
+        for name, seconds in self.totals.items():
+            record_stage(name, seconds)
+        self.totals.clear()
+
+
+def cache_metrics(cache):
+    """Hit/miss counters, size and hit ratio of a cache.ResponseCache."""
+    hits, misses = Counter('hris_response_cache_hits_total', 'Response cache hits'), \
+        Counter('hris_response_cache_misses_total', 'Response cache misses')
+    entries = Gauge('hris_response_cache_entries', 'Responses held for the current generation')
+    ratio = Gauge('hris_response_cache_hit_ratio', 'Hits / lookups since start')
+    hits.inc(amount=cache.hits)
+    misses.inc(amount=cache.misses)
+    entries.set(value=len(cache))
+    lookups = cache.hits + cache.misses
+    ratio.set(value=round(cache.hits / lookups, 4) if lookups else 0)
+    return [hits, misses, entries, ratio]
+
+
+def stage_gauges(path=None):
+    """Gauges for the last recorded run of each stage, read from disk."""
+    duration = Gauge('hris_pipeline_stage_duration_seconds', 'Duration of the last run of each stage',
+                     labels=('stage',))
+    finished = Gauge('hris_pipeline_stage_finished_timestamp_seconds', 'When each stage last finished',
+                     labels=('stage',))
+    try:
+        with open(path or STAGE_TIMINGS_PATH, encoding='utf-8') as f:
+            stages = json.load(f)
+    except (OSError, ValueError):
+        stages = {}
+    for name, entry in stages.items():
+        duration.set(name, value=entry['seconds'])
+        finished.set(name, value=entry['finished_at'])
+    return [duration, finished]
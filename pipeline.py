@@ -0,0 +1,163 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# pipeline.py — In-Process DAG Runner for the HRIS Pipeline
+# Runs named steps in dependency order inside one interpreter, passing each
+# step's return value (e.g. DataFrames) straight to its dependents. Steps
+# whose dependencies are met run concurrently; transient failures are retried.
+# Memory profiling (tracemalloc) is opt-in: it slows every allocation.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import datetime
+import os
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+LOG_PATH = 'logs/pipeline_log.txt'
+MAX_WORKERS = 4
+
+
+def log_message(msg, log_path=LOG_PATH):
+    """Appends `msg` to the pipeline log with the time it was written."""
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write(f"{msg} @ {timestamp}\n")
+
+# ───────────────────────────── Step Definition ─────────────────────────────
+class Step:
+    """
+    One pipeline node. `fn` is called with the results of `deps`, in order.
+    Exceptions listed in `retry_on` (and accepted by `retry_if`, if given) are
+    retried up to `retries` times with exponential backoff starting at
+    `backoff` seconds.
+    """
+
+    def __init__(self, name, fn, deps=(), retries=0, retry_on=(), retry_if=None, backoff=1.0):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.retries = retries
+        self.retry_on = tuple(retry_on)
+        self.retry_if = retry_if
+        self.backoff = backoff
+
+    def __repr__(self):
+        return f"Step({self.name!r}, deps={self.deps})"
+
+
+class PipelineError(RuntimeError):
+    """A step failed after exhausting its retries."""
+
+    def __init__(self, step, error):
+        super().__init__(f"{step}: {error}")
+        self.step = step
+        self.error = error
+
+# ───────────────────────────── Runner ─────────────────────────────
+class Pipeline:
+    """
+    Validates a step graph and executes it, recording per-step timings.
+    `alert(message, key=..., severity=...)`, if given, is called on every retry
+    and failure; it must not block (see alerts.AlertDispatcher.alert).
+    With profile_memory=True each step's traced peak memory is recorded too;
+    steps then run one at a time, as tracemalloc's peak is process-wide.
+    """
+
+    def __init__(self, steps, max_workers=MAX_WORKERS, log_path=LOG_PATH, alert=None, profile_memory=False):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers
+        self.log_path = log_path
+        self.alert = alert
+        self.profile_memory = profile_memory
+        self.timings = {}
+        self._validate()
+
+    def _validate(self):
+        for step in self.steps.values():
+            missing = [d for d in step.deps if d not in self.steps]
+            if missing:
+                raise ValueError(f"Step {step.name!r} depends on unknown steps: {missing}")
+        # Kahn's algorithm — any leftover node sits on a cycle
+        indegree = {name: len(step.deps) for name, step in self.steps.items()}
+        ready = [name for name, n in indegree.items() if n == 0]
+        seen = 0
+        while ready:
+            name = ready.pop()
+            seen += 1
+            for other in self.steps.values():
+                if name in other.deps:
+                    indegree[other.name] -= 1
+                    if indegree[other.name] == 0:
+                        ready.append(other.name)
+        if seen != len(self.steps):
+            raise ValueError("Pipeline steps contain a dependency cycle")
+
+    def _execute(self, step, args):
+        """Runs one step with retries; records wall-clock time (and traced peak memory, if profiling)."""
+        if self.profile_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    result = step.fn(*args)
+                    break
+                except step.retry_on as e:
+                    if attempt > step.retries or (step.retry_if and not step.retry_if(e)):
+                        raise
+                    delay = step.backoff * 2 ** (attempt - 1)
+                    print(f"🔁 {step.name} failed ({e}); retrying in {delay:.1f}s")
+                    log_message(f"🔁 Retry: {step.name} attempt {attempt} - {e}", self.log_path)
+                    if self.alert:
+                        self.alert(f"{step.name} retrying after: {e}", key=f"retry:{step.name}", severity='warning')
+                    time.sleep(delay)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[step.name] = {'seconds': round(elapsed, 3), 'attempts': attempt}
+            if self.profile_memory:
+                peak_mb = max(tracemalloc.get_traced_memory()[1] - baseline, 0) / 2 ** 20
+                self.timings[step.name]['peak_mb'] = round(peak_mb, 1)
+        return result
+
+    def run(self):
+        """Executes every step; returns {step name: result}. Raises PipelineError on failure."""
+        started_tracing = self.profile_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        results, running = {}, {}
+        pending = dict(self.steps)
+        try:
+            with ThreadPoolExecutor(max_workers=1 if self.profile_memory else self.max_workers) as pool:
+                while pending or running:
+                    for name, step in list(pending.items()):
+                        if all(dep in results for dep in step.deps):
+                            print(f"▶️ {name}")
+                            args = [results[dep] for dep in step.deps]
+                            running[pool.submit(self._execute, step, args)] = name
+                            del pending[name]
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        timing = self.timings.get(name, {})
+                        try:
+                            results[name] = future.result()
+                        except Exception as e:
+                            log_message(f"❌ Failure: {name} - {e} ({timing.get('seconds')}s)", self.log_path)
+                            if self.alert:
+                                self.alert(f"{name} failed: {e}", key=f"failure:{name}")
+                            for other in running:
+                                other.cancel()
+                            raise PipelineError(name, e) from e
+                        peak = f", peak +{timing['peak_mb']:.1f} MB" if 'peak_mb' in timing else ''
+                        log_message(f"✅ Success: {name} ({timing['seconds']:.2f}s{peak}, "
+                                    f"attempts {timing['attempts']})", self.log_path)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+        return results
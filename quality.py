@@ -0,0 +1,152 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# quality.py — Declarative Data-Quality Rules
+# Every rule is a SQL predicate over one of three row sources (matched pairs,
+# employees, applicants). Each source is scanned once: one statement counts
+# every rule's violations with SUM(CASE …) and collects the ids of violating
+# rows, whose columns are then fetched by id. Adding a rule adds a CASE, not
+# another join.
+# Violations land in one dq_<rule> table and CSV per violated rule, plus a
+# dq_summary table/CSV.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import os
+import time
+from collections import namedtuple
+import pandas as pd
+
+# ───────────────────────────── Config ─────────────────────────────
+DQ_LOG_DIR = 'logs/dq'
+SUMMARY_TABLE = 'dq_summary'
+KNOWN_STATUSES = {'applied', 'screening', 'interviewing', 'offer', 'hired', 'rejected', 'withdrawn',
+                  'unknown'}  # 'unknown': data_loader's fill for a missing status, not a bad value
+MAX_PLAUSIBLE_TIME_TO_HIRE = 365   # Days; a longer gap usually means a bad match or a typo'd date
+
+# Row source per rule scope, with its row id: 'pair' one matched applicant ↔
+# employee row, 'employee' / 'applicant' one source row
+Source = namedtuple('Source', ['tables', 'rowid'])
+SOURCES = {
+    'pair': Source("""applicant_employee_match m
+                      JOIN applicants a ON a.rowid = m.applicant_rowid
+                      JOIN employees e ON e.rowid = m.employee_rowid""", 'm.rowid'),
+    'employee': Source("employees e", 'e.rowid'),
+    'applicant': Source("applicants a", 'a.rowid'),
+}
+TIME_TO_HIRE = "julianday(e.hire_date) - julianday(a.application_date)"
+
+# ───────────────────────────── Rules ─────────────────────────────
+# predicate: SQL over the scope's source, true for a violating row
+# columns: select expressions reported for each violation
+Rule = namedtuple('Rule', ['name', 'description', 'scope', 'predicate', 'columns'])
+
+PAIR_COLUMNS = ['a.name', 'a.role', 'a.application_date', 'e.hire_date', 'e.department']
+EMPLOYEE_COLUMNS = ['e.name', 'e.department', 'e.hire_date', 'e.end_date']
+APPLICANT_COLUMNS = ['a.name', 'a.role', 'a.status', 'a.application_date']
+
+RULES = [
+    Rule('hire_before_application', 'Hire date precedes application date', 'pair',
+         f"{TIME_TO_HIRE} < 0", PAIR_COLUMNS),
+    Rule('implausible_time_to_hire', f'Hired more than {MAX_PLAUSIBLE_TIME_TO_HIRE} days after applying', 'pair',
+         f"{TIME_TO_HIRE} > {MAX_PLAUSIBLE_TIME_TO_HIRE}",
+         PAIR_COLUMNS + [f"{TIME_TO_HIRE} AS time_to_hire_days"]),
+    Rule('end_before_start', 'End date precedes hire date', 'employee',
+         "julianday(e.end_date) < julianday(e.hire_date)", EMPLOYEE_COLUMNS),
+    Rule('missing_hire_date', 'Employee has no hire date', 'employee',
+         "julianday(e.hire_date) IS NULL", EMPLOYEE_COLUMNS),
+    Rule('orphan_hire', 'Employee matches no applicant', 'employee',
+         "NOT EXISTS (SELECT 1 FROM applicant_employee_match m WHERE m.employee_rowid = e.rowid)",
+         EMPLOYEE_COLUMNS),
+    Rule('unknown_status', 'Applicant status is not a known pipeline stage', 'applicant',
+         f"a.status IS NULL OR LOWER(TRIM(a.status)) NOT IN ({', '.join(repr(s) for s in sorted(KNOWN_STATUSES))})",
+         APPLICANT_COLUMNS),
+]
+
+# ───────────────────────────── Engine ─────────────────────────────
+def count_violations(conn, scope, rules):
+    """
+    One pass over the scope's source: rows checked, violations per rule, and
+    the ids of rows violating any rule (collected in SQL, as a JSON array).
+    """
+    source = SOURCES[scope]
+    flags = ', '.join(f'COALESCE({rule.predicate}, 0) AS "{rule.name}"' for rule in rules)
+    sums = ', '.join(f'SUM("{rule.name}")' for rule in rules)
+    any_rule = ' OR '.join(f'"{rule.name}"' for rule in rules)
+    # LIMIT -1 keeps SQLite from flattening the subquery into the aggregate,
+    # which would evaluate every predicate again for each place it is used
+    checked, rowids, *counts = conn.execute(
+        f"SELECT COUNT(*), json_group_array(id) FILTER (WHERE {any_rule}), {sums} "
+        f"FROM (SELECT {source.rowid} AS id, {flags} FROM {source.tables} LIMIT -1)").fetchone()
+    return checked, [count or 0 for count in counts], rowids
+
+
+def fetch_violations(conn, scope, rules, rowids):
+    """
+    Rows `rowids` (a JSON array) with every rule's columns plus one 0/1 flag
+    per rule, named after it; each row is a keyed lookup, not another scan.
+    """
+    source = SOURCES[scope]
+    columns = list(dict.fromkeys(column for rule in rules for column in rule.columns))
+    flags = [f'COALESCE({rule.predicate}, 0) AS "{rule.name}"' for rule in rules]
+    cursor = conn.execute(f"SELECT {', '.join(columns + flags)} FROM {source.tables} "
+                          f"WHERE {source.rowid} IN (SELECT value FROM json_each(?))", (rowids,))
+    return pd.DataFrame(cursor.fetchall(), columns=[d[0] for d in cursor.description])
+
+
+def column_name(expression):
+    """Result column name of a select expression: 'a.name' → 'name', '… AS days' → 'days'."""
+    return expression.rsplit(' ', 1)[-1].split('.')[-1]
+
+
+def evaluate(conn, rules=RULES):
+    """Applies every rule in SQL; returns {rule name: violating rows} and a summary frame."""
+    scopes = {}
+    for scope in SOURCES:
+        scoped = [rule for rule in rules if rule.scope == scope]
+        if scoped:
+            checked, counts, rowids = count_violations(conn, scope, scoped)
+            violated = [rule for rule, count in zip(scoped, counts) if count]
+            rows = fetch_violations(conn, scope, violated, rowids) if violated else None
+            scopes[scope] = (checked, dict(zip((rule.name for rule in scoped), counts)), rows)
+
+    violations, summary = {}, []
+    for rule in rules:
+        checked, counts, rows = scopes[rule.scope]
+        names = [column_name(column) for column in rule.columns]
+        hits = rows.loc[rows[rule.name] == 1, names] if counts[rule.name] else pd.DataFrame(columns=names)
+        violations[rule.name] = hits.assign(error_reason=rule.description).reset_index(drop=True)
+        summary.append({'rule': rule.name, 'description': rule.description, 'scope': rule.scope,
+                        'checked': checked, 'violations': counts[rule.name]})
+    return violations, pd.DataFrame(summary)
+
+
+def write_results(conn, violations, summary, log_dir=DQ_LOG_DIR):
+    """
+    Writes dq_<rule> and logs/dq/<rule>.csv for each rule with violations (and
+    removes the previous run's for rules that now have none), plus the summary.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    summary = summary.assign(evaluated_at=pd.Timestamp.now().isoformat(timespec='seconds'))
+    for name, df in violations.items():
+        csv_path = os.path.join(log_dir, f'{name}.csv')
+        if df.empty:
+            conn.execute(f"DROP TABLE IF EXISTS dq_{name}")
+            if os.path.exists(csv_path):
+                os.remove(csv_path)
+            continue
+        df.to_sql(f'dq_{name}', conn, if_exists='replace', index=False)
+        df.to_csv(csv_path, index=False)
+    summary.to_sql(SUMMARY_TABLE, conn, if_exists='replace', index=False)
+    summary.to_csv(os.path.join(log_dir, 'summary.csv'), index=False)
+    conn.commit()
+
+
+def run_checks(conn, rules=RULES, log_dir=DQ_LOG_DIR):
+    """Evaluates every rule with one scan per row source, persists and returns the results."""
+    start = time.perf_counter()
+    violations, summary = evaluate(conn, rules)
+    write_results(conn, violations, summary, log_dir)
+    flagged = summary[summary['violations'] > 0]
+    for row in flagged.itertuples():
+        print(f"⚠️ {row.rule}: {row.violations} of {row.checked} {row.scope} rows")
+    print(f"🧪 {len(rules)} data-quality rules evaluated in {time.perf_counter() - start:.2f}s "
+          f"({len(flagged)} with violations, see {log_dir}/)")
+    return violations, summary
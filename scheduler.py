@@ -1,34 +1,60 @@
 # STEP 1: Import modules
-import subprocess
-import datetime
+import argparse
+import sqlite3
 import sys
-from send_alert import send_email_alert  # Optional email module
+import data_loader
+import transform
+import generate_charts
+from pipeline import Pipeline, PipelineError, Step, log_message
+from alerts import AlertDispatcher  # Sinks (email, webhook, alert log) configured via .env
 
 # STEP 2: Define pipeline steps
-pipeline = [
-    ("🔁 Running data_loader.py", ["python", "data_loader.py"]),
-    ("🔧 Running transform.py", ["python", "transform.py"])
-]
+# One in-process dependency graph: DataFrames flow from step to step in memory,
+# and the two post-build steps (audit log, charts) run concurrently.
+def log_invalid_hires():
+    conn = sqlite3.connect(transform.DB_PATH)
+    try:
+        transform.log_invalid_hires(conn)
+    finally:
+        conn.close()
+
+def is_db_busy(error):
+    """Lock contention ("database is locked", SQLITE_BUSY) clears on its own; other OperationalErrors don't."""
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+# Retried only while another connection (e.g. a concurrent load) holds the write lock
+DB_BUSY = dict(retries=3, retry_on=(sqlite3.OperationalError,), retry_if=is_db_busy)
 
-# STEP 3: Logging setup
-timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-log_path = "logs/pipeline_log.txt"
+pipeline = Pipeline([
+    Step("load", data_loader.load_excel_data, retries=2, retry_on=(PermissionError,)),
+    Step("clean", lambda frames: data_loader.clean_dataframes(*frames), deps=["load"]),
+    # Syncs into a copy of the live file, builds the views there and publishes it (see data_loader.build_database)
+    Step("write", lambda frames: data_loader.write_incremental(*frames), deps=["clean"], **DB_BUSY),
+    Step("log_invalid_hires", lambda _: log_invalid_hires(), deps=["write"]),
+    Step("render_charts", lambda _: generate_charts.generate_charts(), deps=["write"]),
+])
 
-def log_message(msg):
-    with open(log_path, "a") as log:
-        log.write(f"{msg} @ {timestamp}\n")
+# STEP 3: Execute pipeline
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the nightly HRIS pipeline")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="Record each step's traced peak memory (slower; steps run one at a time)")
+    args = parser.parse_args()
+    pipeline.profile_memory = args.profile_memory
 
-# STEP 4: Execute pipeline steps
-for label, cmd in pipeline:
-    print(label)
+    print("🚀 Running HRIS pipeline")
+    # Retries and failures are queued as they happen and sent as one digest in the background
+    alerts = AlertDispatcher()
+    pipeline.alert = alerts.alert
     try:
-        subprocess.check_call(cmd)
-        log_message(f"✅ Success: {label}")
-    except subprocess.CalledProcessError as e:
-        log_message(f"❌ Failure: {label} - {e}")
-        send_email_alert(f"{label} failed. See logs for details.")  # Optional
+        pipeline.run()
+    except PipelineError as e:
+        print(f"❌ Pipeline failed at {e.step}: {e.error}")
         sys.exit(1)
+    finally:
+        alerts.close()  # Sends anything still queued right away
 
-# STEP 5: Final success log
-print("✅ HRIS pipeline completed successfully.")
-log_message("✅ All steps completed successfully.")
\ No newline at end of file
+    # STEP 4: Final success log
+    print("✅ HRIS pipeline completed successfully.")
+    log_message("✅ All steps completed successfully.")
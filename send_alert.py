@@ -1,28 +1,24 @@
 import os
-import smtplib
-from email.message import EmailMessage
 from dotenv import load_dotenv
+from alerts import SUBJECT, SmtpSink
 
 # Load credentials from .env
 load_dotenv()
 EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 RECIPIENT = os.getenv("RECIPIENT")
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
 
 def send_email_alert(message: str):
-    msg = EmailMessage()
-    msg['Subject'] = "🚨 HRIS Pipeline Alert"
-    msg['From'] = EMAIL_ADDRESS
-    msg['To'] = RECIPIENT
-    msg.set_content(message)
-
+    """Sends one email right away; the pipeline itself queues alerts through alerts.AlertDispatcher."""
+    sink = SmtpSink(SMTP_HOST, SMTP_PORT, EMAIL_ADDRESS, RECIPIENT,
+                    username=EMAIL_ADDRESS, password=EMAIL_PASSWORD, ssl=SMTP_PORT == 465)
     try:
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp:
-            smtp.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            smtp.send_message(msg)
+        sink.send(SUBJECT, message)
         print("✅ Alert email sent to", RECIPIENT)
     except Exception as e:
         print(f"⚠️ Failed to send alert email: {e}")
 
 if __name__ == "__main__":
-    send_email_alert("🚨 Test Alert: Pipeline Failure Simulation.")
\ No newline at end of file
+    send_email_alert("🚨 Test Alert: Pipeline Failure Simulation.")
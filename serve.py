@@ -0,0 +1,162 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# serve.py — Production Launcher for the HRIS API
+# Preforks N gunicorn workers (threaded, keep-alive) over the read-only SQLite
+# file. The master watches for a newly published database and gracefully
+# reloads its workers; slow requests are cut off by a per-request deadline.
+# With --memory each worker serves from an in-memory copy instead and swaps in
+# new generations itself (see db.MemoryMirror), so no worker restarts.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import argparse
+import http.client
+import os
+import signal
+import threading
+import time
+
+import db
+from app import app, DB_PATH
+
+# ───────────────────────────── Config ─────────────────────────────
+HOST = os.getenv('HRIS_HOST', '0.0.0.0')
+PORT = int(os.getenv('HRIS_PORT', '8000'))
+WORKERS = int(os.getenv('HRIS_WORKERS', str(os.cpu_count() or 2)))
+THREADS = 4              # Request threads per worker
+REQUEST_TIMEOUT = 30     # Seconds a request may spend in SQLite before it is interrupted
+KEEPALIVE = 5            # Seconds an idle keep-alive connection is held open
+GRACEFUL_TIMEOUT = 30    # Seconds old workers get to finish in-flight requests on reload
+WATCH_INTERVAL = 2       # Seconds between checks for a newly published database
+MEMORY = os.getenv('HRIS_MEMORY', '0') == '1'   # Serve from RAM (same as --memory)
+
+
+@app.before_request
+def start_request_deadline():
+    db.set_deadline(REQUEST_TIMEOUT)
+
+# ───────────────────────────── Database Watcher ─────────────────────────────
+def published_version(path=DB_PATH):
+    """(inode, generation) of the published database, or None if it is missing."""
+    try:
+        conn = db.connect_readonly(path)
+        try:
+            row = conn.execute("SELECT generation FROM data_generation").fetchone()
+        except Exception:
+            row = None
+        finally:
+            conn.close()
+        return db.file_identity(path), row[0] if row else None
+    except Exception:
+        return None
+
+
+def watch_database(server):
+    """
+    gunicorn `when_ready` hook: polls for a new file/generation from the
+    scheduler and sends the master SIGHUP — new workers start, old ones drain.
+    """
+    def poll():
+        version = published_version()
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            latest = published_version()
+            if latest and latest != version:
+                version = latest
+                server.log.info("New database generation published — reloading workers")
+                os.kill(os.getpid(), signal.SIGHUP)
+
+    threading.Thread(target=poll, name='db-watcher', daemon=True).start()
+
+# ───────────────────────────── Server ─────────────────────────────
+def run(host, port, workers, threads, memory=MEMORY):
+    from gunicorn.app.base import BaseApplication
+
+    class HRISApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{host}:{port}',
+                'workers': workers,
+                'worker_class': 'gthread',
+                'threads': threads,
+                'keepalive': KEEPALIVE,
+                'timeout': int(REQUEST_TIMEOUT + GRACEFUL_TIMEOUT),  # Hard kill for a wedged worker
+                'graceful_timeout': GRACEFUL_TIMEOUT,
+                'preload_app': True,   # Import once in the master, fork copy-on-write
+            }
+            if not memory:  # In-memory workers reload themselves without a restart
+                options['when_ready'] = watch_database
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    HRISApplication().run()
+
+# ───────────────────────────── Throughput Benchmark ─────────────────────────────
+def benchmark(host, port, path, concurrency, duration):
+    """
+    Drives `path` with `concurrency` keep-alive clients for `duration` seconds and
+    prints requests/sec. Compare runs at --workers 1, 2, 4… to get throughput per core.
+    """
+    counts = [0] * concurrency
+    errors = [0] * concurrency
+    stop_at = time.monotonic() + duration
+
+    def client(i):
+        conn = http.client.HTTPConnection(host, port, timeout=REQUEST_TIMEOUT)
+        while time.monotonic() < stop_at:
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status == 200:
+                    counts[i] += 1
+                else:
+                    errors[i] += 1
+            except (OSError, http.client.HTTPException):
+                errors[i] += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=REQUEST_TIMEOUT)
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = sum(counts)
+    print(f"📈 {path}: {total} requests in {duration}s → {total / duration:.0f} req/s "
+          f"({sum(errors)} errors, {concurrency} clients)")
+    return total / duration
+
+# ───────────────────────────── Execution Entry ─────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the HRIS API with preforked workers")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--threads', type=int, default=THREADS)
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT,
+                        help="Per-request SQLite time budget in seconds")
+    parser.add_argument('--memory', action='store_true', default=MEMORY,
+                        help="Serve from an in-memory copy of the database, reloaded on each new generation")
+    parser.add_argument('--bench', metavar='PATH',
+                        help="Benchmark a running server at --host/--port instead of serving")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+    REQUEST_TIMEOUT = args.timeout
+
+    if args.bench:
+        host = '127.0.0.1' if args.host == '0.0.0.0' else args.host
+        benchmark(host, args.port, args.bench, args.concurrency, args.duration)
+    else:
+        if args.memory:
+            db.enable_memory_mode(DB_PATH, interval=WATCH_INTERVAL)
+        if os.name == 'nt':
+            # gunicorn needs fork(), which Windows lacks: one threaded process instead
+            print(f"⚠️ Windows — serving single-process on http://{args.host}:{args.port}")
+            app.run(host=args.host, port=args.port, threaded=True)
+        else:
+            run(args.host, args.port, args.workers, args.threads, memory=args.memory)
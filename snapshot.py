@@ -0,0 +1,174 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# snapshot.py — Columnar Snapshots for Analytics Consumers
+# transform.py publishes employees / applicants / time_to_hire as one versioned
+# set of Arrow IPC (or Parquet) files per data generation; readers memory-map
+# them instead of pulling Python row tuples out of the API's SQLite file.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import itertools
+import json
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# ───────────────────────────── Config ─────────────────────────────
+SNAPSHOT_DIR = 'snapshots'
+SNAPSHOT_TABLES = ('employees', 'applicants', 'time_to_hire')
+CURRENT_FILE = 'CURRENT'   # Names the newest complete version directory
+KEEP_VERSIONS = 3          # Older versions are pruned after each publish
+BATCH_ROWS = 100_000       # Rows per record batch / row group while exporting
+EXTENSIONS = {'arrow': '.arrow', 'parquet': '.parquet'}
+INTERNAL_COLUMNS = {'row_key', 'name_key'}  # Loader/transform bookkeeping, not analytics data
+
+# SQLite declared type (substring, upper-cased) → Arrow type
+DECLARED_TYPES = [
+    ('INT', pa.int64()),
+    ('REAL', pa.float64()), ('FLOA', pa.float64()), ('DOUB', pa.float64()),
+    ('TIMESTAMP', pa.timestamp('ns')), ('DATE', pa.timestamp('ns')),
+    ('CHAR', pa.string()), ('TEXT', pa.string()), ('CLOB', pa.string()),
+]
+
+# ───────────────────────────── Export ─────────────────────────────
+def _is_date(name, declared):
+    return name.endswith('_date') or 'DATE' in declared or 'TIMESTAMP' in declared
+
+
+def table_schema(conn, table, sample):
+    """
+    Arrow schema for `table`: from SQLite declared types where they say
+    something, else inferred from the first batch (`sample`), else string.
+    *_date columns are always timestamps.
+    """
+    fields = []
+    for _, name, declared, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        if name in INTERNAL_COLUMNS:
+            continue
+        declared = (declared or '').upper()
+        if _is_date(name, declared):
+            kind = pa.timestamp('ns')
+        else:
+            kind = next((t for key, t in DECLARED_TYPES if key in declared), None)
+        if kind is None:
+            inferred = pa.Array.from_pandas(sample[name]).type if name in sample else pa.null()
+            kind = pa.string() if pa.types.is_null(inferred) else inferred
+        fields.append(pa.field(name, kind))
+    return pa.schema(fields)
+
+
+def _to_batch(df, schema):
+    for field in schema:
+        if pa.types.is_timestamp(field.type):
+            df[field.name] = pd.to_datetime(df[field.name], errors='coerce', format='ISO8601')
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+
+def export_table(conn, table, path, fmt='arrow', batch_rows=BATCH_ROWS):
+    """
+    Streams `table` from SQLite into one columnar file, `batch_rows` at a time.
+    Arrow IPC files are written uncompressed so readers can memory-map them
+    without a decode step. Returns the number of rows written.
+    """
+    chunks = pd.read_sql_query(f"SELECT * FROM {table}", conn, chunksize=batch_rows)
+    first = next(chunks, None)
+    schema = table_schema(conn, table, first if first is not None else pd.DataFrame())
+    writer = ipc.new_file(path, schema) if fmt == 'arrow' else pq.ParquetWriter(path, schema)
+    rows = 0
+    with writer:
+        for chunk in itertools.chain([first] if first is not None else [], chunks):
+            batch = _to_batch(chunk, schema)
+            writer.write_table(batch)
+            rows += batch.num_rows
+    return rows
+
+# ───────────────────────────── Publish ─────────────────────────────
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def publish_snapshot(conn, generation, tables=SNAPSHOT_TABLES, fmt='arrow', root=SNAPSHOT_DIR,
+                     keep=KEEP_VERSIONS):
+    """
+    Exports `tables` into root/<generation>/ and then points root/CURRENT at it.
+    Files are built in a hidden directory and renamed into place, so readers
+    only ever see complete versions. Returns the version directory.
+    """
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown snapshot format: {fmt!r} (expected one of {sorted(EXTENSIONS)})")
+    version = str(generation)
+    final_dir = os.path.join(root, version)
+    build_dir = os.path.join(root, f".build-{version}")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+
+    manifest = {'generation': generation, 'format': fmt, 'tables': {}}
+    for table in tables:
+        filename = table + EXTENSIONS[fmt]
+        rows = export_table(conn, table, os.path.join(build_dir, filename), fmt)
+        manifest['tables'][table] = {'file': filename, 'rows': rows}
+    with open(os.path.join(build_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(final_dir, ignore_errors=True)  # Re-publishing the same generation replaces it
+    os.replace(build_dir, final_dir)
+    _write_atomic(os.path.join(root, CURRENT_FILE), version)
+    prune_versions(root, keep)
+    print(f"🗃️ Snapshot {version} published to {final_dir} ({fmt})")
+    return final_dir
+
+
+def prune_versions(root=SNAPSHOT_DIR, keep=KEEP_VERSIONS):
+    """Removes all but the newest `keep` versions (never the CURRENT one)."""
+    current = current_version(root)
+    versions = sorted((name for name in os.listdir(root) if name.isdigit()), key=int, reverse=True)
+    for name in versions[keep:]:
+        if name != current:
+            # Open memory maps keep unlinked files readable on POSIX; Windows refuses, so retry next run
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+# ───────────────────────────── Reader API ─────────────────────────────
+def current_version(root=SNAPSHOT_DIR):
+    """Name of the newest complete snapshot version, or None if none was published."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def load_manifest(version=None, root=SNAPSHOT_DIR):
+    """Manifest (generation, format, per-table file and row count) of `version` (default: current)."""
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f"No snapshot published under {root}/ (run transform.py --snapshot)")
+    with open(os.path.join(root, version, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def open_table(table, columns=None, version=None, root=SNAPSHOT_DIR):
+    """
+    Returns `table` from a snapshot as a pyarrow.Table. Arrow IPC files are
+    memory-mapped: columns reference the mapped pages directly (zero-copy), and
+    only the pages of the columns actually touched are read from disk.
+    """
+    version = version or current_version(root)
+    manifest = load_manifest(version, root)
+    path = os.path.join(root, version, manifest['tables'][table]['file'])
+    if manifest['format'] == 'parquet':
+        return pq.read_table(path, columns=columns, memory_map=True)
+    with pa.memory_map(path) as source:
+        arrow_table = ipc.open_file(source).read_all()
+    return arrow_table.select(columns) if columns is not None else arrow_table
+
+
+def read_frame(table, columns=None, version=None, root=SNAPSHOT_DIR):
+    """
+    `table` from a snapshot as a DataFrame. Numeric and timestamp columns
+    without nulls are converted without copying.
+    """
+    return open_table(table, columns, version, root).to_pandas(split_blocks=True, self_destruct=True)
@@ -0,0 +1,169 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# tenure.py — Tenure-Range Queries over Employee Employment Intervals
+# Loads each employee's [hire_date, end_date] once per data generation into a
+# centered interval tree per department, so "who was employed on X" walks one
+# root-to-leaf path with a binary search per node instead of scanning the table.
+# A tenure window is a range of hire dates, sliced the same way at each node.
+# ──────────────────────────────────────────────────────────────────────────────
+
+import threading
+import numpy as np
+import pandas as pd
+
+DAYS_PER_MONTH = 365.25 / 12
+OPEN_END = np.iinfo(np.int64).max   # end_date IS NULL: still employed
+DEFAULT_LIMIT = 100                 # Employee rows returned per query (counts cover every match)
+
+LOAD_QUERY = """
+    SELECT name, department, hire_date, end_date
+    FROM employees
+    WHERE hire_date IS NOT NULL
+"""
+
+# ───────────────────────────── Interval Tree ─────────────────────────────
+def day_numbers(dates):
+    """Dates (ISO strings or timestamps) → int64 days since 1970-01-01; NaT → OPEN_END."""
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce', format='ISO8601')
+    days = parsed.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    return np.where(parsed.isna().to_numpy(), OPEN_END, days)
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed integer intervals.
+    Each node splits at the median start: intervals wholly left or right of the
+    center go to a child, the rest stay at the node sorted both by start and by
+    end. A stabbing query takes one contiguous slice per node on its path, so
+    it costs O(log² n + k) for k hits. A start window (a tenure range) is one
+    more binary search per node on the start-sorted list.
+    """
+
+    def __init__(self, starts, ends, ids):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        # (center, ids by start, sorted starts, their ends, ids by end, sorted ends, left, right)
+        self.nodes = []
+        self.root = self._build(np.arange(len(self.ids)))
+
+    def _build(self, members):
+        if not len(members):
+            return -1
+        starts, ends = self.starts[members], self.ends[members]
+        center = int(np.median(starts))
+        here = (starts <= center) & (ends >= center)
+        by_start = members[here][np.argsort(starts[here], kind='stable')]
+        by_end = members[here][np.argsort(ends[here], kind='stable')]
+        index = len(self.nodes)
+        self.nodes.append([center, self.ids[by_start], self.starts[by_start], self.ends[by_start],
+                           self.ids[by_end], self.ends[by_end], -1, -1])
+        # Depth is O(log n): both sides hold at most half of the starts
+        self.nodes[index][6] = self._build(members[ends < center])
+        self.nodes[index][7] = self._build(members[starts > center])
+        return index
+
+    def stab(self, point, first_start=None, last_start=None):
+        """
+        Ids of every interval containing `point` (unordered), optionally only
+        those starting within [first_start, last_start]. Right of a node's
+        center the start slice is then trimmed to intervals still open at
+        `point`, which costs the node's ended intervals inside the window.
+        """
+        windowed = first_start is not None or last_start is not None
+        lowest = np.iinfo(np.int64).min if first_start is None else first_start
+        highest = point if last_start is None else min(point, last_start)
+        hits, node = [], self.root
+        while node != -1:
+            center, ids_by_start, starts, ends_by_start, ids_by_end, ends, left, right = self.nodes[node]
+            if point <= center:   # Every node interval ends at or after center ≥ point
+                hits.append(ids_by_start[np.searchsorted(starts, lowest, 'left'):
+                                         np.searchsorted(starts, highest, 'right')])
+                if point == center:
+                    break
+                node = left
+            else:                 # Every node interval starts at or before center < point
+                if windowed:
+                    window = slice(np.searchsorted(starts, lowest, 'left'), np.searchsorted(starts, highest, 'right'))
+                    hits.append(ids_by_start[window][ends_by_start[window] >= point])
+                else:
+                    hits.append(ids_by_end[np.searchsorted(ends, point, 'left'):])
+                node = right
+        return np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+
+# ───────────────────────────── Store ─────────────────────────────
+class TenureIndex:
+    """
+    Thread-safe holder of employment intervals for one data generation: one
+    IntervalTree per department over row ids into flat name / date arrays.
+    Employees without a hire date, or whose end precedes their hire, are left
+    out (see the data-quality logs).
+    """
+
+    def __init__(self):
+        self.generation = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    def ensure(self, conn, generation):
+        """Reloads from `conn` when `generation` differs from the one held."""
+        if self.generation == generation and self._data is not None:
+            return
+        with self._lock:
+            if self.generation != generation or self._data is None:
+                self._data = self._load(conn)
+                self.generation = generation
+
+    @staticmethod
+    def _load(conn):
+        df = pd.DataFrame(conn.execute(LOAD_QUERY).fetchall(),
+                          columns=['name', 'department', 'hire_date', 'end_date'])
+        starts, ends = day_numbers(df['hire_date']), day_numbers(df['end_date'])
+        keep = (starts != OPEN_END) & (ends >= starts)
+        df, starts, ends = df[keep].reset_index(drop=True), starts[keep], ends[keep]
+        departments = df['department'].astype(object).where(df['department'].notna(), None).to_numpy()
+
+        trees = {}
+        for label in pd.unique(departments):
+            ids = np.flatnonzero(departments == label)
+            trees[label] = IntervalTree(starts[ids], ends[ids], ids)
+        return {
+            'name': df['name'].to_numpy(dtype=object),
+            'department': departments,
+            'hire_date': df['hire_date'].to_numpy(dtype=object),
+            'end_date': df['end_date'].astype(object).where(df['end_date'].notna(), None).to_numpy(),
+            'start': starts,
+            'trees': trees,
+        }
+
+    def query(self, on, department=None, min_months=None, max_months=None, limit=DEFAULT_LIMIT):
+        """
+        Employees employed on date `on` (hire_date ≤ on ≤ end_date, or no end),
+        optionally only in `department` (case-insensitive) and with tenure on
+        that date between `min_months` and `max_months`. Returns the total
+        count, per-department headcount and median tenure, and up to `limit`
+        employees, longest-tenured first.
+        """
+        data = self._data  # One consistent generation, even if a reload swaps it mid-request
+        day = int(np.datetime64(on, 'D').astype(np.int64))
+        # Tenure between min and max months on `day` ⇔ hired within this day range
+        first_start = None if max_months is None else int(np.ceil(day - max_months * DAYS_PER_MONTH))
+        last_start = None if min_months is None else int(np.floor(day - min_months * DAYS_PER_MONTH))
+        summary, matches = [], []
+        for label, tree in data['trees'].items():
+            if department is not None and (label is None or label.lower() != department.lower()):
+                continue
+            ids = tree.stab(day, first_start, last_start)
+            months = (day - data['start'][ids]) / DAYS_PER_MONTH
+            if len(ids):
+                summary.append({'department': label, 'active': int(len(ids)),
+                                'median_tenure_months': round(float(np.median(months)), 1)})
+                matches.append(ids)
+
+        ids = np.concatenate(matches) if matches else np.empty(0, dtype=np.int64)
+        ids = ids[np.lexsort((ids, data['start'][ids]))][:limit]  # Earliest hire first; row order breaks ties
+        employees = [{'name': data['name'][i], 'department': data['department'][i],
+                      'hire_date': data['hire_date'][i], 'end_date': data['end_date'][i],
+                      'tenure_months': round((day - int(data['start'][i])) / DAYS_PER_MONTH, 1)}
+                     for i in ids.tolist()]
+        summary.sort(key=lambda row: (row['department'] is None, row['department'] or ''))
+        return {'count': sum(row['active'] for row in summary), 'departments': summary, 'data': employees}
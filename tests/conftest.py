@@ -0,0 +1,17 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# conftest.py — Shared Test Setup
+# Keeps stage timings written during the suite (including by the pipeline
+# scripts test_views.py runs as subprocesses) out of the repo's logs/
+# ──────────────────────────────────────────────────────────────────────────────
+
+import pytest
+import metrics
+
+
+@pytest.fixture(scope='session', autouse=True)
+def stage_timings_in_tmp(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('metrics') / 'stage_timings.json')
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(metrics, 'STAGE_TIMINGS_PATH', path)
+        patch.setenv('HRIS_STAGE_TIMINGS', path)
+        yield path
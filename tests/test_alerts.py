@@ -0,0 +1,132 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_alerts.py — Alert Dispatcher Tests
+# Coalescing, retries and non-blocking enqueue, with delivery to a local SMTP
+# stand-in and a file sink
+# ──────────────────────────────────────────────────────────────────────────────
+
+import json
+import socketserver
+import threading
+import time
+from email import message_from_bytes
+import pytest
+from alerts import AlertDispatcher, FileSink, SmtpSink
+from pipeline import Pipeline, PipelineError, Step
+
+# ───────────────────────────── SMTP Stand-In ─────────────────────────────
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Just enough of RFC 5321 for smtplib: greets, accepts every command and stores DATA."""
+
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b"220 stand-in ready\r\n")
+        for line in self.rfile:
+            verb = line[:4].upper()
+            if verb == b'DATA':
+                self.wfile.write(b"354 end with <CRLF>.<CRLF>\r\n")
+                data = []
+                for chunk in self.rfile:
+                    if chunk == b".\r\n":
+                        break
+                    data.append(chunk)
+                self.server.messages.append(message_from_bytes(b"".join(data)))
+            elif verb == b'QUIT':
+                self.wfile.write(b"221 bye\r\n")
+                return
+            self.wfile.write(b"250 ok\r\n")
+
+
+class SmtpStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SmtpHandler)
+        self.messages, self.connections = [], 0
+
+
+@pytest.fixture
+def smtp_server():
+    server = SmtpStandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class FlakySink:
+    name = 'flaky'
+
+    def __init__(self, failures):
+        self.failures, self.sent = failures, []
+
+    def send(self, subject, body, entries=()):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("server unavailable")
+        self.sent.append((subject, body, entries))
+
+# ───────────────────────────── Dispatcher ─────────────────────────────
+def test_alert_storm_becomes_one_email_over_one_connection(smtp_server, tmp_path):
+    smtp = SmtpSink('127.0.0.1', smtp_server.server_address[1], 'hris@example.com', ['ops@example.com'],
+                    ssl=False)
+    log = tmp_path / 'alerts.jsonl'
+    with AlertDispatcher([smtp, FileSink(str(log))], window=60) as alerts:
+        for _ in range(10):
+            alerts.alert("write retrying after: database is locked", key='retry:write', severity='warning')
+        alerts.alert("write failed: database is locked", key='failure:write')
+    # close() flushed without waiting out the 60s window
+
+    assert smtp_server.connections == 1 and len(smtp_server.messages) == 1
+    email = smtp_server.messages[0]
+    assert email['To'] == 'ops@example.com' and '2 issues (11 alerts)' in email['Subject']
+    assert '×10' in email.get_payload(decode=True).decode('utf-8')
+    record = json.loads(log.read_text(encoding='utf-8'))
+    assert [(a['key'], a['count']) for a in record['alerts']] == [('retry:write', 10), ('failure:write', 1)]
+
+
+def test_alert_never_waits_for_delivery():
+    release = threading.Event()
+
+    class SlowSink:
+        name = 'slow'
+        sent = 0
+
+        def send(self, subject, body, entries=()):
+            release.wait(5)
+            SlowSink.sent += 1
+
+    alerts = AlertDispatcher([SlowSink()], window=0)
+    start = time.perf_counter()
+    for i in range(100):
+        alerts.alert(f"step {i} failed")
+    assert time.perf_counter() - start < 0.5
+    release.set()
+    alerts.close()
+    assert SlowSink.sent >= 1
+
+
+def test_failed_deliveries_are_retried_then_given_up():
+    recovering, dead = FlakySink(failures=2), FlakySink(failures=99)
+    dead.name = 'dead'
+    with AlertDispatcher([recovering, dead], window=0, retries=2, backoff=0) as alerts:
+        alerts.alert("render_charts failed")
+
+    assert len(recovering.sent) == 1 and recovering.failures == 0
+    assert alerts.failures == {'dead': 1} and alerts.delivered == 1
+
+
+def test_pipeline_reports_retries_and_failure(tmp_path):
+    sink = FlakySink(failures=0)
+
+    def locked():
+        raise TimeoutError("database is locked")
+
+    with AlertDispatcher([sink], window=60) as alerts:
+        pipeline = Pipeline([Step('write', locked, retries=2, retry_on=(TimeoutError,), backoff=0)],
+                            log_path=str(tmp_path / 'log.txt'), alert=alerts.alert)
+        with pytest.raises(PipelineError):
+            pipeline.run()
+
+    (subject, body, entries), = sink.sent
+    assert [(e.key, e.count) for e in entries] == [('retry:write', 2), ('failure:write', 1)]
@@ -1,5 +1,6 @@
 # STEP 1: Imports & Setup
 # ──────────────────────────────────────────────────────────────────────────────
+import json
 import pytest
 import pandas as pd
 from app import app  # Assumes a Flask app object named 'app'
@@ -59,4 +60,219 @@ def test_time_to_hire_calculation():
     df['hire_date'] = pd.to_datetime(df['hire_date'])
     df['time_to_hire_days'] = (df['hire_date'] - df['applied_date']).dt.days
 
-    assert df['time_to_hire_days'][0] == 14
\ No newline at end of file
+    assert df['time_to_hire_days'][0] == 14
+
+# STEP 7: Keyset Pagination — /applicants and /hires on a seeded database
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def seeded_client(tmp_path, monkeypatch):
+    import sqlite3
+    import app as app_module
+    import transform
+
+    db_path = str(tmp_path / 'hris.db')
+    conn = sqlite3.connect(db_path)
+    pd.DataFrame({
+        'name': [f'Person {i}' for i in range(25)],
+        'role': ['Editor' if i % 2 else 'Engineer' for i in range(25)],
+        'application_date': [f'2024-01-{i % 10 + 1:02d} 00:00:00' for i in range(25)],
+        'status': ['hired'] * 25,
+    }).to_sql('applicants', conn, index=False)
+    pd.DataFrame({
+        'name': [f'Person {i}' for i in range(25)],
+        'hire_date': [f'2024-03-{i % 10 + 1:02d} 00:00:00' for i in range(25)],
+        'end_date': [None] * 25,
+        'department': ['Sales' if i % 3 else 'Marketing' for i in range(25)],
+    }).to_sql('employees', conn, index=False)
+    conn.close()
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', db_path)
+    monkeypatch.setattr(app_module, 'DB_PATH', db_path)
+    transform.create_views()
+    with app.test_client() as client:
+        yield client
+
+
+def test_applicants_keyset_pages_cover_every_row_once(seeded_client):
+    names, cursor = [], ''
+    while True:
+        payload = seeded_client.get(f"/applicants?limit=7&cursor={cursor}").get_json()
+        names += [row['name'] for row in payload['data']]
+        cursor = payload['next_cursor']
+        if not cursor:
+            break
+    assert sorted(names) == sorted(f'Person {i}' for i in range(25))
+
+
+def test_hires_pages_against_a_views_mode_build(seeded_client):
+    import transform
+    transform.create_views(materialize=False)  # time_to_hire as a VIEW: it has no rowid
+
+    names, cursor = [], ''
+    while True:
+        payload = seeded_client.get(f"/hires?limit=4&cursor={cursor}").get_json()
+        names += [row['name'] for row in payload['data']]
+        cursor = payload['next_cursor']
+        if not cursor:
+            break
+    assert sorted(names) == sorted(f'person {i}' for i in range(25))
+
+
+def test_hires_pages_past_applicants_matched_to_same_named_employees(seeded_client):
+    import sqlite3
+    import transform
+    with sqlite3.connect(transform.DB_PATH) as conn:  # A second 'Person 0', hired the same day
+        conn.execute("INSERT INTO employees (name, hire_date, department) "
+                     "SELECT name, hire_date, 'Sales' FROM employees WHERE name = 'Person 0'")
+    transform.create_views()
+
+    departments, cursor = [], ''
+    while True:
+        payload = seeded_client.get(f"/hires?limit=1&to=2024-03-01&cursor={cursor}").get_json()
+        departments += [row['department'] for row in payload['data'] if row['name'] == 'person 0']
+        cursor = payload['next_cursor']
+        if not cursor:
+            break
+    assert sorted(departments) == ['Marketing', 'Sales']
+
+
+def test_hires_ndjson_with_filters(seeded_client):
+    response = seeded_client.get("/hires?format=ndjson&department=marketing&role=Engineer&to=2024-03-05")
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    rows, trailer = lines[:-1], lines[-1]
+    assert rows and all(r['department'] == 'Marketing' and r['hire_date'] < '2024-03-06' for r in rows)
+    assert trailer == {"next_cursor": None}
+
+
+def test_listing_rejects_bad_parameters(seeded_client):
+    assert seeded_client.get("/applicants?cursor=not-a-cursor").status_code == 400
+    assert seeded_client.get("/applicants?limit=0").status_code == 400
+    assert seeded_client.get("/applicants?from=yesterday").status_code == 400
+
+
+def test_hiring_metrics_filters_and_group_by(seeded_client):
+    payload = seeded_client.get("/hiring-metrics").get_json()
+    by_department = {row['department']: row for row in payload['data']}
+    assert set(by_department) == {'Marketing', 'Sales'}
+    assert sum(row['hires'] for row in payload['data']) == 25
+
+    marketing = seeded_client.get("/hiring-metrics?department=marketing&role=Engineer").get_json()['data']
+    assert marketing == [{'department': 'Marketing', 'hires': 5, 'avg_time_to_hire': 60.0,
+                          'min_time_to_hire': 60.0, 'max_time_to_hire': 60.0}]
+
+    months = seeded_client.get("/hiring-metrics?group_by=month,role&from=2024-03&to=2024-03-31").get_json()
+    assert [(row['month'], row['role']) for row in months['data']] == [('2024-03', 'Editor'), ('2024-03', 'Engineer')]
+    assert seeded_client.get("/hiring-metrics?from=2024-04").get_json()['data'] == []
+
+    assert seeded_client.get("/hiring-metrics?group_by=salary").status_code == 400
+    assert seeded_client.get("/hiring-metrics?to=March").status_code == 400
+
+
+def test_hiring_distribution_percentiles_and_filters(seeded_client):
+    payload = seeded_client.get("/hiring-metrics/distribution?percentiles=0,50,100&bins=4").get_json()
+    sales = next(row for row in payload['data'] if row['department'] == 'Sales')
+    assert sales['hires'] == 16
+    assert sales['percentiles'] == {'p0': 60.0, 'p50': 60.0, 'p100': 60.0}
+    assert sum(sales['histogram']['counts']) == 16 and len(sales['histogram']['edges']) == 5
+    assert sales['outliers']['above'] == sales['outliers']['below'] == 0
+
+    filtered = seeded_client.get("/hiring-metrics/distribution?department=marketing&role=Engineer").get_json()
+    assert [(row['department'], row['hires']) for row in filtered['data']] == [('Marketing', 5)]
+    assert seeded_client.get("/hiring-metrics/distribution?from=2024-04").get_json()['data'] == []
+    assert seeded_client.get("/hiring-metrics/distribution?percentiles=150").status_code == 400
+    assert seeded_client.get("/hiring-metrics/distribution?bins=zero").status_code == 400
+
+
+def test_employee_tenure_by_date_and_range(seeded_client):
+    payload = seeded_client.get("/employees/tenure?on=2024-03-05").get_json()
+    assert payload['on'] == '2024-03-05' and payload['count'] == 15
+    assert {row['department']: row['active'] for row in payload['departments']} == {'Marketing': 5, 'Sales': 10}
+
+    marketing = seeded_client.get("/employees/tenure?on=2024-03-05&department=marketing&limit=2").get_json()
+    assert marketing['count'] == 5 and len(marketing['data']) == 2
+    assert seeded_client.get("/employees/tenure?on=2024-06-01&min_months=4").get_json()['count'] == 0
+    assert seeded_client.get("/employees/tenure?on=2024-03-31").get_json()['count'] == 25
+    assert seeded_client.get("/employees/tenure?on=March").status_code == 400
+    assert seeded_client.get("/employees/tenure?max_months=-1").status_code == 400
+
+
+def test_headcount_series_by_period_and_department(seeded_client):
+    months = seeded_client.get("/headcount").get_json()['data']
+    assert months == [{'month': '2024-03', 'hires': 25, 'terminations': 0, 'headcount': 25,
+                       'attrition_rate': 0.0}]
+
+    days = seeded_client.get("/headcount?freq=day&group_by=department&department=marketing&to=2024-03-02").get_json()
+    assert [(row['department'], row['day'], row['headcount']) for row in days['data']] == [
+        ('Marketing', '2024-03-01', 1), ('Marketing', '2024-03-02', 2)]
+    assert seeded_client.get("/headcount?freq=week").status_code == 400
+    assert seeded_client.get("/headcount?group_by=role").status_code == 400
+
+
+def test_metrics_batch_dedups_and_reports_per_entry_errors(seeded_client):
+    payload = seeded_client.post("/metrics/batch", json={"requests": [
+        {"id": "all", "metric": "hiring-metrics"},
+        {"id": "marketing", "metric": "hiring-metrics", "params": {"department": "Marketing"}},
+        {"id": "marketing-again", "metric": "hiring-metrics", "params": {"department": " marketing "}},
+        {"metric": "status-summary", "params": {"status": "hired"}},
+        {"id": "bad", "metric": "headcount", "params": {"freq": "week"}},
+    ]}).get_json()
+
+    assert payload['count'] == 5 and payload['executed'] == 3
+    results = {entry['id']: entry for entry in payload['results']}
+    assert results['marketing']['data'] == results['marketing-again']['data']
+    assert results['marketing']['data'][0]['hires'] == 9
+    assert results[3]['data'] == [{'status': 'hired', 'count': 25}]
+    assert results['bad']['status'] == 400 and 'freq' in results['bad']['error']
+    assert seeded_client.post("/metrics/batch", json={"requests": [{"metric": "salaries"}]}).status_code == 400
+    assert seeded_client.post("/metrics/batch", data="not json").status_code == 400
+
+
+def test_metrics_batch_reads_one_snapshot(seeded_client, monkeypatch):
+    import sqlite3
+    import app as app_module
+    import metrics
+
+    fetch = metrics.timed_fetchall
+    calls = []
+
+    def fetch_then_rebuild(conn, label, query, params=()):
+        rows = fetch(conn, label, query, params)
+        if not calls:  # A pipeline commit lands between the batch's statements
+            writer = sqlite3.connect(app_module.DB_PATH)
+            writer.execute("UPDATE status_summary SET count = 0")
+            writer.execute("UPDATE data_generation SET generation = generation + 1")
+            writer.commit()
+            writer.close()
+        calls.append(label)
+        return rows
+
+    monkeypatch.setattr(metrics, 'timed_fetchall', fetch_then_rebuild)
+    before = seeded_client.post("/metrics/batch", json={"requests": [
+        {"metric": "hiring-metrics"}, {"metric": "status-summary"}]}).get_json()
+    after = seeded_client.post("/metrics/batch", json={"requests": [{"metric": "status-summary"}]}).get_json()
+
+    assert before['results'][1]['data'] == [{'status': 'hired', 'count': 25}]
+    assert after['results'][0]['data'] == [{'status': 'hired', 'count': 0}]
+    assert after['generation'] == before['generation'] + 1
+
+
+# STEP 8: Instrumentation — /metrics
+# ──────────────────────────────────────────────────────────────────────────────
+def test_metrics_endpoint_reports_requests_queries_and_stages(seeded_client, monkeypatch):
+    import metrics
+    monkeypatch.setattr(metrics, 'SLOW_QUERY_MS', 0)  # Log every statement
+
+    seeded_client.get("/hiring-metrics")
+    seeded_client.get("/applicants?limit=5")
+    response = seeded_client.get("/metrics")
+    body = response.get_data(as_text=True)
+
+    assert response.mimetype == 'text/plain'
+    assert 'hris_http_request_duration_seconds_count{endpoint="/hiring-metrics",method="GET",status="200"}' in body
+    assert 'hris_sql_query_duration_seconds_bucket{statement="list_applicants",le="+Inf"}' in body
+    assert 'hris_response_cache_hit_ratio' in body
+    assert 'hris_pipeline_stage_duration_seconds{stage="build_views"}' in body
+    with open(metrics.SLOW_QUERY_LOG_PATH, encoding='utf-8') as log:
+        assert '[hiring_metrics]' in log.read()
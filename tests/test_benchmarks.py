@@ -0,0 +1,29 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_benchmarks.py — Smoke Test for the Synthetic Benchmark Suite
+# Keeps benchmarks/ runnable as the pipeline evolves
+# ──────────────────────────────────────────────────────────────────────────────
+
+import data_loader
+from benchmarks.run_benchmarks import API_ENDPOINTS, bench_scale
+from benchmarks.synthetic_data import generate
+
+
+def test_generator_injects_noise():
+    employees, applicants, _ = generate(2000, seed=1)
+    assert applicants.duplicated().any()
+    assert (employees['Name'] != employees['Name'].str.strip()).any()
+    assert applicants['Status'].isna().any()
+
+
+def test_bench_scale_reports_every_stage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_loader, 'EXCEL_PATH', data_loader.EXCEL_PATH)
+
+    result = bench_scale(300, str(tmp_path / 'bench'), api_iterations=2)
+
+    for stage in ('load_excel_data', 'clean_dataframes', 'write_to_sqlite',
+                  'create_views', 'log_invalid_hires', 'stream_load', 'dq_per_rule_sql', 'dq_engine_total'):
+        assert stage in result['timings_s']
+    assert all(counts['engine'] == counts['per_rule_sql'] for counts in result['dq_violations'].values())
+    assert set(result['api']) == set(API_ENDPOINTS)
+    assert all(r['status'] == 200 for r in result['api'].values())
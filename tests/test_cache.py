@@ -0,0 +1,29 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_cache.py — Response Cache Tests
+# LRU bounds, generation invalidation and query-parameter normalization
+# ──────────────────────────────────────────────────────────────────────────────
+
+from werkzeug.datastructures import MultiDict
+from cache import ResponseCache, normalize_params
+
+
+def test_normalize_params_is_order_and_case_insensitive_where_asked():
+    a = normalize_params(MultiDict([('status', ' Hired'), ('page', '2')]), casefold=('status',))
+    b = normalize_params(MultiDict([('page', '2'), ('status', 'hired')]), casefold=('status',))
+    assert a == b == (('page', '2'), ('status', 'hired'))
+
+
+def test_lru_eviction_and_generation_invalidation():
+    cache = ResponseCache(max_entries=2)
+    for key in ('a', 'b'):
+        assert cache.get(key, generation=1) is None
+        cache.put(key, 1, key.encode(), 'application/json')
+
+    assert cache.get('a', 1).body == b'a'        # 'a' is now most recently used
+    cache.get('c', 1)
+    cache.put('c', 1, b'c', 'application/json')  # evicts 'b'
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) is not None
+
+    assert cache.get('a', 2) is None             # new generation drops everything
+    assert len(cache) == 0
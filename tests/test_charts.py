@@ -0,0 +1,69 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_charts.py — Chart Pipeline Tests
+# Incremental skip of unchanged charts in generate_charts.generate_charts,
+# and the headcount chart over the headcount_daily sweep table
+# ──────────────────────────────────────────────────────────────────────────────
+
+import sqlite3
+import pandas as pd
+import generate_charts
+import headcount
+
+
+def test_unchanged_charts_are_skipped(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'hris.db')
+    conn = sqlite3.connect(db_path)
+    pd.DataFrame({'role': ['Editor', 'Editor', 'Engineer'],
+                  'status': ['hired', 'rejected', 'hired']}).to_sql('applicants', conn, index=False)
+    conn.close()
+
+    monkeypatch.setattr(generate_charts, 'DB_PATH', db_path)
+    monkeypatch.setattr(generate_charts, 'OUTPUT_FOLDER', str(tmp_path / 'visuals'))
+    monkeypatch.setattr(generate_charts, 'MANIFEST_PATH', str(tmp_path / 'visuals' / 'manifest.json'))
+    monkeypatch.setattr(generate_charts, 'RENDER_POOL_MIN', 2)  # Exercise the process pool
+    specs = [spec for spec in generate_charts.CHARTS if 'FROM applicants' in spec.query]
+
+    assert len(generate_charts.generate_charts(specs, max_workers=2)) == 2
+    assert generate_charts.generate_charts(specs, max_workers=2) == []
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO applicants VALUES ('Producer', 'applied')")
+    conn.commit()
+    conn.close()
+    assert len(generate_charts.generate_charts(specs, max_workers=1)) == 2
+
+
+
+def test_few_stale_charts_render_in_process(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'hris.db')
+    conn = sqlite3.connect(db_path)
+    pd.DataFrame({'role': ['Editor'], 'status': ['hired']}).to_sql('applicants', conn, index=False)
+    conn.close()
+
+    monkeypatch.setattr(generate_charts, 'DB_PATH', db_path)
+    monkeypatch.setattr(generate_charts, 'OUTPUT_FOLDER', str(tmp_path / 'visuals'))
+    monkeypatch.setattr(generate_charts, 'MANIFEST_PATH', str(tmp_path / 'visuals' / 'manifest.json'))
+    monkeypatch.setattr(generate_charts, 'ProcessPoolExecutor', None)  # Any pool would fail
+    specs = [spec for spec in generate_charts.CHARTS if 'FROM applicants' in spec.query]
+
+    assert len(generate_charts.generate_charts(specs, max_workers=8)) == 2
+
+def test_headcount_chart_renders_month_end_series(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'hris.db')
+    conn = sqlite3.connect(db_path)
+    pd.DataFrame({'department': ['Sales', 'Sales', 'HR'],
+                  'hire_date': ['2024-01-15 00:00:00', '2024-02-01 00:00:00', '2024-01-01 00:00:00'],
+                  'end_date': ['2024-02-10 00:00:00', None, None]}).to_sql('employees', conn, index=False)
+    headcount.build_table(conn.cursor())
+    conn.commit()
+
+    months = generate_charts.fetch_headcount(conn)
+    conn.close()
+    assert months[['department', 'month', 'headcount']].values.tolist() == [
+        ['HR', '2024-01', 1], ['Sales', '2024-01', 1], ['HR', '2024-02', 1], ['Sales', '2024-02', 1]]
+
+    monkeypatch.setattr(generate_charts, 'DB_PATH', db_path)
+    monkeypatch.setattr(generate_charts, 'OUTPUT_FOLDER', str(tmp_path / 'visuals'))
+    monkeypatch.setattr(generate_charts, 'MANIFEST_PATH', str(tmp_path / 'visuals' / 'manifest.json'))
+    specs = [spec for spec in generate_charts.CHARTS if spec.name == 'headcount']
+    assert generate_charts.generate_charts(specs, max_workers=1) == [str(tmp_path / 'visuals' / 'headcount_by_department.png')]
@@ -0,0 +1,247 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_data_loader.py — Ingestion Tests for data_loader.py
+# Runs the write paths against a temporary SQLite file
+# ──────────────────────────────────────────────────────────────────────────────
+
+import os
+import sqlite3
+import pandas as pd
+import pytest
+import data_loader
+
+# ───────────────────────────── Fixtures ─────────────────────────────
+@pytest.fixture
+def frames():
+    employees = pd.DataFrame({
+        'name': ['Jane Smith', 'Omar Khan'],
+        'department': ['Marketing', 'Engineering'],
+        'hire_date': pd.to_datetime(['2024-02-01', '2024-01-01']),
+        'end_date': pd.to_datetime([None, '2024-06-30']),
+    })
+    applicants = pd.DataFrame({
+        'name': ['Jane Smith', 'Omar Khan', 'Zoe Lee'],
+        'role': ['Editor', 'Engineer', 'Producer'],
+        'application_date': pd.to_datetime(['2024-01-01', '2023-12-01', '2024-03-01']),
+        'status': ['hired', 'hired', 'rejected'],
+    })
+    employment_types = pd.DataFrame({'employment_type': ['Full-Time', 'Contractor']})
+    return employees, applicants, employment_types
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'hris.db')
+    monkeypatch.chdir(tmp_path)  # Stage timings land in tmp_path/logs
+    monkeypatch.setattr(data_loader, 'DB_PATH', path)
+    return path
+
+
+def fetch(path, query):
+    conn = sqlite3.connect(path)
+    rows = conn.execute(query).fetchall()
+    conn.close()
+    return rows
+
+# ───────────────────────────── Incremental Mode ─────────────────────────────
+def test_incremental_skips_unchanged_sheets(db_path, frames, capsys):
+    data_loader.write_incremental(*frames)
+    data_loader.write_incremental(*frames)
+
+    out = capsys.readouterr().out
+    assert out.count('unchanged, skipped') == 3
+    assert fetch(db_path, "SELECT COUNT(*) FROM applicants") == [(3,)]
+
+
+def test_incremental_upserts_and_deletes_changed_rows(db_path, frames):
+    employees, applicants, employment_types = frames
+    data_loader.write_incremental(employees, applicants, employment_types)
+
+    applicants = applicants.copy()
+    applicants.loc[2, 'status'] = 'interviewing'          # changed row
+    applicants = applicants.drop(index=0)                  # removed row
+    applicants.loc[3] = ['Ian Brown', 'Analyst', pd.Timestamp('2024-04-01'), 'applied']  # new row
+    data_loader.write_incremental(employees, applicants, employment_types)
+
+    rows = fetch(db_path, "SELECT name, status FROM applicants ORDER BY name")
+    assert rows == [('Ian Brown', 'applied'), ('Omar Khan', 'hired'), ('Zoe Lee', 'interviewing')]
+    assert fetch(db_path, "SELECT COUNT(*) FROM ingest_row_hashes WHERE table_name = 'applicants'") == [(3,)]
+
+
+def test_incremental_publishes_views_and_skips_publishing_when_unchanged(db_path, frames):
+    data_loader.write_incremental(*frames)
+    generation = fetch(db_path, "SELECT generation FROM data_generation")
+    assert fetch(db_path, "SELECT name FROM time_to_hire ORDER BY name") == [('jane smith',), ('omar khan',)]
+
+    data_loader.write_incremental(*frames)
+    assert fetch(db_path, "SELECT generation FROM data_generation") == generation  # Not rebuilt
+
+    employees, applicants, employment_types = frames
+    data_loader.write_incremental(employees, applicants.drop(index=0), employment_types)
+    assert fetch(db_path, "SELECT name FROM time_to_hire") == [('omar khan',)]
+    assert fetch(db_path, "SELECT generation FROM data_generation") != generation
+
+# ───────────────────────────── Clean Stage ─────────────────────────────
+def test_clean_dedups_in_one_pass_with_compact_dtypes(db_path, tmp_path):
+    employees = pd.DataFrame({
+        'name': ['Jane Smith', 'Jane Smith', 'Omar Khan'],
+        'department': ['Marketing', 'Marketing', 'Engineering'],
+        'start_date': ['2024-02-01', '2024-02-01', '2024-01-01'],
+        'end_date': [None, None, None],
+    })
+    applicants = pd.DataFrame({
+        'name': ['Zoe Lee', 'Zoe Lee'],
+        'role': ['Producer', 'Producer'],
+        'application_date': ['2024-03-01', '2024-03-01'],
+        'status': [None, None],
+    })
+    employment_types = pd.DataFrame({'employment_type': ['Full-Time', 'Full-Time', 'Contractor']})
+
+    employees, applicants, employment_types = data_loader.clean_dataframes(employees, applicants, employment_types)
+
+    assert list(employees['name']) == ['Jane Smith', 'Omar Khan']
+    assert len(applicants) == 1 and applicants['status'].iloc[0] == 'unknown'
+    assert len(employment_types) == 2
+    assert employees['department'].dtype == 'category' and applicants['status'].dtype == 'category'
+    assert pd.api.types.is_datetime64_any_dtype(employees['start_date'])
+    assert len(pd.read_csv(tmp_path / 'logs' / 'dropped_applicants.csv')) == 1
+
+    data_loader.write_to_sqlite(employees, applicants, employment_types)
+    assert fetch(db_path, "SELECT department FROM employees ORDER BY name") == [('Marketing',), ('Engineering',)]
+
+
+def test_split_duplicates_returns_duplicate_free_frames_as_is(tmp_path):
+    df = pd.DataFrame({'employment_type': ['Full-Time', 'Contractor']})
+    kept, dropped = data_loader.split_duplicates(df, ['employment_type'], str(tmp_path / 'dropped.csv'))
+
+    assert kept is df and dropped == 0
+    assert list(pd.read_csv(tmp_path / 'dropped.csv').columns) == ['employment_type']
+
+# ───────────────────────────── Bulk Write ─────────────────────────────
+def test_bulk_write_matches_to_sql_and_swaps_atomically(db_path, frames, tmp_path):
+    reader = sqlite3.connect(db_path)  # Open on the old file across the swap
+    reader.execute("CREATE TABLE stale (x)")
+    reader.commit()
+
+    data_loader.write_to_sqlite(*frames)
+
+    assert reader.execute("SELECT name FROM sqlite_master").fetchall() == [('stale',)]
+    reader.close()
+    reference = sqlite3.connect(':memory:')
+    for table, df in zip(('employees', 'applicants', 'employment_types'), frames):
+        df.to_sql(table, reference, index=False)
+        query = f"SELECT {', '.join(df.columns)} FROM {table} ORDER BY rowid"  # Plus transform's name_key
+        assert fetch(db_path, query) == reference.execute(query).fetchall()
+        assert ([row[1:3] for row in fetch(db_path, f"PRAGMA table_info({table})")][:len(df.columns)]
+                == [row[1:3] for row in reference.execute(f"PRAGMA table_info({table})")])
+    assert fetch(db_path, "SELECT name FROM sqlite_master WHERE name = 'idx_applicants_key'") == [('idx_applicants_key',)]
+    assert not list(tmp_path.glob('.hris-build-*'))
+
+
+def test_bulk_write_publishes_views_and_generation_together(db_path, frames):
+    data_loader.write_to_sqlite(*frames)
+
+    assert fetch(db_path, "SELECT name, department FROM time_to_hire ORDER BY name") == [
+        ('jane smith', 'Marketing'), ('omar khan', 'Engineering')]
+    assert fetch(db_path, "SELECT COUNT(*) FROM hiring_rollup") == [(2,)]
+    assert fetch(db_path, "SELECT COUNT(*) FROM data_generation") == [(1,)]
+    assert fetch(db_path, "PRAGMA journal_mode") == [('delete',)]
+
+
+def test_bulk_write_copies_into_a_wal_database_instead_of_renaming(db_path, frames):
+    live = sqlite3.connect(db_path)
+    live.execute("PRAGMA journal_mode = WAL")
+    live.execute("CREATE TABLE stale (x)")
+    live.commit()
+    reader = sqlite3.connect(db_path)  # A pooled API connection, open across the publish
+    assert reader.execute("SELECT COUNT(*) FROM stale").fetchone() == (0,)
+    inode = os.stat(db_path).st_ino
+
+    data_loader.write_to_sqlite(*frames)
+
+    assert os.stat(db_path).st_ino == inode
+    assert reader.execute("SELECT COUNT(*) FROM time_to_hire").fetchone() == (2,)  # Same file, new data
+    assert reader.execute("PRAGMA integrity_check").fetchone() == ('ok',)
+    assert fetch(db_path, "PRAGMA journal_mode") == [('wal',)]
+    assert fetch(db_path, "SELECT name FROM sqlite_master WHERE name = 'stale'") == []
+    reader.close()
+    live.close()
+
+# ───────────────────────────── Streaming Mode ─────────────────────────────
+def test_stream_load_dedups_across_chunk_boundaries(db_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / 'exports'
+    source.mkdir()
+    pd.DataFrame({
+        'Name': ['Jane Smith', 'Omar Khan', 'Jane Smith'],
+        'Department': ['Marketing', 'Engineering', 'Marketing'],
+        'Start Date': ['2024-02-01', '2024-01-01', '2024-02-01'],
+        'End Date': [None, None, None],
+    }).to_csv(source / 'Employees.csv', index=False)
+    pd.DataFrame({
+        'Name': ['Jane Smith', 'Zoe Lee', 'Zoe Lee', 'Ian Brown'],
+        'Role': ['Editor', 'Producer', 'Producer', 'Analyst'],
+        'Application Date': ['2024-01-01', '2024-03-01', '2024-03-01', '2024-04-01'],
+        'Status': ['hired', None, None, 'applied'],
+    }).to_csv(source / 'Applicants.csv', index=False)
+    pd.DataFrame({'Employment Type': ['Full-Time', 'Full-Time']}).to_csv(source / 'EmploymentType.csv', index=False)
+
+    data_loader.stream_load(str(source), chunksize=2)
+
+    assert fetch(db_path, "SELECT COUNT(*) FROM employees") == [(2,)]
+    assert fetch(db_path, "SELECT name, status FROM applicants ORDER BY name") == [
+        ('Ian Brown', 'applied'), ('Jane Smith', 'hired'), ('Zoe Lee', 'unknown')]
+    assert fetch(db_path, "SELECT COUNT(*) FROM employment_types") == [(1,)]
+    assert len(pd.read_csv(tmp_path / 'logs' / 'dropped_employees.csv')) == 1
+
+
+def test_stream_load_dedups_keys_whatever_dtype_each_chunk_infers(db_path, tmp_path):
+    source = tmp_path / 'exports'
+    source.mkdir()
+    pd.DataFrame({'Name': ['Jane Smith'], 'Department': ['Marketing'],
+                  'Start Date': ['2024-02-01'], 'End Date': [None]}).to_csv(source / 'Employees.csv', index=False)
+    # Chunk 1 reads Role as text, chunk 2 (no roles at all) as float NaN
+    pd.DataFrame({
+        'Name': ['Zoe Lee', 'Ian Brown', 'Zoe Lee', 'Kim Park'],
+        'Role': [None, 'Analyst', None, None],
+        'Application Date': ['2024-03-01', '2024-04-01', '2024-03-01', '2024-05-01'],
+        'Status': ['applied'] * 4,
+    }).to_csv(source / 'Applicants.csv', index=False)
+    pd.DataFrame({'Employment Type': ['Full-Time']}).to_csv(source / 'EmploymentType.csv', index=False)
+
+    data_loader.stream_load(str(source), chunksize=2)
+
+    assert fetch(db_path, "SELECT name FROM applicants ORDER BY name") == [
+        ('Ian Brown',), ('Kim Park',), ('Zoe Lee',)]
+    # Published complete, views included, with no build file left behind
+    assert fetch(db_path, "SELECT COUNT(*) FROM sqlite_master WHERE name = 'time_to_hire'") == [(1,)]
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.hris-build-')] == []
+
+
+def test_stream_load_sqlite_memory_stays_flat_as_chunks_grow(db_path, tmp_path, monkeypatch):
+    import ctypes
+    import _sqlite3
+    try:
+        highwater = ctypes.CDLL(_sqlite3.__file__).sqlite3_memory_highwater
+    except (OSError, AttributeError):
+        pytest.skip("SQLite memory statistics are not reachable from this build")
+    highwater.restype, highwater.argtypes = ctypes.c_int64, [ctypes.c_int]
+    monkeypatch.setattr(data_loader, 'STREAM_CACHE_KIB', 64)
+    # Views read whole tables by design; this measures the chunked ingest only
+    monkeypatch.setattr(data_loader.transform, 'build_views', lambda conn: None)
+
+    def peak(rows):
+        source = tmp_path / f'exports_{rows}'
+        source.mkdir()
+        pd.DataFrame({'Name': [f'Person {i}' for i in range(rows)], 'Department': ['Sales'] * rows,
+                      'Start Date': ['2024-01-01'] * rows, 'End Date': [None] * rows,
+                      }).to_csv(source / 'Employees.csv', index=False)
+        pd.DataFrame({'Name': [f'Applicant {i}' for i in range(rows)], 'Role': ['Editor'] * rows,
+                      'Application Date': ['2024-01-01'] * rows, 'Status': ['applied'] * rows,
+                      }).to_csv(source / 'Applicants.csv', index=False)
+        pd.DataFrame({'Employment Type': ['Full-Time']}).to_csv(source / 'EmploymentType.csv', index=False)
+        highwater(1)
+        data_loader.stream_load(str(source), chunksize=500)
+        return highwater(1)
+
+    few, many = peak(4_000), peak(32_000)  # 8 vs 64 chunks per sheet
+    assert many < few * 1.25
@@ -0,0 +1,110 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_db.py — API Connection Layer Tests
+# Verifies pooled read-only connections and reconnect-on-publish behaviour
+# ──────────────────────────────────────────────────────────────────────────────
+
+import os
+import sqlite3
+import threading
+import pytest
+import db
+
+
+def make_db(path, value):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (v INTEGER)")
+    conn.execute("INSERT INTO t VALUES (?)", (value,))
+    conn.commit()
+    conn.close()
+
+
+def test_connections_are_pooled_and_read_only(tmp_path):
+    path = str(tmp_path / 'hris.db')
+    make_db(path, 1)
+
+    conn = db.get_connection(path)
+    assert db.get_connection(path) is conn
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO t VALUES (2)")
+    db.discard_connection(path)
+
+
+def test_reconnects_when_database_file_is_replaced(tmp_path):
+    path = str(tmp_path / 'hris.db')
+    make_db(path, 1)
+    assert db.get_connection(path).execute("SELECT v FROM t").fetchone() == (1,)
+
+    staged = str(tmp_path / 'staged.db')
+    make_db(staged, 2)
+    os.replace(staged, path)
+
+    assert db.get_connection(path).execute("SELECT v FROM t").fetchone() == (2,)
+    db.discard_connection(path)
+
+
+def test_connections_of_exited_threads_are_closed(tmp_path):
+    path = str(tmp_path / 'hris.db')
+    make_db(path, 1)
+
+    def request():  # One thread per request, as under app.run() or the threaded fallback
+        db.get_connection(path).execute("SELECT v FROM t").fetchone()
+
+    for _ in range(200):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+    db.get_connection(path)  # The next connection opened sweeps up the finished threads'
+
+    assert all(owner.is_alive() for owner in db._open_connections.values())
+    db.discard_connection(path)
+
+# ───────────────────────────── In-Memory Mode ─────────────────────────────
+@pytest.fixture
+def memory_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, '_memory_paths', {})
+    monkeypatch.setattr(db, '_mirrors', {})
+    path = str(tmp_path / 'hris.db')
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")  # As transform.py leaves it
+    conn.execute("CREATE TABLE applicants (status TEXT)")
+    conn.execute("INSERT INTO applicants VALUES ('Hired')")
+    conn.execute("CREATE TABLE data_generation (generation INTEGER)")
+    conn.execute("INSERT INTO data_generation VALUES (1)")
+    conn.commit()
+    conn.close()
+    db.enable_memory_mode(path, interval=3600)  # Tests drive refresh() themselves
+    yield path
+    db.discard_connection(path)
+
+
+def publish(path, status, generation=None):
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE applicants SET status = ?", (status,))
+    if generation is not None:
+        conn.execute("UPDATE data_generation SET generation = ?", (generation,))
+    conn.commit()
+    conn.close()
+
+
+def test_memory_mode_serves_a_read_only_copy_with_api_indexes(memory_db):
+    conn = db.get_connection(memory_db)
+    assert conn.execute("SELECT status FROM applicants").fetchone() == ('Hired',)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'mem_applicants_status_lower'").fetchone()
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM applicants")
+
+    publish(memory_db, 'Rejected')  # Same generation: a loader mid-run, not yet servable
+    assert db.memory_mirror(memory_db).refresh() is False
+    assert db.get_connection(memory_db).execute("SELECT status FROM applicants").fetchone() == ('Hired',)
+
+
+def test_new_generation_is_swapped_in_without_disturbing_open_readers(memory_db):
+    old = db.get_connection(memory_db)
+    publish(memory_db, 'Rejected', generation=2)
+
+    assert db.memory_mirror(memory_db).refresh() is True
+    assert old.execute("SELECT status FROM applicants").fetchone() == ('Hired',)  # Still on its own copy
+    conn = db.get_connection(memory_db)
+    assert conn is not old
+    assert conn.execute("SELECT status FROM applicants").fetchone() == ('Rejected',)
+    assert db.read_generation(conn) == 2
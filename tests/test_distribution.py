@@ -0,0 +1,48 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_distribution.py — Time-to-Hire Distribution Store Tests
+# Presorted percentiles match numpy; filters, outliers and generation reloads
+# ──────────────────────────────────────────────────────────────────────────────
+
+import sqlite3
+import numpy as np
+import pandas as pd
+from distribution import TimeToHireDistribution, sorted_percentiles
+
+
+def _conn(days):
+    conn = sqlite3.connect(':memory:')
+    pd.DataFrame({
+        'department': ['Sales' if i % 2 else 'HR' for i in range(len(days))],
+        'role': ['Editor' if i % 4 < 2 else 'Writer' for i in range(len(days))],
+        'employment_type': ['Full-Time'] * len(days),
+        'hire_date': [f'2024-{i % 12 + 1:02d}-15 00:00:00' for i in range(len(days))],
+        'time_to_hire_days': days,
+    }).to_sql('time_to_hire', conn, index=False)
+    return conn
+
+
+def test_sorted_percentiles_match_numpy():
+    values = np.sort(np.random.default_rng(0).gamma(2.0, 20.0, 1001))
+    qs = [0, 12.5, 50, 90, 99, 100]
+    np.testing.assert_allclose(sorted_percentiles(values, qs), np.percentile(values, qs))
+
+
+def test_query_filters_outliers_and_reload():
+    days = [float(d) for d in range(1, 41)] + [500.0, 501.0]  # Two long-tail Sales hires
+    store = TimeToHireDistribution()
+    store.ensure(_conn(days), generation=1)
+
+    sales = store.query(department='SALES')[0]
+    sales_days = np.sort(days[1::2])
+    assert sales['hires'] == 21
+    assert sales['percentiles']['p50'] == round(float(np.percentile(sales_days, 50)), 1)
+    assert sales['outliers']['above'] == 1 and sales['outliers']['max'] == 501.0
+
+    editors = store.query(role='editor', month_from='2024-01', month_to='2024-06')
+    assert sum(row['hires'] for row in editors) == sum(
+        1 for i in range(len(days)) if i % 4 < 2 and i % 12 < 6)
+
+    store.ensure(_conn([5.0, 6.0]), generation=1)   # Same generation: arrays are kept
+    assert sum(row['hires'] for row in store.query()) == 42
+    store.ensure(_conn([5.0, 6.0]), generation=2)
+    assert sum(row['hires'] for row in store.query()) == 2
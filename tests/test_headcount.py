@@ -0,0 +1,39 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_headcount.py — Headcount Sweep Tests
+# The vectorized daily series matches a per-day count over the raw intervals
+# ──────────────────────────────────────────────────────────────────────────────
+
+import sqlite3
+import numpy as np
+import pandas as pd
+import headcount
+
+
+def test_sweep_matches_per_day_count():
+    rng = np.random.default_rng(3)
+    hires = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 400, 300), unit='D')
+    ends = pd.Series(hires + pd.to_timedelta(rng.integers(0, 200, 300), unit='D')).where(rng.random(300) < 0.5)
+    departments = rng.choice(['Sales', 'HR', None], 300)
+    series = headcount.daily_headcount(departments, hires, ends)
+
+    for department in ['Sales', 'HR', None]:
+        rows = series[series['department'].isna()] if department is None else series[series['department'] == department]
+        mine = departments == department
+        for day in pd.to_datetime(rows['date'].iloc[::37]):
+            row = rows[rows['date'] == day.strftime('%Y-%m-%d')].iloc[0]
+            active = mine & (hires <= day) & (ends.isna() | (ends >= day)).to_numpy()
+            assert row['headcount'] == active.sum()
+            assert row['hires'] == (mine & (hires == day)).sum()
+            assert row['terminations'] == (mine & (ends == day).to_numpy()).sum()
+    assert series['hires'].sum() == 300 and series['terminations'].sum() == ends.notna().sum()
+
+
+def test_build_table_skips_invalid_intervals():
+    conn = sqlite3.connect(':memory:')
+    pd.DataFrame({'department': ['Sales', 'Sales', 'HR'],
+                  'hire_date': ['2024-01-01 00:00:00', '2024-01-05 00:00:00', None],
+                  'end_date': ['2024-01-02 00:00:00', '2024-01-01 00:00:00', None]}).to_sql('employees', conn, index=False)
+
+    assert headcount.build_table(conn.cursor()) == 3
+    assert conn.execute("SELECT date, hires, terminations, headcount FROM headcount_daily").fetchall() == [
+        ('2024-01-01', 1, 0, 1), ('2024-01-02', 0, 1, 1), ('2024-01-03', 0, 0, 0)]
@@ -0,0 +1,44 @@
+import pytest
+import metrics
+
+
+def test_histogram_buckets_are_cumulative_and_labels_escaped():
+    histogram = metrics.Histogram('demo_seconds', 'Demo', labels=('endpoint',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, '/a"b')
+
+    text = metrics.render([histogram])
+    assert 'demo_seconds_bucket{endpoint="/a\\"b",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{endpoint="/a\\"b",le="1.0"} 3' in text
+    assert 'demo_seconds_bucket{endpoint="/a\\"b",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{endpoint="/a\\"b"} 4' in text
+
+
+def test_stage_timer_accumulates_and_persists(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'STAGE_TIMINGS_PATH', str(tmp_path / 'stages.json'))
+    timer = metrics.StageTimer()
+    for _ in range(3):
+        with timer('dedup'):
+            pass
+    timer.flush()
+
+    gauges = metrics.render(metrics.stage_gauges())
+    assert 'hris_pipeline_stage_duration_seconds{stage="dedup"}' in gauges
+
+
+def test_failed_stages_are_not_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'STAGE_TIMINGS_PATH', str(tmp_path / 'stages.json'))
+
+    @metrics.stage('parse')
+    def load():
+        raise FileNotFoundError('no workbook')
+
+    with pytest.raises(FileNotFoundError):
+        load()
+    timer = metrics.StageTimer()
+    with pytest.raises(ValueError):
+        with timer('dedup'):
+            raise ValueError('bad chunk')
+    timer.flush()
+
+    assert not (tmp_path / 'stages.json').exists()
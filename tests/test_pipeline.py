@@ -0,0 +1,86 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_pipeline.py — DAG Runner Tests
+# Dependency hand-off, concurrency, retries and graph validation
+# ──────────────────────────────────────────────────────────────────────────────
+
+import threading
+import pytest
+from pipeline import Pipeline, PipelineError, Step
+
+
+def test_results_flow_between_steps_and_siblings_run_concurrently(tmp_path):
+    barrier = threading.Barrier(2, timeout=5)  # Deadlocks unless both siblings run at once
+
+    def sibling(value):
+        barrier.wait()
+        return value * 2
+
+    results = Pipeline([
+        Step('source', lambda: 21),
+        Step('left', sibling, deps=['source']),
+        Step('right', sibling, deps=['source']),
+        Step('join', lambda a, b: a + b, deps=['left', 'right']),
+    ], log_path=str(tmp_path / 'log.txt')).run()
+
+    assert results['join'] == 84
+    assert (tmp_path / 'log.txt').read_text(encoding='utf-8').count('✅ Success') == 4
+
+
+def test_transient_failures_are_retried(tmp_path):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TimeoutError("busy")
+        return 'ok'
+
+    pipeline = Pipeline([Step('flaky', flaky, retries=2, retry_on=(TimeoutError,), backoff=0)],
+                        log_path=str(tmp_path / 'log.txt'))
+    assert pipeline.run() == {'flaky': 'ok'}
+    assert pipeline.timings['flaky']['attempts'] == 3
+
+
+def test_retry_if_filters_which_errors_are_retried(tmp_path):
+    calls = []
+
+    def fails(message):
+        calls.append(message)
+        raise OSError(message)
+
+    pipeline = Pipeline([Step('flaky', lambda: fails('busy' if len(calls) < 2 else 'disk full'), retries=5,
+                              retry_on=(OSError,), retry_if=lambda e: 'busy' in str(e), backoff=0)],
+                        log_path=str(tmp_path / 'log.txt'))
+    with pytest.raises(PipelineError, match='disk full'):
+        pipeline.run()
+    assert calls == ['busy', 'busy', 'disk full']
+
+
+def test_failure_stops_dependents(tmp_path):
+    ran = []
+    pipeline = Pipeline([
+        Step('boom', lambda: 1 / 0),
+        Step('after', lambda _: ran.append(1), deps=['boom']),
+    ], log_path=str(tmp_path / 'log.txt'))
+
+    with pytest.raises(PipelineError) as excinfo:
+        pipeline.run()
+    assert excinfo.value.step == 'boom' and not ran
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError):
+        Pipeline([Step('a', lambda _: 1, deps=['b']), Step('b', lambda _: 1, deps=['a'])])
+
+
+def test_memory_is_profiled_only_on_request(tmp_path):
+    import tracemalloc
+    steps = [Step('grow', lambda: len(bytearray(8 * 2 ** 20))), Step('after', lambda n: n, deps=['grow'])]
+
+    plain = Pipeline(steps, log_path=str(tmp_path / 'log.txt'))
+    plain.run()
+    assert 'peak_mb' not in plain.timings['grow'] and not tracemalloc.is_tracing()
+
+    profiled = Pipeline(steps, log_path=str(tmp_path / 'log.txt'), profile_memory=True)
+    profiled.run()
+    assert profiled.timings['grow']['peak_mb'] >= 8 and profiled.timings['after']['peak_mb'] < 1
@@ -0,0 +1,59 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_quality.py — Data-Quality Rule Engine Tests
+# Every built-in rule fires on a seeded database; results land in tables and CSVs
+# ──────────────────────────────────────────────────────────────────────────────
+
+import sqlite3
+import pandas as pd
+import quality
+import transform
+
+
+def test_rules_flag_each_violation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', str(tmp_path / 'hris.db'))
+    conn = sqlite3.connect(transform.DB_PATH)
+    pd.DataFrame({
+        'name': ['Ana Avila', 'Ben Brown', 'Cara Cole', 'Dev Das', 'Eli Egan'],
+        'hire_date': ['2024-02-01', '2024-01-01', '2024-05-01', '2026-01-10', None],
+        'end_date': [None, None, '2024-04-01', None, None],
+        'department': ['Sales', 'HR', 'Sales', 'HR', 'Finance'],
+    }).to_sql('employees', conn, index=False)
+    pd.DataFrame({
+        'name': ['Ana Avila', 'Ben Brown', 'Cara Cole', 'Dev Das', 'Fay Fox', 'Gus Gray'],
+        'role': ['Editor'] * 6,
+        'application_date': ['2024-01-01', '2024-02-01', '2024-03-01', '2024-01-01', '2024-01-01', '2024-01-01'],
+        'status': ['Hired', 'hired', 'Hired', 'Hired', 'Hird', 'unknown'],  # 'unknown' is the loader's fill
+    }).to_sql('applicants', conn, index=False)
+    conn.close()
+
+    transform.create_views()
+
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        summary = dict(conn.execute("SELECT rule, violations FROM dq_summary").fetchall())
+        orphans = conn.execute("SELECT name FROM dq_orphan_hire").fetchall()
+    assert summary == {'hire_before_application': 1, 'implausible_time_to_hire': 1, 'end_before_start': 1,
+                       'missing_hire_date': 1, 'orphan_hire': 1, 'unknown_status': 1}
+    assert orphans == [('Eli Egan',)]
+
+    invalid = pd.read_csv(tmp_path / 'logs' / 'invalid_hires.csv')
+    assert invalid[['name', 'error_reason']].values.tolist() == [['Ben Brown', 'Hire date precedes application date']]
+    assert (tmp_path / quality.DQ_LOG_DIR / 'summary.csv').exists()
+    assert pd.read_csv(tmp_path / quality.DQ_LOG_DIR / 'unknown_status.csv')['status'].tolist() == ['Hird']
+
+
+def test_rules_without_violations_leave_no_stale_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE applicants (name, role, status, application_date)")
+    conn.execute("INSERT INTO applicants VALUES ('Ana Avila', 'Editor', 'Hird', '2024-01-01')")
+    rules = [rule for rule in quality.RULES if rule.scope == 'applicant']
+    quality.run_checks(conn, rules)
+    assert (tmp_path / quality.DQ_LOG_DIR / 'unknown_status.csv').exists()
+
+    conn.execute("UPDATE applicants SET status = 'hired'")
+    violations, summary = quality.run_checks(conn, rules)
+
+    assert violations['unknown_status'].empty and summary['violations'].tolist() == [0]
+    assert not (tmp_path / quality.DQ_LOG_DIR / 'unknown_status.csv').exists()
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'dq_unknown_status'").fetchone() is None
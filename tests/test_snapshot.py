@@ -0,0 +1,49 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_snapshot.py — Columnar Snapshot Tests
+# Publish from a built database, read back typed and memory-mapped, prune
+# ──────────────────────────────────────────────────────────────────────────────
+
+import os
+import sqlite3
+import pandas as pd
+import pyarrow as pa
+import snapshot
+import transform
+from test_transform import _seed_db
+
+
+def test_publish_and_read_back(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', str(tmp_path / 'hris.db'))
+    _seed_db(transform.DB_PATH)
+    transform.create_views(log_errors=False, snapshot=True)
+
+    version = snapshot.current_version()
+    manifest = snapshot.load_manifest()
+    assert manifest['generation'] == int(version)
+    assert {t: e['rows'] for t, e in manifest['tables'].items()} == \
+        {'employees': 3, 'applicants': 4, 'time_to_hire': 2}
+
+    hires = snapshot.open_table('time_to_hire', columns=['name', 'hire_date', 'time_to_hire_days'])
+    assert hires.schema.field('hire_date').type == pa.timestamp('ns')
+    assert hires.column('time_to_hire_days').to_pylist() == [31.0, 9.0]
+
+    applicants = snapshot.read_frame('applicants')
+    assert 'name_key' not in applicants.columns
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        expected = pd.read_sql_query("SELECT name, role, status FROM applicants", conn)
+    pd.testing.assert_frame_equal(applicants[['name', 'role', 'status']], expected)
+
+
+def test_parquet_format_and_pruning(tmp_path):
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE employees (name TEXT, hire_date TIMESTAMP, salary REAL)")
+    root = str(tmp_path / 'snapshots')
+    for generation in (1, 2, 3):
+        conn.execute("INSERT INTO employees VALUES ('Jane', '2024-02-01 00:00:00', NULL)")
+        snapshot.publish_snapshot(conn, generation, tables=('employees',), fmt='parquet', root=root, keep=2)
+
+    assert sorted(os.listdir(root)) == ['2', '3', 'CURRENT']
+    df = snapshot.read_frame('employees', root=root)
+    assert len(df) == 3 and df['hire_date'].iloc[0] == pd.Timestamp('2024-02-01')
+    assert len(snapshot.read_frame('employees', version='2', root=root)) == 2
@@ -0,0 +1,62 @@
+# ──────────────────────────────────────────────────────────────────────────────
+# test_tenure.py — Employment Interval Index Tests
+# Stabbing queries match a brute-force scan; tenure and department filters
+# ──────────────────────────────────────────────────────────────────────────────
+
+import sqlite3
+import numpy as np
+import pandas as pd
+from tenure import OPEN_END, IntervalTree, TenureIndex
+
+
+def test_stab_matches_brute_force():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 5_000, 20_000)
+    ends = np.where(rng.random(20_000) < 0.3, OPEN_END, starts + rng.integers(0, 2_000, 20_000))
+    tree = IntervalTree(starts, ends, np.arange(20_000) + 7)
+
+    for point in [-1, 0, 2_500, 4_999, 6_000, *rng.integers(0, 7_000, 50)]:
+        expected = np.flatnonzero((starts <= point) & (ends >= point)) + 7
+        np.testing.assert_array_equal(np.sort(tree.stab(point)), expected)
+
+
+def test_windowed_stab_matches_brute_force():
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, 5_000, 20_000)
+    ends = np.where(rng.random(20_000) < 0.3, OPEN_END, starts + rng.integers(0, 2_000, 20_000))
+    tree = IntervalTree(starts, ends, np.arange(20_000))
+
+    for point, first, last in [(2_500, 1_000, 2_000), (4_000, None, 3_000), (4_000, 3_500, None),
+                               (2_500, 2_600, None), *zip(rng.integers(0, 7_000, 30),
+                                                          rng.integers(0, 3_000, 30), rng.integers(3_000, 6_000, 30))]:
+        lowest = -1 if first is None else first
+        highest = point if last is None else last
+        expected = np.flatnonzero((starts <= point) & (ends >= point) & (starts >= lowest) & (starts <= highest))
+        np.testing.assert_array_equal(np.sort(tree.stab(point, first, last)), expected)
+
+
+def test_query_by_date_tenure_and_department():
+    conn = sqlite3.connect(':memory:')
+    pd.DataFrame({
+        'name': ['Ana', 'Ben', 'Cy', 'Dee', 'Eve'],
+        'department': ['Sales', 'Sales', 'HR', 'HR', 'HR'],
+        'hire_date': ['2020-01-01 00:00:00', '2023-01-01 00:00:00', '2022-06-01 00:00:00',
+                      '2023-05-01 00:00:00', None],
+        'end_date': [None, '2023-06-30 00:00:00', None, '2023-01-01 00:00:00', None],  # Dee ends before hire
+    }).to_sql('employees', conn, index=False)
+    index = TenureIndex()
+    index.ensure(conn, generation=1)
+
+    on_date = index.query('2023-06-30')
+    assert on_date['count'] == 3
+    assert [row['name'] for row in on_date['data']] == ['Ana', 'Cy', 'Ben']  # Longest tenure first
+    assert on_date['departments'] == [{'department': 'HR', 'active': 1, 'median_tenure_months': 12.9},
+                                      {'department': 'Sales', 'active': 2, 'median_tenure_months': 23.9}]
+
+    assert [row['name'] for row in index.query('2023-07-01')['data']] == ['Ana', 'Cy']
+    veterans = index.query('2023-06-30', min_months=12)
+    assert [row['name'] for row in veterans['data']] == ['Ana', 'Cy']
+    sales = index.query('2023-06-30', department='sales', max_months=12, limit=5)
+    assert [(row['name'], row['tenure_months']) for row in sales['data']] == [('Ben', 5.9)]
+    assert index.query('2019-12-31')['count'] == 0
+    assert len(index.query('2023-06-30', limit=1)['data']) == 1
@@ -9,4 +9,150 @@ def test_time_to_hire_calculation():
     df['hire_date'] = pd.to_datetime(df['hire_date'])
     df['time_to_hire_days'] = (df['hire_date'] - df['applied_date']).dt.days
 
-    assert df['time_to_hire_days'][0] == 14
\ No newline at end of file
+    assert df['time_to_hire_days'][0] == 14
+
+def _seed_db(path):
+    """Builds a tiny employees/applicants database with name-whitespace noise."""
+    import sqlite3
+    conn = sqlite3.connect(path)
+    pd.DataFrame({
+        'name': ['  Jane Smith ', 'Omar Khan', 'Zoe Lee'],
+        'hire_date': ['2024-02-01 00:00:00', '2024-01-01 00:00:00', '2024-03-10 00:00:00'],
+        'end_date': [None, None, None],
+        'department': ['Marketing', 'Engineering', 'Sales'],
+    }).to_sql('employees', conn, index=False)
+    pd.DataFrame({
+        'name': ['jane smith', 'Omar Khan', 'Zoe Lee', 'No Match'],
+        'role': ['Editor', 'Engineer', 'Producer', 'Analyst'],
+        'application_date': ['2024-01-01 00:00:00', '2024-02-01 00:00:00',
+                             '2024-03-01 00:00:00', '2024-03-01 00:00:00'],
+        'status': ['hired', 'hired', 'hired', 'rejected'],
+    }).to_sql('applicants', conn, index=False)
+    conn.close()
+
+
+def test_materialized_time_to_hire_matches_view(tmp_path, monkeypatch):
+    import sqlite3
+    import transform
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', str(tmp_path / 'hris.db'))
+    _seed_db(transform.DB_PATH)
+
+    query = "SELECT name, department, time_to_hire_days FROM time_to_hire ORDER BY name"
+    transform.create_views(materialize=False)
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        from_view = conn.execute(query).fetchall()
+
+    transform.create_views(materialize=True)
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        from_table = conn.execute(query).fetchall()
+        kind = conn.execute("SELECT type FROM sqlite_master WHERE name = 'time_to_hire'").fetchone()[0]
+
+    assert kind == 'table'
+    assert from_table == from_view == [('jane smith', 'Marketing', 31.0), ('zoe lee', 'Sales', 9.0)]
+    assert (tmp_path / 'logs' / 'invalid_hires.csv').exists()
+
+
+def test_normalize_names_and_soundex():
+    import transform
+
+    names = pd.Series(['  José  A. Smith-Jones ', "O'Brien", 'J. K.', 'Person 7', 'Иван  Петров'])
+    assert transform.normalize_names(names).tolist() == ['jose smith jones', 'obrien', 'j k', 'person 7',
+                                                         'иван петров']
+    assert [transform.soundex(t) for t in ('smith', 'smyth', 'robert', 'rupert', 'ashcraft')] == \
+        ['S530', 'S530', 'R163', 'R163', 'A261']
+
+
+def test_entity_resolution_matches_name_variants(tmp_path, monkeypatch):
+    import sqlite3
+    import transform
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', str(tmp_path / 'hris.db'))
+    conn = sqlite3.connect(transform.DB_PATH)
+    pd.DataFrame({
+        'name': ['Jonathan  Smith', 'María García', 'Omar Khan', 'Zoe Lee'],
+        'hire_date': ['2024-02-01', '2024-03-01', '2024-04-01', '2027-01-01'],
+        'end_date': [None] * 4,
+        'department': ['Marketing', 'Sales', 'Engineering', 'Sales'],
+    }).to_sql('employees', conn, index=False)
+    pd.DataFrame({
+        'name': ['Jon Smith', 'Maria A. Garcia', 'Omar Kahn', 'Olga Khan', 'Zoe Lee '],
+        'role': ['Editor', 'Producer', 'Engineer', 'Engineer', 'Producer'],
+        'application_date': ['2024-01-01', '2024-02-01', '2024-03-01', '2024-03-01', '2024-01-01'],
+        'status': ['hired'] * 5,
+    }).to_sql('applicants', conn, index=False)
+    conn.close()
+
+    transform.create_views(materialize=True)
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        matches = dict(conn.execute(f"""
+            SELECT a.name, m.method FROM {transform.MATCH_TABLE} m
+            JOIN applicants a ON a.rowid = m.applicant_rowid
+        """).fetchall())
+        hires = conn.execute("SELECT name, match_score FROM time_to_hire ORDER BY name").fetchall()
+
+    # Olga ≠ Omar: different first-name prefix, so never in the same block
+    assert matches == {'Jon Smith': 'fuzzy', 'Maria A. Garcia': 'normalized',
+                       'Omar Kahn': 'fuzzy', 'Zoe Lee ': 'exact'}
+    assert [name for name, _ in hires] == ['jon smith', 'maria a. garcia', 'omar kahn', 'zoe lee']
+    assert all(score >= transform.MATCH_THRESHOLD for _, score in hires)
+
+
+def test_entity_resolution_keeps_non_latin_names(tmp_path, monkeypatch):
+    import sqlite3
+    import transform
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', str(tmp_path / 'hris.db'))
+    conn = sqlite3.connect(transform.DB_PATH)
+    pd.DataFrame({
+        'name': ['李小龍', 'Иван Петров', 'Li 大龍'],
+        'hire_date': ['2024-02-01', '2024-03-01', '2024-04-01'],
+        'end_date': [None] * 3,
+        'department': ['Marketing', 'Sales', 'Engineering'],
+    }).to_sql('employees', conn, index=False)
+    pd.DataFrame({
+        'name': ['李小龍', 'иван петров', 'Li 小龍'],
+        'role': ['Editor', 'Producer', 'Engineer'],
+        'application_date': ['2024-01-01', '2024-02-01', '2024-03-01'],
+        'status': ['hired'] * 3,
+    }).to_sql('applicants', conn, index=False)
+    conn.close()
+
+    transform.create_views(materialize=True)
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        hires = conn.execute("SELECT name, department FROM time_to_hire ORDER BY department").fetchall()
+
+    # 'Li 小龍' and 'Li 大龍' differ only in their non-Latin part: different people
+    assert hires == [('李小龍', 'Marketing'), ('иван петров', 'Sales')]
+
+
+def test_entity_resolution_rejects_different_first_names(tmp_path, monkeypatch):
+    import sqlite3
+    import transform
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(transform, 'DB_PATH', str(tmp_path / 'hris.db'))
+    conn = sqlite3.connect(transform.DB_PATH)
+    pd.DataFrame({
+        'name': ['Mark Smith', 'Eric Jones', 'Jonathan Reyes'],
+        'hire_date': ['2024-02-01', '2024-03-01', '2024-04-01'],
+        'end_date': [None] * 3,
+        'department': ['Marketing', 'Sales', 'Engineering'],
+    }).to_sql('employees', conn, index=False)
+    pd.DataFrame({
+        'name': ['Mary Smith', 'Erica Jones', 'Jon Reyes', 'Jonathn Reyes'],
+        'role': ['Editor', 'Producer', 'Engineer', 'Engineer'],
+        'application_date': ['2024-01-01', '2024-02-01', '2024-03-01', '2024-03-02'],
+        'status': ['hired'] * 4,
+    }).to_sql('applicants', conn, index=False)
+    conn.close()
+
+    transform.create_views(materialize=True)
+    with sqlite3.connect(transform.DB_PATH) as conn:
+        hires = conn.execute("SELECT name, department FROM time_to_hire").fetchall()
+
+    # Mark ≠ Mary, Eric ≠ Erica; Jonathan Reyes is one hire, for the closer of his two applicant spellings
+    assert hires == [('jonathn reyes', 'Engineering')]
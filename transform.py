@@ -3,86 +3,466 @@
 # Defines SQLite views for analytical metrics, with error tracking
 # ──────────────────────────────────────────────────────────────────────────────
 
+import argparse
 import sqlite3
+import time
+import numpy as np
 import pandas as pd
 import os
 
+import headcount
+import metrics
+import quality
+
 DB_PATH = 'hris_project.db'
 ERROR_LOG_PATH = 'logs/invalid_hires.csv'
+MATERIALIZE = True  # Build time_to_hire/status_summary as indexed tables, not views
+SNAPSHOT = False    # Also publish a columnar snapshot (see snapshot.py) after each build
+
+MATCH_TABLE = 'applicant_employee_match'
+MATCH_THRESHOLD = 0.9      # Minimum confidence for a fuzzy applicant ↔ employee match
+MATCH_WINDOW_DAYS = 365    # Fuzzy candidates must be hired within this many days of applying
+MATCH_MAX_CANDIDATES = 50  # Per applicant, the employees nearest in date within its block
+EXACT_SCORE = 1.0          # Same LOWER(TRIM(name))
+NORMALIZED_SCORE = 0.97    # Same name once accents, punctuation and initials are stripped
+FIRST_NAME_FLOOR = 0.94    # Fuzzy pairs need at least this first-name similarity (typos, not Mark/Mary)…
+SURNAME_FLOOR = 0.9        # …and this surname similarity
+
+# ───────────────────────────── Shared SQL ─────────────────────────────
+TIME_TO_HIRE_SELECT = """
+    SELECT
+        m.rowid AS hire_id,
+        a.name_key AS name,
+        a.role,
+        a.application_date,
+        e.hire_date,
+        julianday(e.hire_date) - julianday(a.application_date) AS time_to_hire_days,
+        e.department,
+        {employment_type} AS employment_type,
+        m.score AS match_score
+    FROM applicant_employee_match m
+    JOIN applicants a ON a.rowid = m.applicant_rowid
+    JOIN employees e ON e.rowid = m.employee_rowid
+    WHERE e.hire_date IS NOT NULL
+      AND a.application_date IS NOT NULL
+      AND julianday(e.hire_date) >= julianday(a.application_date)
+"""
+
+STATUS_SUMMARY_SELECT = """
+    SELECT status, COUNT(*) AS count
+    FROM applicants
+    GROUP BY status
+"""
+
+# One cell per department × role × hire month × employment type; the API sums cells
+HIRING_ROLLUP_SELECT = """
+    SELECT
+        department,
+        role,
+        strftime('%Y-%m', hire_date) AS hire_month,
+        employment_type,
+        COUNT(*) AS hires,
+        SUM(time_to_hire_days) AS time_to_hire_sum,
+        COUNT(time_to_hire_days) AS time_to_hire_count,
+        MIN(time_to_hire_days) AS time_to_hire_min,
+        MAX(time_to_hire_days) AS time_to_hire_max
+    FROM time_to_hire
+    GROUP BY 1, 2, 3, 4
+"""
+
+# ───────────────────────────── Name Keys & Indexes ─────────────────────────────
+def add_name_keys(cursor):
+    """
+    Stores the normalized join key LOWER(TRIM(name)) as a name_key column
+    on applicants and employees, then indexes it alongside dates/department
+    so the applicant ↔ employee join can use an index instead of a full scan.
+    """
+    for table in ('applicants', 'employees'):
+        columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        if 'name_key' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN name_key TEXT")
+        cursor.execute(f"UPDATE {table} SET name_key = LOWER(TRIM(name))")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_applicants_name_key ON applicants (name_key, application_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_applicants_status ON applicants (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_applicants_application_date ON applicants (application_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_name_key ON employees (name_key, hire_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_employees_department ON employees (department)")
+
+
+def time_to_hire_select(cursor):
+    """TIME_TO_HIRE_SELECT, with NULL employment types when the payroll export has no such column."""
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(employees)")}
+    return TIME_TO_HIRE_SELECT.format(
+        employment_type='e.employment_type' if 'employment_type' in columns else 'NULL')
+
+
+def drop_relation(cursor, name):
+    """Drops `name` whether it is currently a view or a materialized table."""
+    row = cursor.execute(
+        "SELECT type FROM sqlite_master WHERE name = ? AND type IN ('table', 'view')", (name,)
+    ).fetchone()
+    if row:
+        cursor.execute(f"DROP {row[0].upper()} {name}")
+
+def stamp_generation(cursor):
+    """
+    Records a new data generation. The API keys its response cache (and ETags)
+    on this stamp, so it must change on every rebuild — including rebuilds of
+    a freshly recreated database file, hence a clock-based value, not a counter.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS data_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL,
+            built_at TEXT NOT NULL
+        )
+    """)
+    generation = time.time_ns()
+    cursor.execute(
+        "INSERT OR REPLACE INTO data_generation (id, generation, built_at) VALUES (1, ?, datetime('now'))",
+        (generation,),
+    )
+    return generation
+
+# ───────────────────────────── Entity Resolution ─────────────────────────────
+SOUNDEX_CODES = {char: digit for digit, letters in
+                 {'1': 'bfpv', '2': 'cgjkqsxz', '3': 'dt', '4': 'l', '5': 'mn', '6': 'r'}.items()
+                 for char in letters}
+# Combining diacritics left behind by NFKD ('é' → 'e' + U+0301)
+COMBINING_MARKS = r'[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]'
+# Short forms scored as the same first name. Only pairs sharing their first two
+# letters are ever compared (see add_blocks), so Bill/William is not listed
+SHORT_FORMS = {
+    'jonathan': ('jon', 'jonny', 'john'), 'john': ('jon', 'johnny'), 'christopher': ('chris',),
+    'christine': ('chris',), 'christina': ('chris',), 'alexander': ('alex',), 'alexandra': ('alex',),
+    'daniel': ('dan', 'danny'), 'samuel': ('sam', 'sammy'), 'samantha': ('sam',), 'benjamin': ('ben',),
+    'matthew': ('matt',), 'nicholas': ('nick', 'nicky'), 'michael': ('mike', 'mick'), 'patrick': ('pat',),
+    'thomas': ('tom', 'tommy'), 'timothy': ('tim', 'timmy'), 'joseph': ('joe', 'joey'), 'james': ('jamie',),
+    'jennifer': ('jen', 'jenny'), 'jessica': ('jess',), 'katherine': ('kate', 'kathy'),
+    'catherine': ('cate', 'cathy'), 'elizabeth': ('eliza',), 'rebecca': ('becca',), 'robert': ('rob', 'robbie'),
+    'richard': ('rick', 'rich'), 'steven': ('steve',), 'stephen': ('steve',), 'gregory': ('greg',),
+    'andrew': ('andy',), 'victoria': ('vicky',), 'zachary': ('zach', 'zack'),
+}
+SHORT_FORM_PAIRS = {frozenset((name, short)) for name, shorts in SHORT_FORMS.items() for short in shorts}
+SHORT_FORM_SCORE = 0.95
+
+
+def normalize_names(names):
+    """
+    Vectorized name normalization: '  José  A. Smith-Jones ' → 'jose smith jones'.
+    Accents, apostrophes, punctuation and single-letter Latin initials are removed;
+    digits and letters of every script are kept ('Иван Петров' → 'иван петров').
+    """
+    # Object dtype keeps Python's Unicode-aware re: Arrow-backed strings use RE2, where \w is ASCII-only
+    text = (names.astype(str).astype(object).str.normalize('NFKD')
+            .str.replace(COMBINING_MARKS, '', regex=True).str.lower().str.replace("'", '', regex=False)
+            .str.replace(r'[\W_]+', ' ', regex=True))
+    core = text.str.replace(r'\b[a-z]\b', '', regex=True)
+    core = core.where(core.str.strip() != '', text)  # A name made only of initials keeps them
+    return core.str.replace(r' +', ' ', regex=True).str.strip()
+
+
+def soundex(token):
+    """American Soundex code of one name token (e.g. 'smith' → 'S530')."""
+    code, last = token[0].upper(), SOUNDEX_CODES.get(token[0])
+    for char in token[1:]:
+        digit = SOUNDEX_CODES.get(char)
+        if digit and digit != last:
+            code += digit
+        if char not in 'hw':
+            last = digit
+    return (code + '000')[:4]
+
+
+def jaro_winkler(a, b, prefix_scale=0.1):
+    """Jaro-Winkler similarity in [0, 1]; rewards a shared prefix of up to 4 characters."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    used = [False] * len(b)
+    matches_a = []
+    for i, char in enumerate(a):
+        stop = min(len(b), i + window + 1)
+        j = b.find(char, max(0, i - window), stop)  # str.find scans the window in C
+        while j != -1 and used[j]:
+            j = b.find(char, j + 1, stop)
+        if j != -1:
+            used[j] = True
+            matches_a.append(char)
+    m = len(matches_a)
+    if not m:
+        return 0.0
+    matches_b = [char for char, hit in zip(b, used) if hit]
+    transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) / 2
+    jaro = (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def first_name_similarity(a, b):
+    """
+    SHORT_FORM_SCORE for a known short form (Jon/Jonathan); otherwise
+    Jaro-Winkler, except that a name extending the other (Eric/Erica) is a
+    different name and scores 0.
+    """
+    if a == b:
+        return 1.0
+    if frozenset((a, b)) in SHORT_FORM_PAIRS:
+        return SHORT_FORM_SCORE
+    if a.startswith(b) or b.startswith(a):
+        return 0.0
+    return jaro_winkler(a, b)
+
+
+def pair_scores(left, right, scorer):
+    """
+    scorer(left[i], right[i]) for two aligned object arrays, evaluated once per
+    distinct pair — a common first name or surname is compared only once.
+    """
+    codes, pairs = pd.factorize(left + '\x1f' + right)
+    distinct = np.array([scorer(*pair.split('\x1f')) for pair in pairs], dtype=float)
+    return distinct[codes]
+
+
+def score_names(first_a, last_a, first_e, last_e):
+    """
+    Confidence per aligned pair that two names are the same person:
+    0.4 × first name + 0.6 × surname similarity, or 0.0 below either floor.
+    """
+    first = pair_scores(first_a, first_e, first_name_similarity)
+    last = np.zeros(len(first))
+    plausible = first >= FIRST_NAME_FLOOR  # Surnames are only compared where the first names agree
+    last[plausible] = pair_scores(last_a[plausible], last_e[plausible], jaro_winkler)
+    return np.where(plausible & (last >= SURNAME_FLOOR), np.round(0.4 * first + 0.6 * last, 3), 0.0)
+
+
+def _name_frame(cursor, table, date_column):
+    """
+    rowid, name_key, normalized name, first/last token and day number for every
+    named row. Rows whose name normalizes to nothing keep an empty core: they
+    can still match exactly on name_key.
+    """
+    df = pd.DataFrame(
+        cursor.execute(f"SELECT rowid, name_key, {date_column} FROM {table} WHERE name_key IS NOT NULL").fetchall(),
+        columns=['rowid', 'name_key', 'date'],
+    )
+    df['core'] = normalize_names(df['name_key'])
+    tokens = df['core'].to_numpy(dtype=object)  # Plain object arrays: scored pair by pair in Python
+    df['first'] = pd.Series([core.split(' ', 1)[0] for core in tokens], index=df.index, dtype=object)
+    df['last'] = pd.Series([core.rsplit(' ', 1)[-1] for core in tokens], index=df.index, dtype=object)
+    dates = pd.to_datetime(df['date'], errors='coerce', format='ISO8601')
+    df['day'] = (dates - pd.Timestamp('1970-01-01')).dt.days
+    return df
+
+
+def add_blocks(df):
+    """
+    Blocking key per row: first two letters of the first name + Soundex of the
+    surname (last token), e.g. 'jonathan smith' → 'joS530'.
+    """
+    codes = {surname: soundex(surname) for surname in df['last'].unique()}  # One Soundex per distinct surname
+    return df.assign(block=df['first'].str[:2] + df['last'].map(codes))
+
+
+def _fuzzy_candidates(applicants, employees):
+    """
+    Applicant/employee row pairs sharing a block and hired within the date window.
+    Per block, employees are sorted by day and each applicant's window is two
+    binary searches capped at the MATCH_MAX_CANDIDATES nearest hires, so work
+    grows linearly with applicants rather than with A × E.
+    """
+    pairs = []
+    applicants, employees = add_blocks(applicants.dropna(subset=['day'])), add_blocks(employees.dropna(subset=['day']))
+    blocks = {block: group.sort_values('day') for block, group in employees.groupby('block')}
+    for block, apps in applicants.groupby('block'):
+        emps = blocks.get(block)
+        if emps is None:
+            continue
+        days, app_days = emps['day'].to_numpy(), apps['day'].to_numpy()
+        lo = np.searchsorted(days, app_days - MATCH_WINDOW_DAYS, 'left')
+        hi = np.searchsorted(days, app_days + MATCH_WINDOW_DAYS, 'right')
+        nearest = np.searchsorted(days, app_days)
+        lo = np.maximum(lo, nearest - MATCH_MAX_CANDIDATES // 2)
+        hi = np.minimum(hi, lo + MATCH_MAX_CANDIDATES)
+        counts = hi - lo
+        if not counts.sum():
+            continue
+        app_pos = np.repeat(np.arange(len(apps)), counts)
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        emp_pos = np.arange(counts.sum()) + starts  # Concatenated lo..hi ranges, without a Python loop
+        pairs.append(pd.DataFrame({
+            'applicant_rowid': apps['rowid'].to_numpy()[app_pos],
+            'employee_rowid': emps['rowid'].to_numpy()[emp_pos],
+            'first_a': apps['first'].to_numpy()[app_pos],
+            'last_a': apps['last'].to_numpy()[app_pos],
+            'first_e': emps['first'].to_numpy()[emp_pos],
+            'last_e': emps['last'].to_numpy()[emp_pos],
+        }))
+    columns = ['applicant_rowid', 'employee_rowid', 'first_a', 'last_a', 'first_e', 'last_e']
+    return pd.concat(pairs, ignore_index=True) if pairs else pd.DataFrame(columns=columns)
+
+
+def resolve_entities(cursor):
+    """
+    Rebuilds applicant_employee_match(applicant_rowid, employee_rowid, score, method):
+    1. exact — every pair with the same name_key (score 1.0), as the old name
+       join produced, whatever the script; failing that, every pair with the
+       same non-empty normalized name (0.97).
+    2. fuzzy — applicants and employees left unmatched by (1) are scored only
+       within their block (first-name prefix + surname Soundex), against hires within
+       ±MATCH_WINDOW_DAYS; the best pair(s) at or above MATCH_THRESHOLD are kept,
+       and of those only the best applicant per employee, so one hire is never
+       counted for several applicants.
+    """
+    applicants = _name_frame(cursor, 'applicants', 'application_date')
+    employees = _name_frame(cursor, 'employees', 'hire_date')
+
+    exact = applicants.merge(employees, on='name_key', suffixes=('_a', '_e'))
+    exact = pd.DataFrame({'applicant_rowid': exact['rowid_a'], 'employee_rowid': exact['rowid_e'],
+                          'score': EXACT_SCORE, 'method': 'exact'})
+    # Normalized pairs only stand in for a missing exact one ('John A Smith' ≠ 'John B Smith')
+    named = applicants[~applicants['rowid'].isin(exact['applicant_rowid']) & (applicants['core'] != '')]
+    normalized = named.merge(employees[employees['core'] != ''], on='core', suffixes=('_a', '_e'))
+    normalized = pd.DataFrame({'applicant_rowid': normalized['rowid_a'], 'employee_rowid': normalized['rowid_e'],
+                               'score': NORMALIZED_SCORE, 'method': 'normalized'})
+    exact = pd.concat([exact, normalized], ignore_index=True)
+
+    fuzzy = _fuzzy_candidates(named[~named['rowid'].isin(exact['applicant_rowid'])],
+                              employees[~employees['rowid'].isin(exact['employee_rowid']) & (employees['core'] != '')])
+    fuzzy['score'] = score_names(*(fuzzy[column].to_numpy(dtype=object)
+                                   for column in ('first_a', 'last_a', 'first_e', 'last_e')))
+    fuzzy = fuzzy[fuzzy['score'] >= MATCH_THRESHOLD]
+    fuzzy = fuzzy[fuzzy['score'] == fuzzy.groupby('applicant_rowid')['score'].transform('max')]
+    fuzzy = fuzzy.sort_values(['score', 'applicant_rowid'], ascending=[False, True]).drop_duplicates('employee_rowid')
+    fuzzy = fuzzy.assign(method='fuzzy')[['applicant_rowid', 'employee_rowid', 'score', 'method']]
+
+    # Written with the cursor (not to_sql) so it commits with the rest of the rebuild
+    cursor.execute(f"DROP TABLE IF EXISTS {MATCH_TABLE}")
+    cursor.execute(f"""
+        CREATE TABLE {MATCH_TABLE} (
+            applicant_rowid INTEGER NOT NULL,
+            employee_rowid INTEGER NOT NULL,
+            score REAL NOT NULL,
+            method TEXT NOT NULL
+        )
+    """)
+    for frame in (exact, fuzzy):
+        cursor.executemany(f"INSERT INTO {MATCH_TABLE} VALUES (?, ?, ?, ?)",
+                           frame.itertuples(index=False, name=None))
+    cursor.execute(f"CREATE INDEX idx_match_applicant ON {MATCH_TABLE} (applicant_rowid)")
+    cursor.execute(f"CREATE INDEX idx_match_employee ON {MATCH_TABLE} (employee_rowid)")
+    print(f"🔗 Matched applicants to employees: {exact['applicant_rowid'].nunique()} by name, "
+          f"{fuzzy['applicant_rowid'].nunique()} fuzzy")
 
 # ───────────────────────────── Error Logger ─────────────────────────────
 def log_invalid_hires(conn):
     """
-    Identifies cases where hire_date precedes application_date,
-    then logs the affected records for HR review.
-    """
-    query = """
-        SELECT 
-            a.name,
-            a.role,
-            a.application_date,
-            e.hire_date,
-            e.department,
-            'Hire date precedes application date' AS error_reason
-        FROM applicants a
-        JOIN employees e ON LOWER(TRIM(a.name)) = LOWER(TRIM(e.name))
-        WHERE e.hire_date IS NOT NULL
-          AND a.application_date IS NOT NULL
-          AND julianday(e.hire_date) < julianday(a.application_date)
-    """
-    df = pd.read_sql_query(query, conn)
+    Runs the data-quality rules in quality.py (one SQL scan per row source,
+    every rule a predicate), then keeps the hire-before-application violations in
+    logs/invalid_hires.csv for HR review, as before.
+    """
+    with metrics.stage('data_quality'):
+        violations, _ = quality.run_checks(conn)
+    df = violations['hire_before_application']
     if not df.empty:
-        os.makedirs('logs', exist_ok=True)
+        os.makedirs(os.path.dirname(ERROR_LOG_PATH), exist_ok=True)
         df.to_csv(ERROR_LOG_PATH, index=False)
         print(f"⚠️ Logged {len(df)} invalid hires to {ERROR_LOG_PATH}")
 
 # ───────────────────────────── View Builder ─────────────────────────────
-def create_views():
+def build_views(conn, materialize=MATERIALIZE):
     """
-    Creates SQL views for:
-    - Time to hire: Includes only valid hire timelines
-    - Status summary: Counts applicant statuses
-    Also triggers error logger for auditing removed records.
+    Builds the analytical layer in `conn` and stamps a new data generation in
+    the same transaction; returns the generation. Used on the live file by
+    create_views, and on the unpublished build file by data_loader.
     """
-    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # Drop old views to ensure refresh
-    cursor.execute("DROP VIEW IF EXISTS time_to_hire")
-    cursor.execute("DROP VIEW IF EXISTS status_summary")
+    # Normalized, indexed join keys back both views and tables
+    add_name_keys(cursor)
+    resolve_entities(cursor)
 
-    # ───── View: time_to_hire ─────
-    cursor.execute("""
-        CREATE VIEW time_to_hire AS
-        SELECT
-            LOWER(TRIM(a.name)) AS name,
-            a.role,
-            a.application_date,
-            e.hire_date,
-            julianday(e.hire_date) - julianday(a.application_date) AS time_to_hire_days,
-            e.department
-        FROM applicants a
-        JOIN employees e ON LOWER(TRIM(a.name)) = LOWER(TRIM(e.name))
-        WHERE e.hire_date IS NOT NULL
-          AND a.application_date IS NOT NULL
-          AND julianday(e.hire_date) >= julianday(a.application_date)
-    """)
+    # Drop old views/tables to ensure refresh
+    drop_relation(cursor, 'time_to_hire')
+    drop_relation(cursor, 'status_summary')
+    drop_relation(cursor, 'hiring_rollup')
+    drop_relation(cursor, headcount.HEADCOUNT_TABLE)
 
-    # ───── View: status_summary ─────
-    cursor.execute("""
-        CREATE VIEW status_summary AS
-        SELECT status, COUNT(*) AS count
-        FROM applicants
-        GROUP BY status
-    """)
+    kind = 'TABLE' if materialize else 'VIEW'
+
+    # ───── time_to_hire ─────
+    cursor.execute(f"CREATE {kind} time_to_hire AS {time_to_hire_select(cursor)}")
+
+    # ───── status_summary ─────
+    cursor.execute(f"CREATE {kind} status_summary AS {STATUS_SUMMARY_SELECT}")
+
+    # ───── hiring_rollup ─────
+    cursor.execute(f"CREATE {kind} hiring_rollup AS {HIRING_ROLLUP_SELECT}")
+
+    # ───── headcount_daily ─────
+    headcount.build_table(cursor)
+
+    if materialize:
+        cursor.execute("CREATE INDEX idx_time_to_hire_department ON time_to_hire (department, time_to_hire_days)")
+        cursor.execute("CREATE INDEX idx_time_to_hire_hire_date ON time_to_hire (hire_date, hire_id)")
+        cursor.execute("CREATE INDEX idx_status_summary_status ON status_summary (status)")
+        cursor.execute("CREATE INDEX idx_hiring_rollup_department ON hiring_rollup (department, hire_month)")
+        cursor.execute("CREATE INDEX idx_hiring_rollup_month ON hiring_rollup (hire_month)")
+
+    # New stamp in the same transaction, so readers see data and stamp together
+    generation = stamp_generation(cursor)
+    conn.commit()
+    cursor.execute("ANALYZE")
+    return generation
+
+
+@metrics.stage('build_views')
+def create_views(materialize=MATERIALIZE, log_errors=True, snapshot=SNAPSHOT, snapshot_format='arrow'):
+    """
+    Creates SQL views (or, when materialize=True, indexed tables) for:
+    - Time to hire: Includes only valid hire timelines
+    - Status summary: Counts applicant statuses
+    - Hiring rollup: hire counts and time-to-hire sum/count/min/max per
+      department × role × hire month × employment type
+    - Headcount: daily hires, terminations and active headcount per
+      department (always a table, computed by the sweep in headcount.py)
+    Also triggers error logger for auditing removed records, unless
+    log_errors=False (the pipeline runs it as its own step).
+    With snapshot=True, employees/applicants/time_to_hire are then exported
+    as a columnar snapshot versioned by the new data generation.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA journal_mode = WAL")  # API readers never block on rebuilds
+    generation = build_views(conn, materialize)
 
     # Log temporal inconsistencies for HR audit trail
-    log_invalid_hires(conn)
+    if log_errors:
+        log_invalid_hires(conn)
+
+    if snapshot:
+        import snapshot as columnar  # Optional: needs pyarrow
+        with metrics.stage('snapshot'):
+            columnar.publish_snapshot(conn, generation, fmt=snapshot_format)
 
     conn.close()
-    print("📐 Views created successfully in database.")
+    print(f"📐 {'Tables' if materialize else 'Views'} created successfully in database.")
 
 # ───────────────────────────── Execution Entry ─────────────────────────────
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build HRIS analytical views")
+    parser.add_argument('--views', action='store_true',
+                        help="Create plain SQL views instead of materialized tables")
+    parser.add_argument('--snapshot', choices=['arrow', 'parquet'], nargs='?', const='arrow',
+                        help="Also publish a columnar snapshot to snapshots/ (default format: arrow)")
+    args = parser.parse_args()
+
     print("🔧 Running transformation module...")
-    create_views().`    `
\ No newline at end of file
+    create_views(materialize=not args.views, snapshot=args.snapshot is not None,
+                 snapshot_format=args.snapshot or 'arrow')